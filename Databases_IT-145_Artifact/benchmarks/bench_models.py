@@ -0,0 +1,98 @@
+"""
+Benchmark model construction for a large roster.
+
+Compares building 100k dogs with the previous plain (__dict__) class and keyword-dictionary
+construction against the slotted models, the frozen models and the columnar AnimalBatch.
+Reports build time and peak traced memory for each.
+
+Usage:
+    python benchmarks/bench_models.py [rows]
+"""
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from animals import AnimalBatch, Dog, FrozenDog  # noqa: E402
+
+
+class LegacyDog:
+    """The Dog model as it was before slots, kept here as the benchmark baseline."""
+    def __init__(self, name, breed, age, gender, weight, acquisitionDate, acquisitionCountry, trainingStatus, reserved, inServiceCountry):
+        self.name = name
+        self.breed = breed
+        self.age = age
+        self.gender = gender
+        self.weight = weight
+        self.acquisitionDate = acquisitionDate
+        self.acquisitionCountry = acquisitionCountry
+        self.trainingStatus = trainingStatus
+        self.reserved = reserved
+        self.inServiceCountry = inServiceCountry
+
+
+def make_records(rows):
+    """Generate decoded /dogs records like the backend returns them."""
+    return [
+        {
+            "name": f"Dog{i}",
+            "breed": "Labrador",
+            "age": i % 15,
+            "gender": "male" if i % 2 else "female",
+            "weight": 20.0 + i % 40,
+            "acquisitionDate": "2024-01-01",
+            "acquisitionCountry": "USA",
+            "trainingStatus": "in service" if i % 3 else "intake",
+            "reserved": i % 5 == 0,
+            "inServiceCountry": None,
+        }
+        for i in range(rows)
+    ]
+
+
+def legacy_build(records):
+    # Mirrors the previous RescueAPI path: fill missing fields into a dict, then Dog(**dict)
+    return [LegacyDog(**{k: record.get(k) for k in Dog.FIELDS}) for record in records]
+
+
+def measure(label, build, records):
+    """
+    Run one builder, printing elapsed seconds and peak traced memory in MiB.
+
+    Time and memory are measured in separate runs because tracing allocations slows
+    construction down by an order of magnitude.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = build(records)
+    elapsed = time.perf_counter() - start
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = build(records)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    print(f"{label:<30} {elapsed:8.3f} s {peak / 2**20:10.1f} MiB")
+    return elapsed, peak
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    records = make_records(rows)
+    print(f"Building {rows} dogs")
+    print(f"{'model':<30} {'time':>10} {'peak':>14}")
+    measure("legacy __dict__ (**kwargs)", legacy_build, records)
+    measure("slotted Dog.from_records", Dog.from_records, records)
+    measure("frozen FrozenDog.from_records", FrozenDog.from_records, records)
+    measure("columnar AnimalBatch", lambda r: AnimalBatch.from_records("dog", r), records)
+
+
+if __name__ == "__main__":
+    main()
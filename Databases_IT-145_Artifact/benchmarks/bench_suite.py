@@ -0,0 +1,193 @@
+"""
+Benchmark suite for the Python client, run against an in-process backend stand-in.
+
+Starts a StubRescueServer (see stub_server.py) seeded with synthetic rosters of each size and
+measures:
+- fetch_decode_dogs / fetch_decode_available: RescueAPI.get_dogs / get_available_animals
+  round trip, JSON decode and model construction, with no cache
+- build_dogs / build_frozen_dogs / build_batch: model construction in animals.py from decoded
+  records
+- table_frame_objects / table_frame_batch: the DataFrame show_animals_table renders, built
+  from model objects and from an AnimalBatch
+- reserve_one / reserve_many: reservations per second, one call at a time and through
+  reserve_many (which falls back to one request per animal against the stand-in)
+
+Results are written as JSON, by default to benchmarks/results/<commit>.json, so runs on two
+commits can be compared with --compare. Times are the best of --repeat runs.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 1000,10000,100000] [--repeat 3]
+                                     [--output FILE] [--compare BASELINE.json] [--threshold 0.1]
+
+The 1,000,000 size (--sizes 1000000) needs several GB of memory and is left out by default.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+from animals import AnimalBatch, Dog, FrozenDog  # noqa: E402
+from api import RescueAPI  # noqa: E402
+from stub_server import StubRescueServer, make_dogs, make_monkeys  # noqa: E402
+from tables import build_animals_frame  # noqa: E402
+from transport import PooledTransport  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# Reservations timed per size; the roster is large enough for every size
+RESERVATIONS = 300
+
+
+def best_of(run, repeat):
+    """Return the fastest of several runs, in seconds."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def throughput(run, operations):
+    """Time one run of operations and return (seconds, operations per second)."""
+    gc.collect()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    return elapsed, operations / elapsed
+
+
+def bench_size(size, repeat):
+    """
+    Run every benchmark for one roster size.
+
+    Returns:
+        dict: benchmark name -> {"seconds": ...} or {"seconds": ..., "per_second": ...}
+    """
+    dogs = make_dogs(size)
+    server = StubRescueServer(dogs, make_monkeys(size)).start()
+    results = {}
+    try:
+        # A private transport without retries, so no state is shared between sizes
+        client = RescueAPI(server.url, transport=PooledTransport(retries=0))
+        client.get_dogs()  # warm the connection and the stand-in's encoded bodies
+        client.get_available_animals()
+        results["fetch_decode_dogs"] = {"seconds": best_of(client.get_dogs, repeat)}
+        results["fetch_decode_available"] = {"seconds": best_of(client.get_available_animals, repeat)}
+
+        results["build_dogs"] = {"seconds": best_of(lambda: Dog.from_records(dogs), repeat)}
+        results["build_frozen_dogs"] = {"seconds": best_of(lambda: FrozenDog.from_records(dogs), repeat)}
+        results["build_batch"] = {"seconds": best_of(lambda: AnimalBatch.from_records("dog", dogs), repeat)}
+
+        objects = FrozenDog.from_records(dogs)
+        batch = AnimalBatch.from_records("dog", dogs)
+        results["table_frame_objects"] = {"seconds": best_of(lambda: build_animals_frame(objects, "dog"), repeat)}
+        results["table_frame_batch"] = {"seconds": best_of(lambda: build_animals_frame(batch, "dog"), repeat)}
+        del objects, batch
+
+        available = [record["name"] for record in dogs if StubRescueServer._available(record)]
+        count = min(RESERVATIONS, len(available) // 2)
+        single = available[:count]
+        bulk = available[count:2 * count]
+
+        def reserve_one():
+            for name in single:
+                client.reserve_animal("dog", name, "USA")
+
+        seconds, rate = throughput(reserve_one, count)
+        results["reserve_one"] = {"seconds": seconds, "per_second": rate}
+        seconds, rate = throughput(
+            lambda: client.reserve_many([("dog", name, "USA") for name in bulk], max_workers=4), count
+        )
+        results["reserve_many"] = {"seconds": seconds, "per_second": rate}
+    finally:
+        server.stop()
+    return results
+
+
+def git_commit():
+    """Return the short hash of the checked-out commit, or "unknown" outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the change of every benchmark against a baseline run.
+
+    Returns:
+        list[str]: "size/benchmark" for every benchmark slower than the baseline by more than
+            threshold (a fraction, e.g. 0.1 for 10%)
+    """
+    regressions = []
+    print(f"\nCompared with {baseline['commit']}:")
+    for size, benches in results["results"].items():
+        for name, current in benches.items():
+            previous = baseline["results"].get(size, {}).get(name)
+            if previous is None:
+                continue
+            change = current["seconds"] / previous["seconds"] - 1
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{size}/{name}")
+            print(f"{size:>9} {name:<24} {previous['seconds']:9.4f} s -> {current['seconds']:9.4f} s {change:+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="comma-separated roster sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per timing; the fastest counts")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="baseline result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="slowdown counted as a regression by --compare (default: 0.1)")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": {},
+    }
+    for size in (int(size) for size in args.sizes.split(",")):
+        print(f"Roster of {size} dogs and {size} monkeys")
+        benches = bench_size(size, args.repeat)
+        for name, result in benches.items():
+            rate = f" {result['per_second']:10.0f} /s" if "per_second" in result else ""
+            print(f"  {name:<24} {result['seconds']:9.4f} s{rate}")
+        results["results"][str(size)] = benches
+
+    output = args.output or os.path.join(BENCH_DIR, "results", f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark building the View Animals table DataFrame.
+
+Compares the previous per-cell rendering loop (getattr and string formatting for every cell,
+then a row-wise DataFrame) with the column-wise tables.build_animals_frame.
+
+Usage:
+    python benchmarks/bench_tables.py [rows]
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from animals import AnimalBatch, Monkey  # noqa: E402
+from tables import TABLE_COLUMNS, build_animals_frame  # noqa: E402
+
+
+def make_monkeys(rows):
+    """Generate Monkey objects like RescueAPI.get_monkeys returns them."""
+    return [
+        Monkey(f"Monkey{i}", "capuchin", i % 20, "female", 10.0 + i % 7, "2024-01-01", "Peru",
+               "in service", i % 4 == 0, None, 1.5, 2.0, 1.2)
+        for i in range(rows)
+    ]
+
+
+def legacy_frame(animals, animal_type):
+    # The previous show_animals_table body, minus the st.dataframe call
+    columns = TABLE_COLUMNS[animal_type]
+    data = []
+    for animal in animals:
+        row = []
+        for col, attr in columns:
+            value = getattr(animal, attr, "")
+            if attr == "reserved":
+                value = "Yes" if value else "No"
+            elif attr == "age":
+                value = f"{value} years"
+            elif attr == "weight":
+                value = f"{value} lbs"
+            elif attr in ("tailLength", "height", "bodyLength"):
+                value = f"{value} ft"
+            row.append(value)
+        data.append(row)
+    return pd.DataFrame(data, columns=[col for col, _ in columns])
+
+
+def best_of(build, repeat=3):
+    """Return the fastest of several runs, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    monkeys = make_monkeys(rows)
+    batch = AnimalBatch.from_animals("monkey", monkeys)
+
+    legacy = best_of(lambda: legacy_frame(monkeys, "monkey"))
+    objects = best_of(lambda: build_animals_frame(monkeys, "monkey"))
+    columnar = best_of(lambda: build_animals_frame(batch, "monkey"))
+
+    print(f"Building the monkey table for {rows} rows")
+    print(f"{'legacy per-cell loop':<28} {legacy:8.3f} s")
+    print(f"{'column-wise from objects':<28} {objects:8.3f} s {legacy / objects:6.1f}x")
+    print(f"{'column-wise from batch':<28} {columnar:8.3f} s {legacy / columnar:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
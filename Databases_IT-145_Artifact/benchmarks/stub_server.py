@@ -0,0 +1,272 @@
+"""
+In-process stand-in for RescueServer, for benchmarking the Python client without a JVM.
+
+Serves the core routes of RescueServer.java from synthetic rosters held in memory:
+GET /health, /dogs, /monkeys and /available, and POST /dogs, /monkeys and
+/reserve/{type}/{name}?country=. GET /changes and POST /dogs/batch and /monkeys/batch are
+served only when enabled (delta_sync, batch_writes), so by default RescueAPI falls back exactly
+as it does against an older server. Server-side search and /reserve/batch always answer 404.
+List bodies are encoded once and re-encoded only after a write changes them, so the numbers
+measure the client rather than the stand-in.
+
+Usage:
+    server = StubRescueServer(make_dogs(10_000), make_monkeys(10_000))
+    server.start()
+    RescueAPI(server.url).get_dogs()
+    server.stop()
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+def make_dogs(count):
+    """Generate dog records shaped like the /dogs response."""
+    return [
+        {
+            "name": f"Dog{i:07d}",
+            "breed": ("Labrador", "German Shepherd", "Beagle", "Border Collie")[i % 4],
+            "age": i % 15,
+            "gender": "male" if i % 2 else "female",
+            "weight": 20.0 + i % 40,
+            "acquisitionDate": "2024-01-01",
+            "acquisitionCountry": ("USA", "Canada", "Mexico")[i % 3],
+            "trainingStatus": "in service" if i % 3 else "intake",
+            "reserved": i % 5 == 0,
+            "inServiceCountry": "USA" if i % 5 == 0 else None,
+        }
+        for i in range(count)
+    ]
+
+
+def make_monkeys(count):
+    """Generate monkey records shaped like the /monkeys response."""
+    return [
+        {
+            "name": f"Monkey{i:07d}",
+            "species": ("capuchin", "macaque", "marmoset", "tamarin")[i % 4],
+            "age": i % 20,
+            "gender": "female" if i % 2 else "male",
+            "weight": 10.0 + i % 7,
+            "acquisitionDate": "2024-01-01",
+            "acquisitionCountry": ("Peru", "Brazil", "Colombia")[i % 3],
+            "trainingStatus": "in service" if i % 3 else "intake",
+            "reserved": i % 4 == 0,
+            "inServiceCountry": "Peru" if i % 4 == 0 else None,
+            "tailLength": 1.5,
+            "height": 2.0,
+            "bodyLength": 1.2,
+        }
+        for i in range(count)
+    ]
+
+
+class StubRescueServer:
+    """
+    Threaded HTTP server answering the core RescueServer routes from memory.
+
+    Attributes:
+        url (str): Base URL of the running server
+        reservations (int): Reservation requests handled so far
+        epoch (str): Epoch of the current server run, as issued by /changes
+        watermark (int): Sequence number of the latest write
+    """
+    def __init__(self, dogs, monkeys, host="127.0.0.1", port=0, delta_sync=False, batch_writes=False):
+        """
+        Initialize the server. It starts listening on start().
+
+        Args:
+            dogs (list[dict]): Dog records to serve
+            monkeys (list[dict]): Monkey records to serve
+            host (str): Interface to bind
+            port (int): Port to bind; 0 picks a free one
+            delta_sync (bool): Serve GET /changes. Defaults to False
+            batch_writes (bool): Serve POST /dogs/batch and /monkeys/batch. Defaults to False
+        """
+        self.records = {"dog": dogs, "monkey": monkeys}
+        self.by_name = {
+            animal_type: {record["name"]: record for record in records}
+            for animal_type, records in self.records.items()
+        }
+        self.delta_sync = delta_sync
+        self.batch_writes = batch_writes
+        self.reservations = 0
+        self.epoch = "1"
+        # Sequence number of the latest write of each (animal_type, name). Seeded records are
+        # numbered too, as the Java server's test data is, so a first sync yields a usable watermark
+        self._seqs = {}
+        for animal_type, records in self.records.items():
+            for record in records:
+                self._seqs[(animal_type, record["name"])] = len(self._seqs) + 1
+        self.watermark = len(self._seqs)
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+
+    def start(self):
+        """Serve requests from a background thread."""
+        threading.Thread(target=self._server.serve_forever, name="stub-rescue-server", daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def body(self, path):
+        """Return the encoded body of a list route, encoding it on first use."""
+        with self._lock:
+            body = self._bodies.get(path)
+            if body is None:
+                if path == "/available":
+                    payload = {
+                        "dogs": [r for r in self.records["dog"] if self._available(r)],
+                        "monkeys": [r for r in self.records["monkey"] if self._available(r)],
+                    }
+                else:
+                    payload = self.records[path[1:-1]]
+                body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+                self._bodies[path] = body
+            return body
+
+    def reserve(self, animal_type, name, country):
+        """Reserve an available animal, returning True on success."""
+        with self._lock:
+            self.reservations += 1
+            record = self.by_name.get(animal_type, {}).get(name)
+            if record is None or not self._available(record):
+                return False
+            record["reserved"] = True
+            record["inServiceCountry"] = country
+            self._written(animal_type, name)
+            return True
+
+    def add(self, animal_type, record):
+        """Add an animal, returning True unless its name is empty or already taken."""
+        return self.add_many(animal_type, [record])[0]["success"]
+
+    def add_many(self, animal_type, records):
+        """Add several animals, returning a BatchResult-shaped dict per record as /dogs/batch does."""
+        results = []
+        with self._lock:
+            for record in records:
+                name = record.get("name")
+                if not name:
+                    results.append({"name": name, "success": False, "error": "name is required"})
+                elif name in self.by_name[animal_type]:
+                    results.append({"name": name, "success": False, "error": "duplicate name"})
+                else:
+                    self.records[animal_type].append(record)
+                    self.by_name[animal_type][name] = record
+                    self._written(animal_type, name)
+                    results.append({"name": name, "success": True, "error": None})
+        return results
+
+    def changes(self, epoch, since):
+        """
+        Build the /changes response for a client at the given epoch and watermark.
+
+        A watermark from another epoch, or one the server never issued, gets the whole roster
+        marked as full, as ChangeTracker.isValid decides in the Java server.
+        """
+        with self._lock:
+            full = since <= 0 or epoch != self.epoch or since > self.watermark
+
+            def changed(animal_type):
+                return [
+                    record for record in self.records[animal_type]
+                    if full or self._seqs[(animal_type, record["name"])] > since
+                ]
+
+            return {
+                "epoch": self.epoch,
+                "watermark": self.watermark,
+                "full": full,
+                "dogs": changed("dog"),
+                "monkeys": changed("monkey"),
+            }
+
+    def restart(self):
+        """Simulate a server restart: start a new epoch, so earlier watermarks are no longer trusted."""
+        with self._lock:
+            self.epoch = str(int(self.epoch) + 1)
+
+    def _written(self, animal_type, name):
+        # Called with the lock held after every successful write
+        self.watermark += 1
+        self._seqs[(animal_type, name)] = self.watermark
+        # Every list body may contain the animal; encode them again on the next read
+        self._bodies.clear()
+
+    @staticmethod
+    def _available(record):
+        return not record["reserved"] and record["trainingStatus"].lower() == "in service"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 keeps connections alive, as Javalin does
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without TCP_NODELAY each small response
+            # would wait for the client's delayed ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                path = parts.path
+                if path == "/health":
+                    self._send(200, b'{"status":"ok","database":true,"uptimeMillis":0}')
+                elif path in ("/dogs", "/monkeys", "/available"):
+                    self._send(200, server.body(path))
+                elif path == "/changes" and server.delta_sync:
+                    query = parse_qs(parts.query)
+                    try:
+                        since = int(query.get("since", ["0"])[0])
+                    except ValueError:
+                        self._send(400, b'{"success":false}')
+                        return
+                    self._send_json(server.changes(query.get("epoch", [None])[0], since))
+                else:
+                    self._send(404, b"Not found")
+
+            def do_POST(self):
+                parts = urlsplit(self.path)
+                segments = [unquote(s) for s in parts.path.split("/")[1:]]
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                animal_type = {"dogs": "dog", "monkeys": "monkey"}.get(segments[0])
+                if animal_type is not None and len(segments) == 1:
+                    self._send_json({"success": server.add(animal_type, json.loads(body))})
+                    return
+                if animal_type is not None and segments[1:] == ["batch"] and server.batch_writes:
+                    self._send_json(server.add_many(animal_type, json.loads(body)))
+                    return
+                if len(segments) != 3 or segments[0] != "reserve" or segments[1] == "batch":
+                    self._send(404, b"Not found")
+                    return
+                country = parse_qs(parts.query).get("country", [""])[0]
+                if not country:
+                    self._send(400, b'{"success":false}')
+                    return
+                success = server.reserve(segments[1].lower(), segments[2], country)
+                self._send(200, b'{"success":true}' if success else b'{"success":false}')
+
+            def _send_json(self, payload):
+                self._send(200, json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+            def _send(self, status, body):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -2,44 +2,316 @@ import subprocess
 import sys
 import signal
 import os
+import time
+import urllib.error
+import urllib.request
 
 # Paths to the Java API server JAR and Streamlit app
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 JAR_PATH = os.path.join(BASE_DIR, "target", "rescue-animal-system-1.0-SNAPSHOT.jar")
 STREAMLIT_APP_PATH = os.path.join(BASE_DIR, "src", "app.py")
 
-# Command to start the Java API server
+# Roster saved by the app (see SNAPSHOT_PATH in app.py). When it exists the app can serve it
+# while the backend boots, so both processes start in parallel; otherwise the app waits.
+SNAPSHOT_PATH = os.environ.get("RESCUE_SNAPSHOT_PATH", os.path.join(BASE_DIR, "roster_snapshot.db"))
+
+# Worker i listens on BACKEND_PORT + i (backend) and STREAMLIT_PORT + i (frontend).
+# backend-0 is the only writer: it creates the test data and takes every add and reservation,
+# so change numbering, idempotency keys and live events have one source. The other backends
+# are read replicas (RESCUE_ROLE=replica) that serve reads from the shared database and answer
+# writes with 503. Each frontend is a separate Streamlit process on its own port, holding its
+# sessions, uploads and downloads in memory, so to spread operators over them put a load
+# balancer with sticky sessions (e.g. nginx ip_hash) in front of the frontend ports.
+BACKEND_PORT = 8647
+STREAMLIT_PORT = 8501
+
+# With RESCUE_METRICS=1, frontend worker i serves Prometheus metrics at
+# http://localhost:(METRICS_PORT + i)/metrics (see src/metrics.py)
+METRICS_ENABLED = os.environ.get("RESCUE_METRICS", "") not in ("", "0")
+METRICS_PORT = 9464
+
+# Number of backend and of frontend workers. Defaults to half the cores (one JVM and one
+# Streamlit process per two cores), between 1 and 4; override with RESCUE_WORKERS.
+WORKERS = int(os.environ.get("RESCUE_WORKERS", 0)) or max(1, min(4, (os.cpu_count() or 1) // 2))
+
+# Command to start the Java API server (the port is passed in RESCUE_PORT)
 JAVA_CMD = [
     "java", "-cp", JAR_PATH, "com.rescueanimals.controllers.RescueServer"
 ]
 
-# Command to start the Streamlit app
+# Command to start the Streamlit app (the port is appended per worker)
 STREAMLIT_CMD = [
-    "streamlit", "run", STREAMLIT_APP_PATH
+    "streamlit", "run", STREAMLIT_APP_PATH,
+    "--server.headless", "true",
 ]
 
-# Start both processes
-java_proc = subprocess.Popen(JAVA_CMD)
-streamlit_proc = subprocess.Popen(STREAMLIT_CMD)
+READY_TIMEOUT = 120.0        # Seconds a process may take to become ready before it is restarted
+PROBE_INTERVAL = 0.25        # Seconds between readiness probes during startup
+HEALTH_INTERVAL = 5.0        # Seconds between liveness probes once running
+MAX_HEALTH_FAILURES = 3      # Consecutive failed liveness probes before a restart
+RESTART_BACKOFF = 1.0        # Seconds before the first restart; doubled after each crash
+MAX_RESTART_BACKOFF = 30.0
+STABLE_AFTER = 60.0          # Seconds of uptime after which the restart backoff is reset
+DRAIN_TIMEOUT = 10.0         # Seconds a process may take to exit after SIGTERM before it is killed
+
+
+def log(message):
+    """
+    Prints a supervisor message with a timestamp.
+    """
+    print(f"[supervisor {time.strftime('%H:%M:%S')}] {message}", flush=True)
+
+
+def probe(url, timeout=1.0):
+    """
+    Returns True if the health endpoint answers 200.
+    """
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status == 200
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+class ManagedProcess:
+    """
+    A child process that is probed for readiness and restarted with backoff when it fails.
+    """
+    def __init__(self, name, cmd, health_url, env=None):
+        self.name = name
+        self.cmd = cmd
+        self.health_url = health_url
+        self.env = env
+        self.proc = None
+        self.started_at = None
+        self.ready_at = None
+        self.restarts = 0
+        self.backoff = RESTART_BACKOFF
+        self.restart_due = None
+        self.health_failures = 0
+        self.last_health_check = 0.0
+
+    def start(self):
+        """
+        Launches the process and starts timing its startup.
+        """
+        self.proc = subprocess.Popen(self.cmd, env=self.env)
+        self.started_at = time.monotonic()
+        self.ready_at = None
+        self.health_failures = 0
+        log(f"{self.name}: started (pid {self.proc.pid})")
+
+    def running(self):
+        """
+        Returns True while the process has not exited.
+        """
+        return self.proc is not None and self.proc.poll() is None
+
+    def check_ready(self):
+        """
+        Probes a starting process and records the time it became ready.
+        """
+        if self.ready_at is None and probe(self.health_url):
+            self.ready_at = time.monotonic()
+            log(f"{self.name}: ready after {self.ready_at - self.started_at:.2f} s")
+        return self.ready_at is not None
+
+    def wait_ready(self, timeout=READY_TIMEOUT):
+        """
+        Blocks until the process is ready. Returns False if it exits or times out first.
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and not stopping:
+            if not self.running():
+                return False
+            if self.check_ready():
+                return True
+            time.sleep(PROBE_INTERVAL)
+        return False
+
+    def supervise(self, now):
+        """
+        Restarts the process if it exited, never became ready or stopped answering its health probe.
+        """
+        if self.restart_due is not None:
+            if now >= self.restart_due:
+                self.restart_due = None
+                self.restarts += 1
+                self.start()
+            return
+
+        reason = None
+        if not self.running():
+            reason = f"exited with code {self.proc.returncode}"
+        elif self.ready_at is None:
+            if not self.check_ready() and now - self.started_at > READY_TIMEOUT:
+                reason = f"not ready after {READY_TIMEOUT:.0f} s"
+        elif now - self.last_health_check >= HEALTH_INTERVAL:
+            self.last_health_check = now
+            if probe(self.health_url):
+                self.health_failures = 0
+            else:
+                self.health_failures += 1
+                if self.health_failures >= MAX_HEALTH_FAILURES:
+                    reason = f"failed {self.health_failures} health checks"
+        if reason is None:
+            return
+
+        # A process that ran stably before crashing starts over with the shortest backoff
+        if now - self.started_at > STABLE_AFTER:
+            self.backoff = RESTART_BACKOFF
+        log(f"{self.name}: {reason}; restarting in {self.backoff:.0f} s")
+        self.stop()
+        self.restart_due = now + self.backoff
+        self.backoff = min(self.backoff * 2, MAX_RESTART_BACKOFF)
+
+    def stop(self, timeout=DRAIN_TIMEOUT):
+        """
+        Sends SIGTERM so the process can finish in-flight work, and kills it if it does not exit in time.
+        """
+        if not self.running():
+            return
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            log(f"{self.name}: did not exit within {timeout:.0f} s; killing")
+            self.proc.kill()
+            self.proc.wait()
+
+
+def make_workers(count):
+    """
+    Builds the backend and frontend workers: backend-0 writes, the other backends are read
+    replicas, and every frontend balances its reads over all backends.
+    Readiness probes: a process counts as started once its health endpoint answers 200.
+    """
+    backend_urls = [f"http://localhost:{BACKEND_PORT + i}" for i in range(count)]
+    backends = [
+        ManagedProcess(
+            f"backend-{i}",
+            JAVA_CMD,
+            f"{backend_urls[i]}/health",
+            env=dict(os.environ, RESCUE_PORT=str(BACKEND_PORT + i), RESCUE_ROLE="primary" if i == 0 else "replica"),
+        )
+        for i in range(count)
+    ]
+    frontends = [
+        ManagedProcess(
+            f"frontend-{i}",
+            STREAMLIT_CMD + ["--server.port", str(STREAMLIT_PORT + i)],
+            f"http://localhost:{STREAMLIT_PORT + i}/_stcore/health",
+            env=frontend_env(i, backend_urls),
+        )
+        for i in range(count)
+    ]
+    return backends, frontends
+
+
+def frontend_env(i, backend_urls):
+    """
+    Builds the environment of frontend worker i: the backends to balance over and, with
+    metrics on, its own metrics port.
+    """
+    env = dict(os.environ, RESCUE_BACKENDS=",".join(backend_urls))
+    if METRICS_ENABLED:
+        env["RESCUE_METRICS_PORT"] = str(METRICS_PORT + i)
+    return env
+
+
+stopping = False
+
 
 def cleanup(signum, frame):
     """
-    Cleans up both processes when the program is terminated.
+    Requests a graceful shutdown; the main loop drains both processes.
     """
-    print("Shutting down both processes...")
-    java_proc.terminate()
-    streamlit_proc.terminate()
-    java_proc.wait()
-    streamlit_proc.wait()
-    sys.exit(0)
+    global stopping
+    stopping = True
+
+
+def wait_all_ready(workers):
+    """
+    Waits until every started worker is ready; returns False if any exits or times out.
+    """
+    return all([worker.wait_ready() for worker in workers if worker.proc is not None])
+
+
+def main():
+    """
+    Installs the signal handlers, builds the workers and runs them, stopping them all on exit.
+    """
+    # Handle Ctrl+C and termination signals
+    signal.signal(signal.SIGINT, cleanup)
+    signal.signal(signal.SIGTERM, cleanup)
+    backends, frontends = make_workers(WORKERS)
+    try:
+        run(backends, frontends)
+    finally:
+        stop_all(frontends)
+        stop_all(backends)
+
+
+def run(backends, frontends):
+    """
+    Starts the workers in order, waits for readiness, then supervises them until a shutdown signal.
+    """
+    launched = time.monotonic()
+    log(f"starting {WORKERS} backend (1 writer, {WORKERS - 1} read replicas) and {WORKERS} frontend workers")
+    if WORKERS > 1:
+        log(f"frontends listen on ports {STREAMLIT_PORT}-{STREAMLIT_PORT + WORKERS - 1}; "
+            "put a sticky load balancer in front of them to spread operators")
+    if METRICS_ENABLED:
+        log(f"metrics at http://localhost:{METRICS_PORT}/metrics (+1 per further frontend)")
+    # The writer creates the schema and test data, so the replicas start once it is ready
+    primary = backends[0]
+    primary.start()
+
+    # With a stored roster the frontends are useful before the backend is up, so start them at once
+    if os.path.exists(SNAPSHOT_PATH):
+        for frontend in frontends:
+            frontend.start()
+    if primary.wait_ready():
+        log(f"phase primary backend: {time.monotonic() - launched:.2f} s")
+    else:
+        log("backend-0: not ready yet; starting the other workers anyway and retrying in the background")
+    for backend in backends[1:]:
+        backend.start()
+    for frontend in frontends:
+        if frontend.proc is None:
+            frontend.start()
+    if wait_all_ready(backends[1:]):
+        log(f"phase backends: {time.monotonic() - launched:.2f} s")
+    if wait_all_ready(frontends):
+        log(f"phase frontends: {time.monotonic() - launched:.2f} s")
+    if not stopping:
+        log(f"startup complete in {time.monotonic() - launched:.2f} s")
 
-# Handle Ctrl+C and termination signals
-signal.signal(signal.SIGINT, cleanup)
-signal.signal(signal.SIGTERM, cleanup)
+    while not stopping:
+        now = time.monotonic()
+        for worker in backends + frontends:
+            worker.supervise(now)
+        time.sleep(PROBE_INTERVAL)
 
-try:
-    # Wait for both processes to finish
-    java_proc.wait()
-    streamlit_proc.wait()
-except KeyboardInterrupt:
-    cleanup(None, None) 
\ No newline at end of file
+    # Drain: stop the frontends first so no new requests reach the backends, then the backends
+    log("shutting down all workers...")
+    drain_started = time.monotonic()
+    stop_all(frontends)
+    stop_all(backends)
+    log(f"shutdown complete in {time.monotonic() - drain_started:.2f} s")
+
+
+def stop_all(workers):
+    """
+    Sends SIGTERM to every worker at once, then waits for each to exit (or kills it).
+    """
+    for worker in workers:
+        if worker.running():
+            worker.proc.terminate()
+    for worker in workers:
+        worker.stop()
+
+
+if __name__ == "__main__":
+    main()
+    sys.exit(0)
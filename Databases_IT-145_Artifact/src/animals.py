@@ -1,7 +1,113 @@
-class Dog:
+"""Data models mirroring the Java RescueAnimal, Dog and Monkey classes."""
+
+from operator import attrgetter, itemgetter
+
+# Numeric fields and the types the server stores them as. The Add form sends numbers as text,
+# which the server converts on storage
+STORED_TYPES = {"age": int, "weight": float, "tailLength": float, "height": float, "bodyLength": float}
+
+
+class RescueAnimal:
+    """
+    Base class holding the fields shared by every rescue animal.
+
+    Subclasses list their fields in constructor order in FIELDS, which drives the bulk
+    constructor, serialization and the columnar AnimalBatch.
+    """
+    __slots__ = ("name", "gender", "age", "weight", "acquisitionDate", "acquisitionCountry",
+                 "trainingStatus", "reserved", "inServiceCountry")
+    FIELDS = ()
+
+    def to_dict(self):
+        """
+        Convert the animal to a JSON-serializable dictionary.
+
+        Returns:
+            dict: Field names mapped to their values, in FIELDS order
+        """
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def copy(self, **changes):
+        """
+        Return a copy of the animal with some fields replaced.
+
+        Args:
+            **changes: Field values to override in the copy
+
+        Returns:
+            RescueAnimal: A new instance of the same class
+        """
+        values = self.to_dict()
+        values.update(changes)
+        return type(self)(**values)
+
+    def as_stored(self):
+        """
+        Return the animal with its numeric fields converted to the types the server stores.
+
+        Local copies of an animal sent by the client (in the roster index or an optimistic
+        write) must sort and compare like the animals downloaded from the server.
+
+        Returns:
+            RescueAnimal: A converted copy, or the animal itself if nothing needed converting
+        """
+        changes = {}
+        for field, stored in STORED_TYPES.items():
+            value = getattr(self, field, None)
+            if value is not None and type(value) is not stored:
+                try:
+                    changes[field] = stored(float(value))
+                except (TypeError, ValueError):
+                    pass
+        return self.copy(**changes) if changes else self
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build an animal from a decoded JSON object, filling missing fields with None.
+
+        Args:
+            data (dict): Dictionary containing the animal's fields
+
+        Returns:
+            RescueAnimal: The constructed animal
+        """
+        return cls(*map(data.get, cls.FIELDS))
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Build animals in bulk from decoded JSON objects, filling missing fields with None.
+
+        Complete records are unpacked with a single itemgetter call, which is considerably
+        faster than building a keyword dictionary per row.
+
+        Args:
+            records (Iterable[dict]): Decoded JSON objects
+
+        Returns:
+            list[RescueAnimal]: The constructed animals, in input order
+        """
+        fields = cls.FIELDS
+        get_all = itemgetter(*fields)
+        animals = []
+        append = animals.append
+        for record in records:
+            try:
+                values = get_all(record)
+            except KeyError:
+                values = tuple(map(record.get, fields))
+            append(cls(*values))
+        return animals
+
+    def __repr__(self):
+        return f"{type(self).__name__}(name={self.name!r})"
+
+
+class Dog(RescueAnimal):
     """
     A class representing a service dog in the rescue system.
-    
+
     Attributes:
         name (str): The name of the dog
         breed (str): The breed of the dog
@@ -14,6 +120,10 @@ class Dog:
         reserved (bool): Whether the dog is reserved for service
         inServiceCountry (str): The country where the dog is currently in service
     """
+    __slots__ = ("breed",)
+    FIELDS = ("name", "breed", "age", "gender", "weight", "acquisitionDate", "acquisitionCountry",
+              "trainingStatus", "reserved", "inServiceCountry")
+
     def __init__(self, name, breed, age, gender, weight, acquisitionDate, acquisitionCountry, trainingStatus, reserved, inServiceCountry):
         self.name = name
         self.breed = breed
@@ -26,10 +136,11 @@ class Dog:
         self.reserved = reserved
         self.inServiceCountry = inServiceCountry
 
-class Monkey:
+
+class Monkey(RescueAnimal):
     """
     A class representing a service monkey in the rescue system.
-    
+
     Attributes:
         name (str): The name of the monkey
         species (str): The species of the monkey
@@ -45,6 +156,10 @@ class Monkey:
         height (float): The height of the monkey in inches
         bodyLength (float): The body length of the monkey in inches
     """
+    __slots__ = ("species", "tailLength", "height", "bodyLength")
+    FIELDS = ("name", "species", "age", "gender", "weight", "acquisitionDate", "acquisitionCountry",
+              "trainingStatus", "reserved", "inServiceCountry", "tailLength", "height", "bodyLength")
+
     def __init__(self, name, species, age, gender, weight, acquisitionDate, acquisitionCountry, trainingStatus, reserved, inServiceCountry, tailLength, height, bodyLength):
         self.name = name
         self.species = species
@@ -58,4 +173,178 @@ class Monkey:
         self.inServiceCountry = inServiceCountry
         self.tailLength = tailLength
         self.height = height
-        self.bodyLength = bodyLength 
\ No newline at end of file
+        self.bodyLength = bodyLength
+
+
+class _Frozen:
+    """
+    Mixin that makes a slotted animal read-only after construction.
+
+    Fields are assigned once through the slot descriptors; any later assignment or deletion
+    raises AttributeError. Use copy() to derive a modified animal.
+    """
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Slot descriptors bypass the blocked __setattr__ and are faster than object.__setattr__
+        cls._SETTERS = tuple(getattr(cls, field).__set__ for field in cls.FIELDS)
+
+    def __init__(self, *args, **kwargs):
+        fields = self.FIELDS
+        if kwargs or len(args) != len(fields):
+            if len(args) > len(fields):
+                raise TypeError(f"{type(self).__name__}() takes {len(fields)} arguments but {len(args)} were given")
+            try:
+                args += tuple(kwargs.pop(field) for field in fields[len(args):])
+            except KeyError as e:
+                raise TypeError(f"{type(self).__name__}() missing required argument {e}") from None
+            if kwargs:
+                raise TypeError(f"{type(self).__name__}() got unexpected arguments {sorted(kwargs)}")
+        for setter, value in zip(self._SETTERS, args):
+            setter(self, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is frozen; use copy() to change '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is frozen; cannot delete '{name}'")
+
+
+class FrozenDog(_Frozen, Dog):
+    """Read-only Dog, safe to share between cached results and sessions."""
+    __slots__ = ()
+
+
+class FrozenMonkey(_Frozen, Monkey):
+    """Read-only Monkey, safe to share between cached results and sessions."""
+    __slots__ = ()
+
+
+# Model classes keyed by the animal type strings used by the API ("dog"/"monkey")
+MODELS = {"dog": Dog, "monkey": Monkey}
+FROZEN_MODELS = {"dog": FrozenDog, "monkey": FrozenMonkey}
+
+
+class AnimalBatch:
+    """
+    Columnar container for a roster of one animal type.
+
+    Each field is stored as one list, so building a pandas DataFrame or filtering a column
+    never goes through per-object attribute lookups.
+
+    Attributes:
+        animal_type (str): "dog" or "monkey"
+        columns (dict[str, list]): One list per field in the model's FIELDS order
+    """
+    __slots__ = ("animal_type", "columns")
+
+    def __init__(self, animal_type, columns):
+        """
+        Initialize the batch.
+
+        Args:
+            animal_type (str): "dog" or "monkey"
+            columns (dict[str, list]): One equally long list per model field
+        """
+        self.animal_type = animal_type
+        self.columns = columns
+
+    @property
+    def fields(self):
+        """Return the field names of this batch's model, in order."""
+        return MODELS[self.animal_type].FIELDS
+
+    @classmethod
+    def empty(cls, animal_type):
+        """Return a batch with no rows."""
+        return cls(animal_type, {field: [] for field in MODELS[animal_type].FIELDS})
+
+    @classmethod
+    def from_records(cls, animal_type, records):
+        """
+        Build a batch directly from decoded JSON objects.
+
+        Args:
+            animal_type (str): "dog" or "monkey"
+            records (Sequence[dict]): Decoded JSON objects; missing fields become None
+
+        Returns:
+            AnimalBatch: The columnar batch
+        """
+        if not isinstance(records, (list, tuple)):
+            records = list(records)
+        return cls(animal_type, {
+            field: [record.get(field) for record in records]
+            for field in MODELS[animal_type].FIELDS
+        })
+
+    @classmethod
+    def from_animals(cls, animal_type, animals):
+        """
+        Build a batch from model objects.
+
+        Args:
+            animal_type (str): "dog" or "monkey"
+            animals (Sequence[RescueAnimal]): Dog or Monkey objects
+
+        Returns:
+            AnimalBatch: The columnar batch
+        """
+        if not isinstance(animals, (list, tuple)):
+            animals = list(animals)
+        return cls(animal_type, {
+            field: list(map(attrgetter(field), animals))
+            for field in MODELS[animal_type].FIELDS
+        })
+
+    def __len__(self):
+        return len(self.columns["name"])
+
+    def column(self, field):
+        """Return the list of values for one field."""
+        return self.columns[field]
+
+    def take(self, indices):
+        """
+        Return a new batch holding only the rows at the given positions.
+
+        Args:
+            indices (Iterable[int]): Row positions to keep, in output order
+
+        Returns:
+            AnimalBatch: The selected rows
+        """
+        indices = list(indices)
+        return AnimalBatch(self.animal_type, {
+            field: [values[i] for i in indices] for field, values in self.columns.items()
+        })
+
+    def extend(self, other):
+        """Append the rows of another batch of the same animal type in place."""
+        for field, values in self.columns.items():
+            values.extend(other.columns[field])
+
+    def to_animals(self, frozen=False):
+        """
+        Materialize the batch as model objects.
+
+        Args:
+            frozen (bool): Build FrozenDog/FrozenMonkey instead of Dog/Monkey
+
+        Returns:
+            list[RescueAnimal]: One object per row
+        """
+        model = (FROZEN_MODELS if frozen else MODELS)[self.animal_type]
+        return [model(*values) for values in zip(*(self.columns[field] for field in model.FIELDS))]
+
+    def to_pandas(self):
+        """
+        Convert the batch to a pandas DataFrame with one column per field.
+
+        Returns:
+            pandas.DataFrame: The roster, with columns in FIELDS order
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, columns=list(self.fields))
@@ -1,50 +1,261 @@
+import asyncio
+import threading
+from urllib.parse import urlencode
+
 import requests
-from animals import Dog, Monkey
+
+from animals import AnimalBatch, Dog, Monkey, MODELS, FROZEN_MODELS
+from balancer import BalancedTransport, EndpointPool
+from bulk import BulkResult, BulkWritesMixin  # noqa: F401 (BulkResult is re-exported)
+from events import get_event_listener
+from jsonstream import iter_json_array
+from metrics import InstrumentedTransport, metrics
+from optimistic import OptimisticWritesMixin, PendingWrite  # noqa: F401 (PendingWrite is re-exported)
+from roster import Page, RosterIndex
+from rostersync import RosterSyncMixin
+from transport import get_shared_transport
+
 
 # API Client for RescueServer.java
-class RescueAPI:
+class RescueAPI(RosterSyncMixin, BulkWritesMixin, OptimisticWritesMixin):
     """
     API client for communicating with the Java backend (RescueServer.java).
     
     This class encapsulates all HTTP requests to the rescue system backend, providing a clean interface for the frontend. It handles double-encoded JSON responses from the backend for robustness.
     
+    All requests share a pooled keep-alive transport (see transport.py), so repeated calls and
+    Streamlit reruns reuse warm connections instead of opening a new socket per call. When a
+    cache is given, list endpoint results are served from it and revalidated conditionally.
+    In snapshot mode the full roster is fetched once and the available view is derived from it.
+    
+    Roster snapshots, delta sync and the roster index come from RosterSyncMixin (rostersync.py),
+    bulk writes and group commit from BulkWritesMixin (bulk.py), and optimistic adds and
+    reservations from OptimisticWritesMixin (optimistic.py).
+    
+    Several backend workers can be given instead of one URL; reads are then load balanced over
+    them and writes go to the first healthy one (see balancer.py).
+    
+    When metrics are enabled (see metrics.py), every request is timed per endpoint and the
+    time spent decoding JSON and building model objects is recorded separately.
+    
     Attributes:
-        base_url (str): The base URL for the API endpoints
+        base_url (str): The base URL for the API endpoints (the first worker's, with several)
+        endpoints (EndpointPool): The backend workers, or None with a single backend
+        transport (PooledTransport): The pooled HTTP transport used for every request
+        cache (ResponseCache): Read cache for the list endpoints, or None to disable caching
+        snapshot_ttl (float): Maximum snapshot age in seconds, or None when snapshot mode is off
+        frozen_models (bool): Whether results are built as read-only FrozenDog/FrozenMonkey objects
+        replica (RosterReplica): Local roster replica kept by delta sync, or None when it is off
+        events (EventListener): Live update stream, or None until start_live_updates is called
+        store (SnapshotStore): On-disk copy of the last good roster, or None when it is off
+        stale_roster (StoredRoster): Roster loaded from the store by warm_start, served until the
+            backend has answered; None otherwise
+        reconcile_error (Exception): Last error of a warm start reconcile that gave up, or None
     """
-    def __init__(self, base_url="http://localhost:8647"):
+    def __init__(self, base_url="http://localhost:8647", transport=None, pool_size=10, keep_alive=True,
+                 connect_timeout=3.05, read_timeout=10.0, retries=None, backoff_factor=0.3, cache=None,
+                 snapshot_ttl=None, frozen_models=False, delta_sync=False, snapshot_path=None,
+                 balance="least_outstanding", write_batch_size=50, write_linger=0.01):
         """
         Initialize the RescueAPI client.
         
         Args:
-            base_url (str): The base URL for the API endpoints. Defaults to http://localhost:8647
+            base_url (str | list[str]): The base URL for the API endpoints, or the base URLs of
+                several backend workers. Defaults to http://localhost:8647
+            transport (PooledTransport): Transport to use. Defaults to the process-wide transport
+                for the given pool settings
+            pool_size (int): Maximum number of pooled connections to the backend
+            keep_alive (bool): Whether to keep connections open between requests
+            connect_timeout (float): Seconds to wait for a connection to be established
+            read_timeout (float): Seconds to wait for the server to respond
+            retries (int): Retries for connection errors and 502/503/504 responses on reads.
+                Defaults to 3 with one backend and 0 with several, where a failed read moves on to
+                another worker instead
+            backoff_factor (float): Base delay in seconds for exponential backoff between retries
+            cache (ResponseCache): Read cache for /dogs, /monkeys and /available. Defaults to no caching
+            snapshot_ttl (float): Enables snapshot mode, serving the available view from a roster
+                snapshot at most this many seconds old. Defaults to None (always use /available)
+            frozen_models (bool): Build read-only FrozenDog/FrozenMonkey objects, so cached results
+                shared between callers cannot be modified in place. Defaults to False
+            delta_sync (bool): Keep a local replica of the roster and refresh it through the
+                server's /changes endpoint, transferring only animals changed since the last
+                sync. Defaults to False
+            snapshot_path (str): SQLite file in which every newly downloaded roster is saved, so
+                warm_start can serve it after a restart. Defaults to None (nothing is saved)
+            balance (str): How reads are spread over several workers: "least_outstanding" or
+                "round_robin". Defaults to "least_outstanding"
+            write_batch_size (int): Most adds queue_add sends in one batch request. Defaults to 50
+            write_linger (float): Most seconds queue_add holds an add for others to join its
+                batch. Defaults to 0.01
         """
-        self.base_url = base_url
+        urls = [base_url] if isinstance(base_url, str) else list(base_url)
+        self.endpoints = EndpointPool(urls, strategy=balance) if len(urls) > 1 else None
+        if retries is None:
+            retries = 0 if self.endpoints is not None else 3
+        self.base_url = urls[0].rstrip("/")
+        self.cache = cache
+        self.snapshot_ttl = snapshot_ttl
+        self.frozen_models = frozen_models
+        self._models = FROZEN_MODELS if frozen_models else MODELS
+        self.events = None
+        self._init_roster_sync(delta_sync, snapshot_path)
+        self._init_bulk_writes(write_batch_size, write_linger)
+        self._init_optimistic_writes()
+        # Whether the server has the /search and /facets endpoints (None = not known yet)
+        self._server_search = None
+        self.transport = transport or get_shared_transport(
+            pool_size=pool_size,
+            keep_alive=keep_alive,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            retries=retries,
+            backoff_factor=backoff_factor,
+        )
+        if self.endpoints is not None:
+            self.transport = BalancedTransport(self.endpoints, self.transport)
+        if metrics.enabled:
+            self.transport = InstrumentedTransport(self.transport, self.base_url, metrics)
 
-    def _fill_missing_dog_fields(self, data):
+    def pool_stats(self):
         """
-        Fill in missing fields for a dog object with None values.
+        Report connection pool statistics for this client's transport.
         
-        Args:
-            data (dict): Dictionary containing dog data
-            
         Returns:
-            dict: Dictionary with all required dog fields, missing fields filled with None
+            dict: Open and idle connection counts, requests sent and the connection reuse ratio,
+                plus per-worker load and health under endpoints when there are several workers
         """
-        required = ["name", "breed", "age", "gender", "weight", "acquisitionDate", "acquisitionCountry", "trainingStatus", "reserved", "inServiceCountry"]
-        return {k: data.get(k, None) for k in required}
+        return self.transport.stats()
 
-    def _fill_missing_monkey_fields(self, data):
+    def cache_stats(self):
         """
-        Fill in missing fields for a monkey object with None values.
+        Report read cache counters.
+        
+        Returns:
+            dict: Hit, miss and revalidation counters (see ResponseCache.stats), or None without a cache
+        """
+        return self.cache.stats() if self.cache is not None else None
+
+    def _get_list(self, path, build, params=None):
+        """
+        Fetch a list endpoint and build model objects from it, going through the cache if enabled.
+        
+        A fresh cached result is returned without contacting the server. An expired one is
+        revalidated with If-None-Match/If-Modified-Since and reused on 304 Not Modified.
+        Concurrent misses for the same key share one request (see ResponseCache.load).
         
         Args:
-            data (dict): Dictionary containing monkey data
+            path (str): Endpoint path, e.g. "/dogs"
+            build (callable): Function turning the decoded JSON into the returned value
+            params (dict): Query parameters, which become part of the cache key
+            
+        Returns:
+            The value produced by build, possibly served from the cache
             
+        Raises:
+            requests.exceptions.HTTPError: If the request fails
+        """
+        if self.cache is None:
+            response = self.transport.get(f"{self.base_url}{path}", params=params)
+            response.raise_for_status()
+            return self._decode(response, build, path)
+
+        key = f"{path}?{urlencode(sorted(params.items()))}" if params else path
+        entry = self.cache.lookup(key)
+        if entry is not None and (entry.is_fresh() or self.is_live()):
+            # While the live stream is open, every change invalidates the affected entries,
+            # so an entry that is still cached is current regardless of its TTL
+            return entry.value
+
+        def fetch():
+            generation = self.cache.generation
+            headers = entry.validators() if entry is not None else {}
+            response = self.transport.get(f"{self.base_url}{path}", params=params, headers=headers)
+            if response.status_code == 304 and entry is not None:
+                self.cache.mark_revalidated(key, endpoint=path)
+                return entry.value
+            response.raise_for_status()
+            value = self._decode(response, build, path)
+            self.cache.store(
+                key,
+                value,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                endpoint=path,
+                generation=generation,
+            )
+            return value
+
+        return self.cache.load(key, fetch)
+
+    def _decode(self, response, build, endpoint):
+        """Decode a JSON response and build the result, timing both steps when metrics are on."""
+        with metrics.timer("rescue_decode_seconds", endpoint=endpoint):
+            data = response.json()
+        with metrics.timer("rescue_build_seconds", endpoint=endpoint):
+            return build(data)
+
+    def _invalidate(self):
+        """Drop cached list results and the roster snapshot after a successful write."""
+        self._drop_snapshot()
+        if self.cache is not None:
+            self.cache.invalidate()
+
+    def start_live_updates(self):
+        """
+        Subscribe to the server's live update stream (see events.py).
+        
+        Every add or reservation made by any client then drops the cached lists, snapshot and
+        index entries it affects as soon as it happens, instead of when their TTL runs out.
+        Calling this again is a no-op.
+        
         Returns:
-            dict: Dictionary with all required monkey fields, missing fields filled with None
+            EventListener: The shared listener for this backend
+        """
+        if self.events is None:
+            # With several workers the stream follows the primary, which receives every write
+            self.events = get_event_listener(self.base_url, endpoints=self.endpoints)
+            self.events.subscribe(self._on_server_event)
+            self.events.start()
+        return self.events
+
+    def is_live(self):
+        """Tell whether the live update stream is currently connected."""
+        return self.events is not None and self.events.connected
+
+    def _on_server_event(self, event, payload):
+        """
+        Drop cached data made stale by a server event. Runs on the listener thread.
+        
+        A change only invalidates the lists of its animal type; a (re)connection invalidates
+        everything, since changes made while the stream was down were missed. With delta sync
+        the replica and index are left in place: the next read syncs the changed animals into
+        them. Without it the snapshot and index are dropped and rebuilt on the next read.
+        
+        The payload itself is not applied: a change event names the animals and the watermark
+        but does not carry their records, so they have to be read from the server either way.
         """
-        required = ["name", "species", "age", "gender", "weight", "acquisitionDate", "acquisitionCountry", "trainingStatus", "reserved", "inServiceCountry", "tailLength", "height", "bodyLength"]
-        return {k: data.get(k, None) for k in required}
+        animal_type = payload.get("animalType") if event == "change" else None
+        if self.cache is not None:
+            if animal_type in ("dog", "monkey"):
+                for prefix in (f"/{animal_type}s", "/available", "/search", "/facets"):
+                    self.cache.invalidate(prefix)
+            else:
+                self.cache.invalidate()
+        self._drop_snapshot()
+        if self.replica is None:
+            self._index = None
+
+    def _build_dogs(self, data):
+        """Build Dog objects from a decoded /dogs response, filling missing fields with None."""
+        return self._models["dog"].from_records(data)
+
+    def _build_monkeys(self, data):
+        """Build Monkey objects from a decoded /monkeys response, filling missing fields with None."""
+        return self._models["monkey"].from_records(data)
+
+    def _build_available(self, data):
+        """Build the available animals dictionary from a decoded /available response."""
+        return {"dogs": self._build_dogs(data.get("dogs", [])), "monkeys": self._build_monkeys(data.get("monkeys", []))}
 
     def get_dogs(self):
         """
@@ -52,10 +263,11 @@ class RescueAPI:
         
         Returns:
             list[Dog]: List of Dog objects representing all dogs in the system
+            
+        Raises:
+            requests.exceptions.HTTPError: If the request fails
         """
-        response = requests.get(f"{self.base_url}/dogs")
-        data = response.json()
-        return [Dog(**self._fill_missing_dog_fields(dog)) for dog in data]
+        return self._get_list("/dogs", self._build_dogs)
 
     def get_monkeys(self):
         """
@@ -63,10 +275,11 @@ class RescueAPI:
         
         Returns:
             list[Monkey]: List of Monkey objects representing all monkeys in the system
+            
+        Raises:
+            requests.exceptions.HTTPError: If the request fails
         """
-        response = requests.get(f"{self.base_url}/monkeys")
-        data = response.json()
-        return [Monkey(**self._fill_missing_monkey_fields(monkey)) for monkey in data]
+        return self._get_list("/monkeys", self._build_monkeys)
 
     def get_available_animals(self):
         """
@@ -76,12 +289,184 @@ class RescueAPI:
             dict: Dictionary containing two lists:
                 - dogs: List of available Dog objects
                 - monkeys: List of available Monkey objects
+            
+        Raises:
+            requests.exceptions.HTTPError: If the request fails
+        """
+        # In snapshot mode, filter the already downloaded roster instead of querying /available
+        snapshot = self.fresh_snapshot()
+        if snapshot is not None:
+            return snapshot.available()
+        return self._get_list("/available", self._build_available)
+
+    def iter_animals(self, animal_type: str, batch_size: int = None, chunk_size: int = 65536):
+        """
+        Stream all dogs or monkeys, decoding the response incrementally as it arrives.
+        
+        Unlike get_dogs/get_monkeys, the body is never held in memory as a whole and no list of
+        all records is built, so consumers such as CSV export run in bounded memory. Streaming
+        bypasses the response cache.
+        
+        Args:
+            animal_type (str): Type of animal ('dog' or 'monkey')
+            batch_size (int): If given, yield AnimalBatch chunks of up to this many animals
+                instead of individual model objects
+            chunk_size (int): Number of bytes read from the socket at a time
+            
+        Yields:
+            Dog | Monkey | AnimalBatch: Animals in server order, or columnar batches of them
+            
+        Raises:
+            requests.exceptions.HTTPError: If the request fails
+            ValueError: If the response is not a well-formed JSON array
         """
-        response = requests.get(f"{self.base_url}/available")
-        data = response.json()
-        dogs = [Dog(**self._fill_missing_dog_fields(dog)) for dog in data.get("dogs", [])]
-        monkeys = [Monkey(**self._fill_missing_monkey_fields(monkey)) for monkey in data.get("monkeys", [])]
-        return {"dogs": dogs, "monkeys": monkeys}
+        with self.transport.get(f"{self.base_url}/{animal_type}s", stream=True) as response:
+            response.raise_for_status()
+            records = iter_json_array(response.iter_content(chunk_size=chunk_size))
+            if batch_size is None:
+                model = self._models[animal_type]
+                for record in records:
+                    yield model.from_dict(record)
+                return
+            
+            chunk = []
+            for record in records:
+                chunk.append(record)
+                if len(chunk) >= batch_size:
+                    yield AnimalBatch.from_records(animal_type, chunk)
+                    chunk = []
+            if chunk:
+                yield AnimalBatch.from_records(animal_type, chunk)
+
+    def iter_dogs(self, batch_size: int = None):
+        """Stream all dogs. See iter_animals."""
+        return self.iter_animals("dog", batch_size=batch_size)
+
+    def iter_monkeys(self, batch_size: int = None):
+        """Stream all monkeys. See iter_animals."""
+        return self.iter_animals("monkey", batch_size=batch_size)
+
+    def get_page(self, animal_type: str, offset: int = 0, limit: int = 50, available: bool = False) -> Page:
+        """
+        Retrieve one page of dogs or monkeys, ordered by name.
+        
+        Args:
+            animal_type (str): Type of animal ('dog' or 'monkey')
+            offset (int): Number of animals to skip (use Page.next_offset as the cursor)
+            limit (int): Maximum number of animals to return (the server caps it at 500)
+            available (bool): Only page through available (non-reserved) animals
+            
+        Returns:
+            Page: The requested page with its animals as an AnimalBatch and the total count.
+                While optimistic writes of the animal type are pending, it is cut from the
+                local roster with those writes applied
+            
+        Raises:
+            requests.exceptions.HTTPError: If the request fails
+        """
+        params = {"offset": offset, "limit": limit}
+        if available:
+            path = "/available"
+            params["type"] = animal_type
+        else:
+            path = f"/{animal_type}s"
+        if any(pending.animal_type == animal_type for pending in self._pending_writes()):
+            # Unanswered optimistic writes are shown by paging the local roster with them applied
+            return self._optimistic_roster().page(animal_type, offset, limit, available=available)
+        stale = self.stale_roster
+        if stale is not None:
+            return stale.snapshot.page(animal_type, offset, limit, available=available)
+        return self._get_list(
+            path,
+            lambda data: Page.from_response(animal_type, data, offset, limit),
+            params=params,
+        )
+
+    def search(self, animal_type: str, name: str = "", offset: int = 0, limit: int = 50, **filters) -> Page:
+        """
+        Search dogs or monkeys by name prefix and field filters, one page at a time.
+        
+        The query is pushed down to the server's /search endpoint, so only matching rows are
+        transferred. Against a server without it, the same query runs against the local
+        RosterIndex (see get_roster_index). Page.source tells which one answered.
+        
+        Args:
+            animal_type (str): Type of animal ('dog' or 'monkey')
+            name (str): Case-insensitive name prefix. Empty matches every name
+            offset (int): Number of matches to skip
+            limit (int): Maximum number of animals to return
+            **filters: Exact, case-insensitive values for breed, species, trainingStatus,
+                acquisitionCountry and inServiceCountry; reserved as a bool; age and weight as
+                (low, high) tuples where either bound may be None. None or empty values are ignored
+            
+        Returns:
+            Page: The matching animals, ordered by name, with the total match count
+            
+        Raises:
+            requests.exceptions.HTTPError: If the request fails
+        """
+        filters = {
+            field: value for field, value in filters.items()
+            if value is not None and value != "" and value != (None, None)
+        }
+        if self._server_search is not False and self.stale_roster is None:
+            params = {"type": animal_type, "offset": offset, "limit": limit}
+            if name:
+                params["name"] = name
+            for field, value in filters.items():
+                if field in ("age", "weight"):
+                    low, high = value
+                    if low is not None:
+                        params[f"min{field.capitalize()}"] = low
+                    if high is not None:
+                        params[f"max{field.capitalize()}"] = high
+                elif field == "reserved":
+                    params["reserved"] = "true" if value else "false"
+                else:
+                    params[field] = value
+            try:
+                page = self._get_list(
+                    "/search",
+                    lambda data: Page.from_response(animal_type, data, offset, limit),
+                    params=params,
+                )
+                self._server_search = True
+                return page
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+                self._server_search = False
+        return self.get_roster_index().search(animal_type, name or None, offset, limit, **filters)
+
+    def get_facets(self, animal_type: str):
+        """
+        Retrieve the filter options for the search panel.
+        
+        Args:
+            animal_type (str): Type of animal ('dog' or 'monkey')
+            
+        Returns:
+            dict: Each searchable text field mapped to its distinct values and their animal counts
+            
+        Raises:
+            requests.exceptions.HTTPError: If the request fails
+        """
+        if self._server_search is not False and self.stale_roster is None:
+            try:
+                return self._get_list("/facets", lambda data: data, params={"type": animal_type})
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+                self._server_search = False
+        index = self.get_roster_index()
+        fields = [
+            field for field in RosterIndex.HASH_FIELDS
+            if field != "reserved" and field in MODELS[animal_type].FIELDS
+        ]
+        return {
+            field: {value: count for value, count in index.values(animal_type, field).items() if value is not None}
+            for field in fields
+        }
 
     def add_dog(self, dog: Dog) -> bool:
         """
@@ -96,9 +481,13 @@ class RescueAPI:
         Raises:
             requests.exceptions.HTTPError: If the request fails
         """
-        response = requests.post(f"{self.base_url}/dogs", json=dog.__dict__)
+        response = self.transport.post(f"{self.base_url}/dogs", json=dog.to_dict())
         response.raise_for_status()
-        return response.json()["success"]
+        success = response.json()["success"]
+        if success:
+            self._invalidate()
+            self._index_added("dog", [dog])
+        return success
 
     def add_monkey(self, monkey: Monkey) -> bool:
         """
@@ -113,9 +502,34 @@ class RescueAPI:
         Raises:
             requests.exceptions.HTTPError: If the request fails
         """
-        response = requests.post(f"{self.base_url}/monkeys", json=monkey.__dict__)
+        response = self.transport.post(f"{self.base_url}/monkeys", json=monkey.to_dict())
         response.raise_for_status()
-        return response.json()["success"]
+        success = response.json()["success"]
+        if success:
+            self._invalidate()
+            self._index_added("monkey", [monkey])
+        return success
+
+
+    def gather_snapshot(self):
+        """
+        Retrieve dogs, monkeys and available animals concurrently.
+        
+        Synchronous wrapper around AsyncRescueAPI.gather_snapshot so callers such as app.py
+        pay one round trip of latency without any async plumbing of their own. In snapshot
+        mode only /dogs and /monkeys are requested and the available view is derived locally.
+        
+        Returns:
+            dict: Dictionary containing:
+                - dogs: List of all Dog objects
+                - monkeys: List of all Monkey objects
+                - available: Dictionary of available dogs and monkeys, as returned by get_available_animals
+        """
+        return _run_sync(AsyncRescueAPI(client=self).gather_snapshot())
+
+    def _download_roster(self):
+        """Download dogs and monkeys concurrently and keep them as the roster snapshot."""
+        return _run_sync(AsyncRescueAPI(client=self).get_roster_snapshot())
 
     def reserve_animal(self, animal_type: str, name: str, country: str) -> bool:
         """
@@ -132,9 +546,127 @@ class RescueAPI:
         Raises:
             requests.exceptions.HTTPError: If the request fails
         """
-        response = requests.post(
+        response = self.transport.post(
             f"{self.base_url}/reserve/{animal_type}/{name}",
             params={"country": country}
         )
         response.raise_for_status()
-        return response.json()["success"]
+        success = response.json()["success"]
+        if success:
+            self._invalidate()
+            self._index_reserved([(animal_type, name, country)])
+        return success
+
+
+
+class AsyncRescueAPI:
+    """
+    Asyncio interface to the Java backend with the same method surface as RescueAPI.
+    
+    Each call runs the blocking RescueAPI call in a worker thread, so concurrent calls are sent
+    in parallel over the shared connection pool rather than over a second, separate client.
+    
+    Attributes:
+        client (RescueAPI): The synchronous client whose transport and pool are shared
+    """
+    def __init__(self, base_url="http://localhost:8647", client=None, **pool_options):
+        """
+        Initialize the AsyncRescueAPI client.
+        
+        Args:
+            base_url (str): The base URL for the API endpoints. Ignored when client is given
+            client (RescueAPI): Existing client to share. Defaults to a new RescueAPI
+            **pool_options: Pool settings forwarded to RescueAPI when no client is given
+        """
+        self.client = client or RescueAPI(base_url, **pool_options)
+
+    async def get_dogs(self):
+        """Retrieve all dogs. See RescueAPI.get_dogs."""
+        return await asyncio.to_thread(self.client.get_dogs)
+
+    async def get_monkeys(self):
+        """Retrieve all monkeys. See RescueAPI.get_monkeys."""
+        return await asyncio.to_thread(self.client.get_monkeys)
+
+    async def get_available_animals(self):
+        """Retrieve available animals. See RescueAPI.get_available_animals."""
+        return await asyncio.to_thread(self.client.get_available_animals)
+
+    async def add_dog(self, dog: Dog) -> bool:
+        """Add a new dog. See RescueAPI.add_dog."""
+        return await asyncio.to_thread(self.client.add_dog, dog)
+
+    async def add_monkey(self, monkey: Monkey) -> bool:
+        """Add a new monkey. See RescueAPI.add_monkey."""
+        return await asyncio.to_thread(self.client.add_monkey, monkey)
+
+    async def reserve_animal(self, animal_type: str, name: str, country: str) -> bool:
+        """Reserve an animal for service. See RescueAPI.reserve_animal."""
+        return await asyncio.to_thread(self.client.reserve_animal, animal_type, name, country)
+
+    async def reserve_many(self, reservations, **options):
+        """Reserve many animals. See RescueAPI.reserve_many."""
+        return await asyncio.to_thread(self.client.reserve_many, reservations, **options)
+
+    async def get_roster_snapshot(self):
+        """
+        Return the client's fresh roster snapshot, or download dogs and monkeys concurrently.
+        
+        Returns:
+            RosterSnapshot: Snapshot of the full roster
+        """
+        if self.client.replica is not None:
+            snapshot = await asyncio.to_thread(self.client.sync_roster)
+            if snapshot is not None:
+                return snapshot
+        snapshot = self.client.fresh_snapshot()
+        if snapshot is not None:
+            return snapshot
+        generation = self.client.snapshot_generation()
+        dogs, monkeys = await asyncio.gather(self.get_dogs(), self.get_monkeys())
+        return self.client.store_snapshot(dogs, monkeys, generation=generation)
+
+    async def gather_snapshot(self):
+        """
+        Retrieve dogs, monkeys and available animals with all requests in flight at once.
+        
+        Returns:
+            dict: Dictionary with dogs, monkeys and available keys (see RescueAPI.gather_snapshot)
+        """
+        if self.client.snapshot_ttl is not None:
+            snapshot = await self.get_roster_snapshot()
+            return snapshot.as_dict()
+        dogs, monkeys, available = await asyncio.gather(
+            self.get_dogs(),
+            self.get_monkeys(),
+            self.get_available_animals(),
+        )
+        return {"dogs": dogs, "monkeys": monkeys, "available": available}
+
+
+def _run_sync(coroutine):
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    Uses asyncio.run when the calling thread has no event loop (the normal case for a Streamlit
+    script thread), and a short-lived helper thread when one is already running.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    result = {}
+
+    def runner():
+        try:
+            result["value"] = asyncio.run(coroutine)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=runner)
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
@@ -11,10 +11,21 @@ Design rationale:
 - Explicit column mapping and ordering for clear, user-friendly data presentation.
 """
 
+import inspect
+import io
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
-import pandas as pd
 from api import RescueAPI
-from animals import Dog, Monkey
+from animals import AnimalBatch, Dog, Monkey
+from cache import ResponseCache
+from metrics import metrics
+from prefetch import Prefetcher
+from tables import TABLE_COLUMNS, UNITS, FrameMemo, parse_import, read_records, write_csv
 
 # Configure the page
 # Use a wide layout and custom title.
@@ -47,8 +58,173 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def env_flag(name, default):
+    """
+    Reads an on/off setting from the environment: unset keeps the default, "" or "0" means off.
+    """
+    value = os.environ.get(name)
+    return default if value is None else value not in ("", "0")
+
+# Client modes, all on by default; each can be switched off from the environment to compare
+# against the plain client or to rule a mode out while debugging
+CACHE_ENABLED = env_flag("RESCUE_CACHE", True)
+# Maximum roster snapshot age in seconds; 0 turns snapshot mode off
+SNAPSHOT_TTL = float(os.environ.get("RESCUE_SNAPSHOT_TTL", "10")) or None
+FROZEN_MODELS = env_flag("RESCUE_FROZEN_MODELS", True)
+DELTA_SYNC = env_flag("RESCUE_DELTA_SYNC", True)
+
+# Last good roster, saved next to the backend's database so a restart can show tables at once.
+# RESCUE_SNAPSHOT_PATH moves it; set it to an empty string to turn warm starts off
+SNAPSHOT_PATH = os.environ.get(
+    "RESCUE_SNAPSHOT_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "roster_snapshot.db"),
+) or None
+
+# Roster fetches tried after a restart before the stale notice reports the backend unreachable
+RECONCILE_ATTEMPTS = 10
+
+# Backend workers to balance over, comma-separated (set by run_both.py when it starts several)
+BACKEND_URLS = os.environ.get("RESCUE_BACKENDS", "http://localhost:8647").split(",")
+
+# Metrics export, used when RESCUE_METRICS=1 (run_both.py sets the port per worker)
+METRICS_PORT = os.environ.get("RESCUE_METRICS_PORT")
+METRICS_FILE = os.environ.get("RESCUE_METRICS_FILE")
+
+@st.cache_resource
+def start_metrics_export():
+    """
+    Starts the Prometheus endpoint and/or the periodic file dump once per process.
+    Does nothing while metrics are off, so the app pays no overhead for them.
+    """
+    if not metrics.enabled:
+        return False
+    if METRICS_PORT:
+        metrics.serve(int(METRICS_PORT))
+    if METRICS_FILE:
+        metrics.dump_every(METRICS_FILE)
+    return True
+
+start_metrics_export()
+
 # Initialize the API
-api = RescueAPI()
+# One client is shared by every browser session (see get_api), so its response cache, roster
+# replica and index serve all operators. Short TTLs bound how stale another operator's changes
+# can look; expired entries are revalidated with the server's ETag instead of being downloaded again.
+@st.cache_resource
+def get_api():
+    """
+    Returns the process-wide API client.
+    Cached as a resource so all sessions read through one cache: identical requests from
+    different sessions are served once, and concurrent misses collapse into one backend request.
+    The roster saved by the previous run is served (marked stale) until the backend answers.
+    Each client mode can be switched off from the environment (see CACHE_ENABLED and below).
+    """
+    cache = ResponseCache(ttl={"/dogs": 10.0, "/monkeys": 10.0, "/available": 5.0}, max_entries=256) if CACHE_ENABLED else None
+    client = RescueAPI(
+        BACKEND_URLS,
+        cache=cache,
+        snapshot_ttl=SNAPSHOT_TTL,
+        frozen_models=FROZEN_MODELS,
+        delta_sync=DELTA_SYNC,
+        snapshot_path=SNAPSHOT_PATH,
+    )
+    client.warm_start(max_attempts=RECONCILE_ATTEMPTS)
+    return client
+
+api = get_api()
+
+# Page sizes offered by the windowed tables on the View Animals page
+PAGE_SIZES = [25, 50, 100, 250]
+
+# Seconds between checks of the live update stream by the View Animals tables. A check
+# fetches the table again only if a pushed change affected its animal type; otherwise it
+# redraws the page it showed last, so quiet periods cost no requests and no table builds.
+LIVE_REFRESH_SECONDS = 1
+
+# With RESCUE_OPTIMISTIC_WRITES=1, single adds and reservations are shown at once and sent to
+# the server in the background; a refused write is undone and reported (see show_pending_writes).
+# Off by default: the page then waits for the server's answer
+OPTIMISTIC_WRITES = env_flag("RESCUE_OPTIMISTIC_WRITES", False)
+
+# Seconds between checks of this session's optimistic writes while any is unanswered
+PENDING_WRITE_POLL_SECONDS = 0.5
+
+# Number of animals decoded and written per chunk when streaming a CSV export
+EXPORT_BATCH_SIZE = 1000
+
+# Tabs of the View Animals page, with the tables each shows as (animal_type, available)
+VIEW_TABS = {
+    "Dogs": [("dog", False)],
+    "Monkeys": [("monkey", False)],
+    "Available Animals": [("dog", True), ("monkey", True)],
+    "Search": [],
+}
+
+# Whether this Streamlit release has lazy tabs (st.tabs with key/on_change and Tab.open).
+# Older releases render every tab on each run, so the page falls back to that
+LAZY_TABS = "on_change" in inspect.signature(st.tabs).parameters
+
+# Pages usually opened next from each page. Their data is warmed in the background once the
+# current page has rendered, so following the usual flow renders from warm caches
+NEXT_PAGES = {
+    "Home": ["View Animals", "Reserve Animal"],
+    "Add New Animal": ["View Animals"],
+    "Bulk Import": ["View Animals"],
+    "View Animals": ["Reserve Animal"],
+    "Reserve Animal": ["View Animals"],
+}
+
+# Display labels for the search panel's facet filters
+SEARCH_FACET_LABELS = {
+    "breed": "Breed",
+    "species": "Species",
+    "trainingStatus": "Training Status",
+    "acquisitionCountry": "Acquisition Country",
+    "inServiceCountry": "Service Country",
+}
+
+@st.cache_resource
+def get_prefetch_executor():
+    """
+    Returns the process-wide worker pool used to prefetch the next table page in the background.
+    Cached as a resource so it survives reruns instead of being recreated each time.
+    """
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="page-prefetch")
+
+def lower_thread_priority():
+    """
+    Lowers the OS scheduling priority of the calling thread as far as allowed.
+    Per-thread priorities are a Linux feature; elsewhere the thread keeps normal priority.
+    """
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
+
+@st.cache_resource
+def get_frame_memo():
+    """
+    Returns the process-wide memo of built table DataFrames.
+    Cached as a resource so every session reuses frames built for the same rows, and a table
+    that changed in a few rows is patched instead of rebuilt.
+    """
+    return FrameMemo(max_entries=64)
+
+@st.cache_resource
+def get_prefetcher():
+    """
+    Returns the process-wide prefetcher that warms the data of the page opened next.
+    Cached as a resource so warm-ups started by one session also serve the others.
+    """
+    return Prefetcher(max_workers=2)
+
+@st.cache_resource
+def get_idle_executor():
+    """
+    Returns the process-wide single worker that warms the View Animals tabs nobody is looking at.
+    It runs at the lowest OS priority, so the work only uses time the visible page leaves over.
+    """
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="tab-prefetch", initializer=lower_thread_priority)
 
 def main():
     """
@@ -59,8 +235,8 @@ def main():
     st.title("Rescue Animal System")
     
     # Create navigation bar using columns
-    cols = st.columns(4)
-    pages = ["Home", "Add New Animal", "View Animals", "Reserve Animal"]
+    pages = ["Home", "Add New Animal", "Bulk Import", "View Animals", "Reserve Animal"]
+    cols = st.columns(len(pages))
     
     # Get current page from session state or set default
     if 'current_page' not in st.session_state:
@@ -73,17 +249,125 @@ def main():
             st.session_state.current_page = page
     
     st.markdown("---")  # Horizontal line under navbar
+    show_stale_notice()
+    show_pending_writes()
     
-    # Display the selected page
-    if st.session_state.current_page == "Home":
-        show_home()
-    elif st.session_state.current_page == "Add New Animal":
-        show_add_animal()
-        
-    elif st.session_state.current_page == "View Animals":
-        show_view_animals()
-    elif st.session_state.current_page == "Reserve Animal":
-        show_reserve_animal()
+    # Display the selected page, timing the render when metrics are on
+    with metrics.timer("rescue_page_render_seconds", page=st.session_state.current_page):
+        if st.session_state.current_page == "Home":
+            show_home()
+        elif st.session_state.current_page == "Add New Animal":
+            show_add_animal()
+        elif st.session_state.current_page == "Bulk Import":
+            show_bulk_import()
+        elif st.session_state.current_page == "View Animals":
+            show_view_animals()
+        elif st.session_state.current_page == "Reserve Animal":
+            show_reserve_animal()
+    
+    # Landing on a page makes its usual successors likely; warm them while the user reads
+    for page in NEXT_PAGES.get(st.session_state.current_page, []):
+        prefetch_page(page)
+
+def prefetch_page(page):
+    """
+    Starts fetching, decoding and building the data a page renders first, in the background.
+    Called when a transition to the page is known or likely; the page then renders from the
+    response cache, roster index and frame memo instead of waiting on the backend.
+    """
+    if page == "View Animals":
+        pages = view_tab_pages(st.session_state.get("view_tab", "Dogs"))
+        get_prefetcher().submit((page, pages), warm_view_animals, pages, get_frame_memo())
+    elif page == "Reserve Animal":
+        get_prefetcher().submit((page,), api.get_roster_index)
+
+def warm_view_animals(pages, memo):
+    """
+    Fetches the given View Animals pages and builds their tables into the frame memo.
+    Runs on a prefetch worker, so it takes everything it needs as arguments.
+    """
+    for animal_type, offset, limit, available in pages:
+        page = api.get_page(animal_type, offset, limit, available=available)
+        memo.frame(page.batch, animal_type, view=f"{'available_' if available else ''}{animal_type}")
+
+def show_stale_notice():
+    """
+    Warns that the tables show the roster saved by the previous run while the backend starts.
+    The notice disappears on the next rerun after the background reconciliation succeeds. If it
+    gave up, the error is shown with a button to try again.
+    """
+    stale = api.stale_roster
+    if stale is None:
+        return
+    saved = time.strftime("%Y-%m-%d %H:%M", time.localtime(stale.saved_at))
+    error = api.reconcile_error
+    if error is None:
+        st.warning(f"Connecting to the server - showing the roster saved at {saved}, which may be out of date.")
+        return
+    st.error(f"Could not reach the server ({error}) - showing the roster saved at {saved}, which may be out of date.")
+    st.button("Try again", key="retry_reconcile", on_click=api.warm_start, kwargs={"max_attempts": RECONCILE_ATTEMPTS})
+
+def show_pending_writes():
+    """
+    Reports the outcome of this session's optimistic writes once the server has answered.
+    While any is unanswered, a small fragment polls them and reruns the page when one settles,
+    so the tables switch from the local change to the server's data (or drop a refused change).
+    """
+    writes = st.session_state.get("pending_writes")
+    if not writes:
+        return
+    st.session_state.pending_writes = [write for write in writes if not write.done]
+    for write in writes:
+        if write.status == "failed":
+            st.error(f"Could not {describe_write(write)}: {write.error}. The change has been undone.")
+        elif write.status == "confirmed":
+            st.toast(f"Saved: {describe_write(write)}")
+    if st.session_state.pending_writes:
+        st.fragment(watch_pending_writes, run_every=PENDING_WRITE_POLL_SECONDS)()
+
+def watch_pending_writes():
+    """
+    Shows how many changes are still being saved and reruns the page once one has settled.
+    """
+    writes = st.session_state.get("pending_writes", [])
+    unanswered = sum(not write.done for write in writes)
+    if unanswered < len(writes):
+        st.rerun()
+    st.caption(f"Saving {unanswered} change{'s' if unanswered != 1 else ''}...")
+
+def describe_write(write):
+    """
+    Describes an optimistic write for the user, e.g. "add dog Rex".
+    """
+    return f"{write.kind} {write.animal_type} {write.name}"
+
+def save_animal(animal_type, animal):
+    """
+    Adds an animal, optimistically when OPTIMISTIC_WRITES is on.
+    Returns True once the add is accepted: confirmed by the server, or shown locally and queued
+    (its outcome is then reported by show_pending_writes). False means it was refused.
+    """
+    if not OPTIMISTIC_WRITES:
+        return api.add_dog(animal) if animal_type == "dog" else api.add_monkey(animal)
+    return track_write(api.add_animal_optimistic(animal_type, animal))
+
+def reserve_one(animal_type, name, country):
+    """
+    Reserves an animal, optimistically when OPTIMISTIC_WRITES is on. Returns like save_animal.
+    """
+    if not OPTIMISTIC_WRITES:
+        return api.reserve_animal(animal_type, name, country)
+    return track_write(api.reserve_animal_optimistic(animal_type, name, country))
+
+def track_write(pending):
+    """
+    Remembers an optimistic write in the session so its outcome can be reported.
+    Returns False if the write was refused locally before reaching the server.
+    """
+    if pending.status == "failed":
+        return False
+    st.session_state.setdefault("pending_writes", []).append(pending)
+    return True
 
 def show_home():
     """
@@ -96,6 +380,7 @@ def show_home():
     Use the sidebar to navigate through different functions:
     
     - **Add New Animal**: Register a new dog or monkey into the system
+    - **Bulk Import**: Load many dogs or monkeys at once from a CSV or JSON file
     - **View Animals**: See all registered animals and their status
     - **Reserve Animal**: Reserve an available service animal
     """)
@@ -216,7 +501,7 @@ def show_add_animal():
                     
                     animal_data["breed"] = breed.strip()
                     dog = Dog(**animal_data)
-                    success = api.add_dog(dog)
+                    success = save_animal("dog", dog)
                     st.success(f"Dog {name} added successfully!")
                 else:
                     # Validate monkey measurements
@@ -242,11 +527,13 @@ def show_add_animal():
                         st.error("Please enter the service country for an animal in service.")
                         return
                     monkey = Monkey(**animal_data)
-                    success = api.add_monkey(monkey)
+                    success = save_animal("monkey", monkey)
                     st.success(f"Monkey {name} added successfully!")
                 
                 if success:
                     st.session_state.current_page = "View Animals"
+                    # Start loading the updated table before the rerun asks for it
+                    prefetch_page("View Animals")
                     st.rerun()
                 else:
                     st.error(f"Failed to add {animal_type.lower()}. The name may already be taken.")
@@ -255,6 +542,70 @@ def show_add_animal():
                 # Debug logging
                 st.write("Exception details:", str(e))
 
+def show_bulk_import():
+    """
+    Displays the bulk import page for loading an intake file of dogs or monkeys.
+    Every record is validated locally first; valid records are sent in chunks through the
+    bulk endpoint while a progress bar reports throughput, and per-record failures are listed.
+    """
+    st.header("Bulk Import")
+    
+    animal_type = st.selectbox("Select Animal Type", ["Dog", "Monkey"], key="bulk_animal_type")
+    st.markdown("""
+    Upload a CSV file or a JSON array whose columns/keys match the animal's field names
+    (the CSV export on the View Animals page uses the same format).
+    """)
+    uploaded = st.file_uploader("Intake File", type=["csv", "json"])
+    if uploaded is None:
+        return
+    
+    try:
+        uploaded.seek(0)
+        records = read_records(uploaded, uploaded.name)
+    except (ValueError, UnicodeDecodeError) as e:
+        st.error(f"Could not read {uploaded.name}: {str(e)}")
+        return
+    
+    animals, errors = parse_import(records, animal_type.lower())
+    st.write(f"{len(animals)} valid records, {len(errors)} rejected")
+    if errors:
+        st.dataframe(
+            [{"Row": row, "Name": name, "Error": message} for row, name, message in errors],
+            hide_index=True,
+        )
+    
+    if not animals or not st.button(f"Import {len(animals)} {animal_type.lower()}s"):
+        return
+    
+    progress_bar = st.progress(0.0, text="Starting import...")
+    started = time.perf_counter()
+    
+    def report(done):
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        progress_bar.progress(
+            done / len(animals),
+            text=f"{done}/{len(animals)} processed ({done / elapsed:.0f} animals/s)",
+        )
+    
+    try:
+        results = api.add_animals(animal_type.lower(), animals, progress=report)
+    except Exception as e:
+        st.error(f"Import failed: {str(e)}")
+        return
+    
+    elapsed = time.perf_counter() - started
+    failed = [result for result in results if not result.success]
+    st.success(
+        f"Imported {len(results) - len(failed)} of {len(results)} {animal_type.lower()}s "
+        f"in {elapsed:.1f}s ({len(results) / max(elapsed, 1e-9):.0f} animals/s)"
+    )
+    if failed:
+        st.warning(f"{len(failed)} records were not imported")
+        st.dataframe(
+            [{"Name": result.name, "Error": result.error or "rejected by server"} for result in failed],
+            hide_index=True,
+        )
+
 def show_view_animals():
     """
     Displays all animals in the system, separated by type and availability.
@@ -262,92 +613,268 @@ def show_view_animals():
     Handles API errors gracefully for a robust user experience.
     """
     st.header("View Animals")
+    # A full run fetches every table; only the live fragments' timed refreshes reuse pages
+    st.session_state.live_pages = {}
+    show_live_status(api.start_live_updates())
     
     # Create tabs for different views
-    tab1, tab2, tab3 = st.tabs(["Dogs", "Monkeys", "Available Animals"])
+    (tab1, open1), (tab2, open2), (tab3, open3), (tab4, open4) = view_tabs()
     
     try:
-        with tab1:  # Dogs
-            dogs = api.get_dogs()
-            show_animals_table(dogs, "dog")
+        # Each tab fetches and renders only the visible page of its table
+        if open1:
+            with tab1:  # Dogs
+                show_live_table("dog")
+                show_csv_export("dog")
+            
+        if open2:
+            with tab2:  # Monkeys
+                show_live_table("monkey")
+                show_csv_export("monkey")
             
-        with tab2:  # Monkeys
-            monkeys = api.get_monkeys()
-            show_animals_table(monkeys, "monkey")
+        if open3:
+            with tab3:  # Available Animals
+                show_available_animals()
             
-        with tab3:  # Available Animals
-            available_animals = api.get_available_animals()
-            show_available_animals(available_animals)
+        if open4:
+            with tab4:  # Search
+                show_search_panel()
+    except Exception as e:
+        st.error(f"Error fetching animals: {str(e)}")
+    
+    if LAZY_TABS:
+        prefetch_view_tabs(st.session_state.get("view_tab", "Dogs"))
+
+def view_tabs():
+    """
+    Creates the View Animals tabs and returns (tab, is_open) for each.
+    With lazy tabs, switching tabs reruns the page and only the open tab's body runs, so the
+    other tabs cost no fetch or render work. Without them every tab is reported open, since
+    older Streamlit releases render all tabs and switch between them in the browser.
+    """
+    if LAZY_TABS:
+        return [(tab, tab.open) for tab in st.tabs(list(VIEW_TABS), key="view_tab", on_change="rerun")]
+    return [(tab, True) for tab in st.tabs(list(VIEW_TABS))]
+
+def prefetch_view_tabs(active):
+    """
+    Warms the cache with the page each closed tab would show, once the open tab is rendered.
+    The pages are fetched on the idle worker, so a later tab switch renders from the cache.
+    """
+    for tab in VIEW_TABS:
+        if tab == active:
+            continue
+        for animal_type, offset, limit, available in view_tab_pages(tab):
+            get_idle_executor().submit(api.get_page, animal_type, offset, limit, available)
+
+def view_tab_pages(tab):
+    """
+    Returns the (animal_type, offset, limit, available) pages a View Animals tab shows,
+    following the page size and page number the session picked for each table.
+    """
+    pages = []
+    for animal_type, available in VIEW_TABS[tab]:
+        key = f"{'available_' if available else ''}{animal_type}"
+        page_size = st.session_state.get(f"{key}_page_size", PAGE_SIZES[1])
+        page_number = st.session_state.get(f"{key}_page", 1)
+        pages.append((animal_type, (page_number - 1) * page_size, page_size, available))
+    return tuple(pages)
+
+def show_search_panel():
+    """
+    Displays a search and filter panel over one animal type.
+    Filtering runs on the server when it supports search, otherwise against the local roster
+    index, so only the matching page of rows is sent to the browser. The query latency and
+    where the query ran are shown with the results.
+    """
+    animal_type = st.selectbox("Animal Type", ["Dog", "Monkey"], key="search_animal_type").lower()
+    facets = api.get_facets(animal_type)
+    
+    name = st.text_input("Name starts with", key=f"search_{animal_type}_name")
+    filters = {}
+    facet_cols = st.columns(len(facets) + 1)
+    for col, (field, counts) in zip(facet_cols, facets.items()):
+        label = SEARCH_FACET_LABELS.get(field, field)
+        options = ["Any"] + sorted(counts, key=str.casefold)
+        choice = col.selectbox(
+            label,
+            options,
+            format_func=lambda value, counts=counts: value if value == "Any" else f"{value} ({counts[value]})",
+            key=f"search_{animal_type}_{field}",
+        )
+        filters[field] = None if choice == "Any" else choice
+    reserved = facet_cols[-1].selectbox("Reserved", ["Any", "Yes", "No"], key=f"search_{animal_type}_reserved")
+    filters["reserved"] = None if reserved == "Any" else reserved == "Yes"
+    
+    min_age_col, max_age_col, min_weight_col, max_weight_col = st.columns(4)
+    filters["age"] = (
+        min_age_col.number_input("Min age", min_value=0, value=None, step=1, key=f"search_{animal_type}_min_age"),
+        max_age_col.number_input("Max age", min_value=0, value=None, step=1, key=f"search_{animal_type}_max_age"),
+    )
+    filters["weight"] = (
+        min_weight_col.number_input("Min weight", min_value=0.0, value=None, key=f"search_{animal_type}_min_weight"),
+        max_weight_col.number_input("Max weight", min_value=0.0, value=None, key=f"search_{animal_type}_max_weight"),
+    )
+    
+    size_col, page_col, info_col = st.columns([1, 1, 2])
+    page_size = size_col.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"search_{animal_type}_page_size")
+    page_number = page_col.number_input("Page", min_value=1, value=1, step=1, key=f"search_{animal_type}_page")
+    offset = (page_number - 1) * page_size
+    
+    started = time.perf_counter()
+    page = api.search(animal_type, name.strip(), offset, page_size, **filters)
+    latency_ms = (time.perf_counter() - started) * 1000
+    
+    where = "server" if page.source == "server" else "local index"
+    page_count = max(1, math.ceil(page.total / page_size))
+    info_col.caption(
+        f"{page.total} matches in {latency_ms:.1f} ms ({where}) - page {min(page_number, page_count)} of {page_count}"
+    )
+    if not len(page):
+        st.info("No animals match the search")
+        return
+    show_animals_table(page.batch, animal_type, view=f"search_{animal_type}", version=page.version)
+
+def show_live_status(events):
+    """
+    Displays a caption while the live update stream is connected.
+    The stream usually connects after the page's first render, so the caption runs as a fragment
+    refreshed with the live tables and appears on the first refresh after it connects.
+    """
+    refresh = LIVE_REFRESH_SECONDS if events.supported else None
+    st.fragment(live_status_caption, run_every=refresh)()
+
+def live_status_caption():
+    """Renders the live updates caption as the body of a fragment."""
+    if api.is_live():
+        st.caption("Live updates on: tables refresh as soon as any operator adds or reserves an animal.")
+
+def show_live_table(animal_type, available=False):
+    """
+    Displays a windowed table that keeps itself current while the server pushes live updates.
+    The table runs as a Streamlit fragment, so a refresh re-renders only that table instead of
+    the whole page, and it fetches the table again only after a pushed change to its animal type
+    (see live_page).
+    """
+    refresh = LIVE_REFRESH_SECONDS if api.events is not None and api.events.supported else None
+    st.fragment(refresh_windowed_table, run_every=refresh)(animal_type, available)
+
+def refresh_windowed_table(animal_type, available):
+    """
+    Renders one windowed table as the body of a live fragment.
+    Errors are shown in place, since a fragment refresh runs outside the page's error handling.
+    """
+    try:
+        show_windowed_table(animal_type, available)
     except Exception as e:
         st.error(f"Error fetching animals: {str(e)}")
 
-def show_animals_table(animals, animal_type):
+def show_windowed_table(animal_type, available=False):
+    """
+    Displays one page of a paginated animal table with page size and page number controls.
+    Only the visible page is fetched from the server; the following page is prefetched in the
+    background so that paging forward is served from the response cache.
+    """
+    key = f"{'available_' if available else ''}{animal_type}"
+    size_col, page_col, info_col = st.columns([1, 1, 2])
+    page_size = size_col.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    page_number = page_col.number_input("Page", min_value=1, value=1, step=1, key=f"{key}_page")
+    offset = (page_number - 1) * page_size
+    
+    page = live_page(key, animal_type, offset, page_size, available)
+    page_count = max(1, math.ceil(page.total / page_size))
+    if page.total and offset >= page.total:
+        info_col.warning(f"Page {page_number} is past the end; there are {page_count} pages.")
+        return
+    
+    first = offset + 1 if len(page) else 0
+    info_col.caption(f"Showing {first}-{offset + len(page)} of {page.total} (page {page_number} of {page_count})")
+    show_animals_table(page.batch, animal_type, view=key, version=page.version)
+    
+    # Warm the cache with the next page; failures only cost a normal fetch later
+    if page.has_next:
+        get_prefetch_executor().submit(api.get_page, animal_type, page.next_offset, page_size, available)
+
+def live_page(key, animal_type, offset, page_size, available):
+    """
+    Returns the page a windowed table shows.
+    While the live stream is open, the page shown last is reused until the stream's version for
+    the animal type moves on (an add, a reservation or a reconnection), so a timed refresh of a
+    quiet table costs nothing. show_view_animals clears the pages on every full run.
+    """
+    events = api.events
+    version = events.version(animal_type) if events is not None and events.connected else None
+    shown = st.session_state.setdefault("live_pages", {}).get(key)
+    if version is not None and shown is not None and shown[:3] == (version, offset, page_size):
+        return shown[3]
+    page = api.get_page(animal_type, offset, page_size, available=available)
+    st.session_state.live_pages[key] = (version, offset, page_size, page)
+    return page
+
+def show_animals_table(animals, animal_type, view=None, version=None):
     """
     Displays a table of animals (dogs or monkeys) with user-friendly column names and units.
-    Uses a FILLER placeholder to insert type-specific columns in a consistent order.
-    Ensures only existing columns are displayed, preventing index errors.
-    """
-    if animal_type == "dog":
-        columns = [
-            ("Name", "name"),
-            ("Gender", "gender"),
-            ("Age (years)", "age"),
-            ("Weight (lbs)", "weight"),
-            ("Breed", "breed"),
-            ("Acquisition Date", "acquisitionDate"),
-            ("Acquisition Country", "acquisitionCountry"),
-            ("Service Country", "inServiceCountry"),
-            ("Training Status", "trainingStatus"),
-            ("Reserved", "reserved"),
-        ]
-    elif animal_type == "monkey":
-        columns = [
-            ("Name", "name"),
-            ("Gender", "gender"),
-            ("Age (years)", "age"),
-            ("Weight (lbs)", "weight"),
-            ("Species", "species"),
-            ("Tail Length (ft)", "tailLength"),
-            ("Height (ft)", "height"),
-            ("Body Length (ft)", "bodyLength"),
-            ("Acquisition Date", "acquisitionDate"),
-            ("Acquisition Country", "acquisitionCountry"),
-            ("Service Country", "inServiceCountry"),
-            ("Training Status", "trainingStatus"),
-            ("Reserved", "reserved"),
-        ]
-    else:
+    Accepts model objects or a columnar AnimalBatch. The DataFrame is built column-wise by
+    tables.build_animals_frame; unit suffixes are applied as column formatting so measurements
+    stay numeric and sort correctly.
+    Frames come from the shared memo: unchanged rows reuse the frame built on an earlier rerun
+    or in another session, and a view whose rows changed slightly is patched. version is the
+    page's roster version, which lets the memo find the frame without reading the rows.
+    """
+    batch = animals if isinstance(animals, AnimalBatch) else AnimalBatch.from_animals(animal_type, animals)
+    df = get_frame_memo().frame(batch, animal_type, view=view, version=version)
+    if df is None:
+        return
+
+    # Remove the index column by setting hide_index=True
+    st.dataframe(df, hide_index=True, column_config=unit_column_config(animal_type))
+
+def unit_column_config(animal_type):
+    """
+    Builds Streamlit column formatting that appends units to the numeric columns.
+    Integers (age) are shown without decimals, measurements with one decimal place.
+    """
+    config = {}
+    for label, field in TABLE_COLUMNS[animal_type]:
+        unit = UNITS.get(field)
+        if unit is None:
+            continue
+        number_format = f"%d {unit}" if field == "age" else f"%.1f {unit}"
+        config[label] = st.column_config.NumberColumn(label, format=number_format)
+    return config
+
+def show_csv_export(animal_type):
+    """
+    Offers a CSV download of every dog or monkey.
+    The roster is streamed from the server and converted batch by batch, so the decoded JSON and
+    model objects for the whole roster are never held at once. The CSV bytes themselves are held
+    in memory, since st.download_button keeps its data in memory either way.
+    """
+    if not st.button("Prepare CSV export", key=f"{animal_type}_export"):
         return
+    
+    text = io.StringIO(newline="")
+    batches = api.iter_animals(animal_type, batch_size=EXPORT_BATCH_SIZE)
+    count = write_csv(batches, animal_type, text)
+    data = text.getvalue().encode("utf-8")
+    
+    st.download_button(
+        f"Download {count} {animal_type}s as CSV",
+        data,
+        file_name=f"{animal_type}s.csv",
+        mime="text/csv",
+        key=f"{animal_type}_export_download",
+    )
 
-    data = []
-    for animal in animals:
-        row = []
-        for col, attr in columns:
-            value = getattr(animal, attr, "")
-            if attr == "reserved":
-                value = "Yes" if value else "No"
-            elif attr == "age":
-                value = f"{value} years"
-            elif attr == "weight":
-                value = f"{value} lbs"
-            elif attr in ("tailLength", "height", "bodyLength"):
-                value = f"{value} ft"
-            row.append(value)
-        data.append(row)
-
-    # Remove the index column by setting index=False
-    df = pd.DataFrame(data, columns=[col for col, _ in columns])
-    st.dataframe(df, hide_index=True)
-
-def show_available_animals(available):
+def show_available_animals():
     """
     Displays available (unreserved) dogs and monkeys in separate sections.
-    Calls show_animals_table for each type for consistent formatting.
+    Calls show_live_table for each type for consistent formatting and paging.
     """
     st.subheader("Available Dogs")
-    show_animals_table(available["dogs"], "dog")
+    show_live_table("dog", available=True)
     st.subheader("Available Monkeys")
-    show_animals_table(available["monkeys"], "monkey")
+    show_live_table("monkey", available=True)
 
 def show_reserve_animal():
     """
@@ -356,23 +883,27 @@ def show_reserve_animal():
     Updates the UI and session state on successful reservation.
     """
     st.header("Reserve Animal")
+    show_reserve_summary()
     
     try:
-        # Get available animals
-        available_animals = api.get_available_animals()
+        # The roster index answers the availability filter from its hash indexes and is
+        # updated in place after a reservation, so reruns do not rescan or refetch the roster
+        index = api.get_roster_index()
         
         # Let user choose animal type
         animal_type = st.selectbox("Select Animal Type", ["Dog", "Monkey"])
         
-        # Get the appropriate list of animals
-        animals = available_animals["dogs"] if animal_type == "Dog" else available_animals["monkeys"]
+        # Names of the available animals of that type
+        animal_names = index.names(animal_type.lower(), reserved=False, trainingStatus="in service")
         
-        if not animals:
+        if not animal_names:
             st.warning(f"No {animal_type.lower()}s available for reservation")
             return
         
-        # Create selection options
-        animal_names = [animal.name for animal in animals]
+        mode = st.radio("Reserve", ["One animal", "Several animals"], horizontal=True)
+        if mode == "Several animals":
+            show_reserve_many(animal_type, animal_names)
+            return
         selected_name = st.selectbox(f"Select {animal_type}", animal_names)
         
         # Get country for service
@@ -384,7 +915,7 @@ def show_reserve_animal():
                 return
             
             try:
-                success = api.reserve_animal(
+                success = reserve_one(
                     animal_type.lower(),
                     selected_name,
                     country
@@ -394,6 +925,7 @@ def show_reserve_animal():
                     st.success(f"{animal_type} reserved successfully!")
                     # Clear the form
                     st.session_state.current_page = "View Animals"
+                    prefetch_page("View Animals")
                     st.rerun()
                 else:
                     st.error("Failed to reserve animal. Please try again.")
@@ -404,5 +936,64 @@ def show_reserve_animal():
     except Exception as e:
         st.error(f"Error loading available animals: {str(e)}")
 
+def show_reserve_many(animal_type, animal_names):
+    """
+    Displays the multi-select reservation form for a deployment order.
+    All selected animals are reserved for one country through the bulk reservation endpoint,
+    and the per-animal outcome is kept for the next rerun, when the available list is refreshed.
+    """
+    select_all = st.checkbox(f"Select all {len(animal_names)} available {animal_type.lower()}s")
+    selected_names = st.multiselect(
+        f"Select {animal_type}s",
+        animal_names,
+        default=animal_names if select_all else None,
+    )
+    country = st.text_input("Service Country", key="reserve_many_country")
+    
+    if not st.button(f"Reserve {len(selected_names)} {animal_type.lower()}s", disabled=not selected_names):
+        return
+    if not country:
+        st.error("Please enter a service country")
+        return
+    
+    progress_bar = st.progress(0.0, text="Reserving...")
+    started = time.perf_counter()
+    try:
+        results = api.reserve_many(
+            [(animal_type.lower(), name, country) for name in selected_names],
+            progress=lambda done: progress_bar.progress(done / len(selected_names), text=f"{done}/{len(selected_names)} processed"),
+        )
+    except Exception as e:
+        st.error(f"Error reserving animals: {str(e)}")
+        return
+    
+    st.session_state.reserve_summary = {
+        "animal_type": animal_type.lower(),
+        "country": country,
+        "elapsed": time.perf_counter() - started,
+        "results": results,
+    }
+    st.rerun()
+
+def show_reserve_summary():
+    """
+    Displays the outcome of the last bulk reservation, once, after the page reloads.
+    """
+    summary = st.session_state.pop("reserve_summary", None)
+    if summary is None:
+        return
+    results = summary["results"]
+    failed = [result for result in results if not result.success]
+    st.success(
+        f"Reserved {len(results) - len(failed)} of {len(results)} {summary['animal_type']}s "
+        f"for {summary['country']} in {summary['elapsed']:.1f}s"
+    )
+    if failed:
+        st.warning(f"{len(failed)} animals were not reserved")
+        st.dataframe(
+            [{"Name": result.name, "Error": result.error or "rejected by server"} for result in failed],
+            hide_index=True,
+        )
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
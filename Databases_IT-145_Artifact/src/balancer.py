@@ -0,0 +1,314 @@
+"""Client-side load balancing and passive health checks over several backend workers."""
+
+import itertools
+import threading
+import time
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+# Paths served only by the primary, because their state lives in one JVM
+PINNED_PATHS = ("/changes", "/events")
+
+# Status codes that mark a worker as failing rather than the request as invalid
+FAILURE_STATUSES = frozenset({502, 503, 504})
+
+
+class Endpoint:
+    """
+    One backend worker and its passive health state.
+
+    Attributes:
+        url (str): Base URL of the worker
+        outstanding (int): Requests currently in flight
+        failures (int): Consecutive failed requests
+        ejected_until (float): Monotonic time until which the worker receives no traffic
+        ejections (int): Times the worker has been ejected
+        requests (int): Requests sent to the worker
+        errors (int): Requests that failed
+    """
+    def __init__(self, url):
+        self.url = url
+        self.outstanding = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.ejections = 0
+        self.requests = 0
+        self.errors = 0
+
+    def available(self, now):
+        """Return True if the worker may receive requests at monotonic time now."""
+        return now >= self.ejected_until
+
+
+class EndpointPool:
+    """
+    Thread-safe set of backend workers with load balancing and outlier ejection.
+
+    Attributes:
+        endpoints (list[Endpoint]): The workers, the preferred primary first
+        strategy (str): "least_outstanding" or "round_robin"
+    """
+    def __init__(self, urls, strategy="least_outstanding", max_failures=3, eject_seconds=5.0,
+                 max_eject_seconds=60.0):
+        """
+        Initialize the pool.
+
+        Args:
+            urls (list[str]): Base URLs of the workers; the first is the preferred primary
+            strategy (str): "least_outstanding" sends each read to the worker with the fewest
+                requests in flight; "round_robin" cycles through the workers
+            max_failures (int): Consecutive failures after which a worker is ejected
+            eject_seconds (float): Cooldown after the first ejection; doubled on each ejection
+                in a row
+            max_eject_seconds (float): Upper bound for the cooldown
+
+        Raises:
+            ValueError: If no URL is given or the strategy is unknown
+        """
+        if not urls:
+            raise ValueError("at least one backend URL is required")
+        if strategy not in ("least_outstanding", "round_robin"):
+            raise ValueError(f"unknown balancing strategy: {strategy}")
+        self.endpoints = [Endpoint(url.rstrip("/")) for url in urls]
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.eject_seconds = eject_seconds
+        self.max_eject_seconds = max_eject_seconds
+        self._cycle = itertools.count()
+        self._lock = threading.Lock()
+        self._primary_url = self.endpoints[0].url
+        self._primary_watchers = []
+
+    def pick(self, exclude=()):
+        """
+        Choose a worker for a read and count the request as in flight.
+
+        If every worker is ejected, the one whose cooldown ends first is used anyway, so a
+        fully failed pool keeps trying instead of refusing all requests.
+
+        Args:
+            exclude (Iterable[Endpoint]): Workers already tried for this request
+
+        Returns:
+            Endpoint: The chosen worker, or None if all were excluded
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude]
+            if not candidates:
+                return None
+            healthy = [endpoint for endpoint in candidates if endpoint.available(now)]
+            if not healthy:
+                chosen = min(candidates, key=lambda endpoint: endpoint.ejected_until)
+            elif self.strategy == "round_robin":
+                chosen = healthy[next(self._cycle) % len(healthy)]
+            else:
+                start = next(self._cycle) % len(healthy)
+                # Rotating the start breaks ties between equally loaded workers fairly
+                rotated = healthy[start:] + healthy[:start]
+                chosen = min(rotated, key=lambda endpoint: endpoint.outstanding)
+            return self._begin(chosen)
+
+    def primary(self, exclude=()):
+        """
+        Choose the worker for writes and pinned reads and count the request as in flight.
+
+        Change sequence numbers, idempotency keys and live events are kept per JVM, so they
+        stay consistent only while one worker takes every write.
+
+        Args:
+            exclude (Iterable[Endpoint]): Workers already tried for this request
+
+        Returns:
+            Endpoint: The first worker that is not ejected (or, if all are, the one whose
+                cooldown ends first), or None if all were excluded
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude]
+            if not candidates:
+                return None
+            return self._begin(self._first_available(candidates, now))
+
+    @staticmethod
+    def _first_available(candidates, now):
+        return next(
+            (endpoint for endpoint in candidates if endpoint.available(now)),
+            min(candidates, key=lambda endpoint: endpoint.ejected_until),
+        )
+
+    def primary_url(self):
+        """
+        Return the base URL of the current primary, without counting a request.
+
+        Returns:
+            str: Base URL of the worker that writes and pinned reads currently go to
+        """
+        with self._lock:
+            return self._first_available(self.endpoints, time.monotonic()).url
+
+    def watch_primary(self, callback):
+        """
+        Register a function called as callback(url) when the primary changes.
+
+        Changes are noticed as requests complete (see release), so a worker whose cooldown
+        ended takes over again at the next request. Callbacks run on the requesting thread.
+
+        Args:
+            callback (callable): The function to call with the new primary's base URL
+        """
+        with self._lock:
+            self._primary_watchers.append(callback)
+
+    def _begin(self, endpoint):
+        endpoint.outstanding += 1
+        endpoint.requests += 1
+        return endpoint
+
+    def release(self, endpoint, ok):
+        """
+        Record the outcome of a request started by pick or primary.
+
+        Args:
+            endpoint (Endpoint): The worker the request went to
+            ok (bool): False if the worker failed (connection error, timeout or 502/503/504)
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            if ok:
+                endpoint.failures = 0
+                endpoint.ejected_until = 0.0
+            else:
+                endpoint.errors += 1
+                endpoint.failures += 1
+                if endpoint.failures >= self.max_failures:
+                    # Each ejection in a row doubles the cooldown; once it ends, the worker gets
+                    # traffic again and a further failure ejects it at once
+                    doublings = min(endpoint.failures - self.max_failures, 16)
+                    cooldown = min(self.eject_seconds * 2 ** doublings, self.max_eject_seconds)
+                    endpoint.ejected_until = time.monotonic() + cooldown
+                    endpoint.ejections += 1
+            primary = self._first_available(self.endpoints, time.monotonic()).url
+            watchers = []
+            if primary != self._primary_url:
+                self._primary_url = primary
+                watchers = list(self._primary_watchers)
+        for callback in watchers:
+            callback(primary)
+
+    def stats(self):
+        """
+        Report per-worker load and health.
+
+        Returns:
+            list[dict]: One dict per worker with url, healthy, outstanding, requests, errors
+                and ejections
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "url": endpoint.url,
+                    "healthy": endpoint.available(now),
+                    "outstanding": endpoint.outstanding,
+                    "requests": endpoint.requests,
+                    "errors": endpoint.errors,
+                    "ejections": endpoint.ejections,
+                }
+                for endpoint in self.endpoints
+            ]
+
+
+def _never_sent(error):
+    """Return True if a connection error happened before the request reached the server."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class BalancedTransport:
+    """
+    Transport that sends each request to a worker chosen by an EndpointPool.
+
+    URLs are built against the first worker's base URL, as with a single backend, and rewritten
+    to the chosen worker. It offers the same request/get/post/stats interface as PooledTransport.
+
+    Attributes:
+        pool (EndpointPool): The workers
+        transport (PooledTransport): The connection pool the requests are sent through
+    """
+    def __init__(self, pool, transport):
+        """
+        Initialize the transport.
+
+        Args:
+            pool (EndpointPool): The workers
+            transport (PooledTransport): The connection pool to send requests through
+        """
+        self.pool = pool
+        self.transport = transport
+        self._base = pool.endpoints[0].url
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request to a worker, retrying on another one where that is safe.
+
+        Args:
+            method (str): HTTP method
+            url (str): Absolute URL against the first worker's base URL
+            **kwargs: Extra arguments forwarded to PooledTransport.request
+
+        Returns:
+            requests.Response: The server response
+
+        Raises:
+            requests.exceptions.RequestException: If every worker tried failed
+        """
+        if not url.startswith(self._base):
+            return self.transport.request(method, url, **kwargs)
+        path = url[len(self._base):]
+        read = method in ("GET", "HEAD")
+        pinned = not read or path.split("?", 1)[0] in PINNED_PATHS
+        tried = []
+        last_error = None
+        while True:
+            endpoint = self.pool.primary(tried) if pinned else self.pool.pick(tried)
+            if endpoint is None:
+                raise last_error
+            tried.append(endpoint)
+            try:
+                response = self.transport.request(method, endpoint.url + path, **kwargs)
+            except requests.exceptions.RequestException as e:
+                self.pool.release(endpoint, ok=False)
+                retryable = isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+                if not retryable or not (read or _never_sent(e)):
+                    raise
+                last_error = e
+                continue
+            failed = response.status_code in FAILURE_STATUSES
+            self.pool.release(endpoint, ok=not failed)
+            if failed and read and len(tried) < len(self.pool.endpoints):
+                response.close()
+                continue
+            return response
+
+    def get(self, url, **kwargs):
+        """Send a GET request to a worker."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """Send a POST request to the primary worker."""
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        """
+        Report connection pool statistics together with per-worker load and health.
+
+        Returns:
+            dict: See PooledTransport.stats, plus endpoints (see EndpointPool.stats)
+        """
+        stats = self.transport.stats()
+        stats["endpoints"] = self.pool.stats()
+        return stats
@@ -0,0 +1,243 @@
+"""Bulk adds and reservations, and group commit of single adds, for RescueAPI."""
+
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+
+import requests
+
+from metrics import metrics
+from writequeue import WriteQueue
+
+class BulkResult:
+    """
+    Outcome of one record in a bulk request.
+    
+    Attributes:
+        name (str): Name of the animal the record refers to
+        success (bool): Whether the record was applied
+        error (str): Reason for the failure, or None on success
+    """
+    __slots__ = ("name", "success", "error")
+
+    def __init__(self, name, success, error=None):
+        self.name = name
+        self.success = success
+        self.error = error
+
+    def __repr__(self):
+        return f"BulkResult(name={self.name!r}, success={self.success!r}, error={self.error!r})"
+
+
+
+def _chunked(iterable, size):
+    """Yield lists of up to size items from iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class BulkWritesMixin:
+    """
+    Bulk write methods of RescueAPI.
+    
+    Relies on the client's base_url, transport, add_dog, add_monkey, reserve_animal,
+    _invalidate, _index_added and _index_reserved.
+    """
+    def _init_bulk_writes(self, write_batch_size, write_linger):
+        """Set up the group commit queue settings. Called from RescueAPI.__init__."""
+        self.write_batch_size = write_batch_size
+        self.write_linger = write_linger
+        self._write_queue = None
+        self._write_queue_lock = threading.Lock()
+        # Whether the server has the /dogs/batch and /monkeys/batch endpoints (None = not known yet)
+        self._batch_writes = None
+        # Whether the server has the /reserve/batch endpoint (None = not known yet)
+        self._batch_reserve = None
+
+    def add_animals(self, animal_type: str, animals, chunk_size: int = 500, max_workers: int = 2, progress=None):
+        """
+        Add many dogs or monkeys, sending them in chunks.
+        
+        Each chunk is posted to the bulk endpoint and saved by the server in one transaction;
+        up to max_workers chunks are in flight at once. Against a server without the bulk
+        endpoints, each chunk falls back to one POST per animal. A failed request marks every
+        record of its chunk as failed instead of aborting the whole import.
+        
+        Args:
+            animal_type (str): Type of animal ('dog' or 'monkey')
+            animals (Iterable[Dog | Monkey]): Animals to add
+            chunk_size (int): Number of animals per request
+            max_workers (int): Number of chunks sent concurrently
+            progress (callable): Called with the number of records processed so far after each chunk
+            
+        Returns:
+            list[BulkResult]: One result per animal, in input order
+        """
+        results = []
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bulk-add") as executor:
+            chunks = _chunked(animals, chunk_size)
+            for chunk_results in executor.map(lambda chunk: self._add_chunk(animal_type, chunk), chunks):
+                results.extend(chunk_results)
+                if progress is not None:
+                    progress(len(results))
+        return results
+
+    def add_dogs(self, dogs, **options):
+        """Add many dogs. See add_animals for options and return value."""
+        return self.add_animals("dog", dogs, **options)
+
+    def add_monkeys(self, monkeys, **options):
+        """Add many monkeys. See add_animals for options and return value."""
+        return self.add_animals("monkey", monkeys, **options)
+
+    def queue_add(self, animal_type: str, animal) -> Future:
+        """
+        Queue a dog or monkey to be added together with other adds (group commit).
+        
+        Adds queued within write_linger seconds of each other, up to write_batch_size, are sent
+        as one request to the bulk endpoint and saved by the server in one transaction, instead
+        of one round trip and one commit each. Against a server without the bulk endpoints, the
+        batch falls back to one POST per animal, as add_animals does.
+        
+        Args:
+            animal_type (str): Type of animal ('dog' or 'monkey')
+            animal (Dog | Monkey): The animal to add
+            
+        Returns:
+            Future: Resolves to this animal's BulkResult; success is False with an error such as
+                "duplicate name" if the server refused it
+        """
+        queue = self._write_queue
+        if queue is None:
+            with self._write_queue_lock:
+                if self._write_queue is None:
+                    self._write_queue = WriteQueue(
+                        self._send_add_batch, max_batch_size=self.write_batch_size, max_linger=self.write_linger
+                    )
+                queue = self._write_queue
+        return queue.submit(animal_type, animal)
+
+    def _send_add_batch(self, animal_type, animals):
+        """Send one group commit batch of adds, returning a BulkResult per animal."""
+        metrics.observe("rescue_write_batch_size", len(animals), animal_type=animal_type)
+        return self._add_chunk(animal_type, animals)
+
+    def write_queue_stats(self):
+        """
+        Report group commit counters for queue_add.
+        
+        Returns:
+            dict: See WriteQueue.stats; empty until the first add has been queued
+        """
+        queue = self._write_queue
+        return queue.stats() if queue is not None else {}
+
+    def _add_chunk(self, animal_type, chunk):
+        """
+        Send one chunk of a bulk add, returning a BulkResult per animal.
+        
+        The cache and index are updated once for the whole chunk when it goes through the bulk
+        endpoint; in the fallback, add_dog/add_monkey update them for each animal.
+        """
+        if self._batch_writes is not False:
+            try:
+                response = self.transport.post(
+                    f"{self.base_url}/{animal_type}s/batch",
+                    json=[animal.to_dict() for animal in chunk],
+                )
+                if response.status_code in (404, 405):
+                    self._batch_writes = False
+                    results = None
+                else:
+                    response.raise_for_status()
+                    results = [BulkResult(r.get("name"), r.get("success", False), r.get("error")) for r in response.json()]
+                    self._batch_writes = True
+            except (requests.exceptions.RequestException, ValueError) as e:
+                return [BulkResult(animal.name, False, str(e)) for animal in chunk]
+            if results is not None:
+                added = [animal for animal, result in zip(chunk, results) if result.success]
+                if added:
+                    self._invalidate()
+                    self._index_added(animal_type, added)
+                return results
+
+        add_one = self.add_dog if animal_type == "dog" else self.add_monkey
+        results = []
+        for animal in chunk:
+            try:
+                results.append(BulkResult(animal.name, add_one(animal)))
+            except (requests.exceptions.RequestException, ValueError) as e:
+                results.append(BulkResult(animal.name, False, str(e)))
+        return results
+
+    def reserve_many(self, reservations, chunk_size: int = 100, max_workers: int = 2, progress=None):
+        """
+        Reserve many animals, sending the reservations in chunks.
+        
+        Each chunk is posted to /reserve/batch, where the server applies it in one transaction
+        and only reserves animals that are still unreserved, so concurrent callers cannot
+        double-book an animal. Every reservation carries an idempotency key, which makes it safe
+        to resend a chunk whose response was lost to a connection error or timeout. Against a
+        server without the bulk endpoint, each chunk falls back to one reserve_animal call per item.
+        
+        Args:
+            reservations (Iterable[tuple]): (animal_type, name, country) tuples
+            chunk_size (int): Number of reservations per request
+            max_workers (int): Number of chunks sent concurrently
+            progress (callable): Called with the number of reservations processed so far after each chunk
+            
+        Returns:
+            list[BulkResult]: One result per reservation, in input order
+        """
+        items = [
+            {"type": animal_type, "name": name, "country": country, "idempotencyKey": uuid.uuid4().hex}
+            for animal_type, name, country in reservations
+        ]
+        results = []
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bulk-reserve") as executor:
+            for chunk_results in executor.map(self._reserve_chunk, _chunked(items, chunk_size)):
+                results.extend(chunk_results)
+                if progress is not None:
+                    progress(len(results))
+        reserved = [
+            (item["type"], item["name"], item["country"])
+            for item, result in zip(items, results) if result.success
+        ]
+        if reserved:
+            self._invalidate()
+            self._index_reserved(reserved)
+        return results
+
+    def _reserve_chunk(self, chunk, attempts=2):
+        """Send one chunk of a bulk reservation, returning a BulkResult per reservation."""
+        if self._batch_reserve is not False:
+            for attempt in range(attempts):
+                try:
+                    response = self.transport.post(f"{self.base_url}/reserve/batch", json=chunk)
+                    if response.status_code in (404, 405):
+                        self._batch_reserve = False
+                        break
+                    response.raise_for_status()
+                    self._batch_reserve = True
+                    return [BulkResult(r.get("name"), r.get("success", False), r.get("error")) for r in response.json()]
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    # The server may have applied the chunk before the response was lost; the
+                    # idempotency keys make the resend return the original results
+                    if attempt == attempts - 1:
+                        return [BulkResult(item["name"], False, str(e)) for item in chunk]
+                except Exception as e:
+                    return [BulkResult(item["name"], False, str(e)) for item in chunk]
+
+        results = []
+        for item in chunk:
+            try:
+                success = self.reserve_animal(item["type"], item["name"], item["country"])
+                results.append(BulkResult(item["name"], success, None if success else "reservation failed"))
+            except Exception as e:
+                results.append(BulkResult(item["name"], False, str(e)))
+        return results
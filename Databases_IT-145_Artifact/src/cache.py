@@ -0,0 +1,278 @@
+"""Read cache for the RescueAPI list endpoints, with conditional revalidation and single-flight misses."""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheEntry:
+    """
+    A cached endpoint result together with its HTTP validators.
+
+    Attributes:
+        value: The built result (e.g. a list of Dog objects)
+        etag (str): The ETag header sent by the server, if any
+        last_modified (str): The Last-Modified header sent by the server, if any
+        expires_at (float): Monotonic time after which the entry must be revalidated
+    """
+    __slots__ = ("value", "etag", "last_modified", "expires_at")
+
+    def __init__(self, value, etag, last_modified, expires_at):
+        self.value = value
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    def is_fresh(self):
+        """Return True if the entry can be served without contacting the server."""
+        return time.monotonic() < self.expires_at
+
+    def validators(self):
+        """
+        Build the conditional request headers for revalidating this entry.
+
+        Returns:
+            dict: If-None-Match and/or If-Modified-Since headers, empty if the server sent neither
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class _Flight:
+    """A load in progress that other callers can wait for."""
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent loads of the same key into one.
+
+    The first caller for a key runs the load; callers arriving while it is in flight wait and
+    receive the same result, or the same exception.
+
+    Attributes:
+        calls (int): Loads actually run
+        deduplicated (int): Calls served by joining a load already in flight
+    """
+    def __init__(self):
+        """Initialize with no loads in flight."""
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.deduplicated = 0
+
+    def do(self, key, load):
+        """
+        Run load() for key unless a load for it is already in flight, then return its result.
+
+        Args:
+            key: Identifies the loaded value
+            load (callable): Function without arguments that produces the value
+
+        Returns:
+            The value returned by the load that ran
+
+        Raises:
+            Exception: Whatever the load raised
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                self.calls += 1
+            else:
+                self.deduplicated += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = load()
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self):
+        """
+        Report deduplication counters.
+
+        Returns:
+            dict: calls, deduplicated and in_flight (loads currently running)
+        """
+        with self._lock:
+            return {"calls": self.calls, "deduplicated": self.deduplicated, "in_flight": len(self._flights)}
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with per-endpoint TTL and hit/miss counters.
+
+    Attributes:
+        ttl (dict): Time-to-live in seconds keyed by endpoint path (e.g. "/dogs")
+        default_ttl (float): Time-to-live for endpoints missing from ttl
+        max_entries (int): Maximum number of cached results before LRU eviction
+    """
+    def __init__(self, ttl=None, default_ttl=5.0, max_entries=32):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl (dict): Per-endpoint time-to-live in seconds, keyed by endpoint path
+            default_ttl (float): Time-to-live in seconds for endpoints without an explicit TTL
+            max_entries (int): Maximum number of entries kept before evicting the least recently used
+        """
+        self.ttl = dict(ttl or {})
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        # Incremented by invalidate, so a load that started before a write does not cache
+        # the pre-write result
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        # Downloads not stored because the cache was invalidated while they were in flight
+        self.discarded = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _expiry(self, endpoint):
+        return time.monotonic() + self.ttl.get(endpoint, self.default_ttl)
+
+    def lookup(self, key):
+        """
+        Look up a cached result, counting a hit if it is still fresh.
+
+        Args:
+            key (str): Cache key, the endpoint path plus any query string
+
+        Returns:
+            CacheEntry: The entry, fresh or expired, or None if nothing is cached for the key
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            if entry.is_fresh():
+                self.hits += 1
+            return entry
+
+    def load(self, key, fetch):
+        """
+        Run fetch() to (re)load key, joining a load of the same key already in flight.
+
+        fetch is expected to store its result in the cache. Callers that join an in-flight
+        load are counted as deduplicated.
+
+        Args:
+            key (str): Cache key
+            fetch (callable): Function without arguments that downloads and stores the result
+
+        Returns:
+            The value returned by fetch
+        """
+        return self._flights.do(key, fetch)
+
+    def store(self, key, value, etag=None, last_modified=None, endpoint=None, generation=None):
+        """
+        Cache a freshly downloaded result, counting a miss.
+
+        A result discarded because of the generation check is counted as discarded instead.
+
+        Args:
+            key (str): Cache key
+            value: The built result to cache
+            etag (str): ETag header from the response
+            last_modified (str): Last-Modified header from the response
+            endpoint (str): Endpoint path used to pick the TTL. Defaults to the key
+            generation (int): Value of generation when the download started. If the cache has
+                been invalidated since, the result may predate a write and is not stored
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                self.discarded += 1
+                return
+            self.misses += 1
+            self._entries[key] = CacheEntry(value, etag, last_modified, self._expiry(endpoint or key))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def mark_revalidated(self, key, endpoint=None):
+        """
+        Extend an entry's lifetime after the server answered 304 Not Modified.
+
+        Args:
+            key (str): Cache key
+            endpoint (str): Endpoint path used to pick the TTL. Defaults to the key
+
+        Returns:
+            CacheEntry: The revalidated entry, or None if it was evicted meanwhile
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.revalidations += 1
+                entry.expires_at = self._expiry(endpoint or key)
+            return entry
+
+    def invalidate(self, prefix=""):
+        """
+        Drop cached results whose key starts with prefix (all results by default).
+
+        Args:
+            prefix (str): Key prefix to invalidate, e.g. "/dogs"
+        """
+        with self._lock:
+            stale = [key for key in self._entries if key.startswith(prefix)]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += 1
+            self.generation += 1
+
+    def stats(self):
+        """
+        Report cache effectiveness counters.
+
+        Returns:
+            dict: hits, misses, discarded, revalidations, evictions, invalidations, deduplicated (misses
+                that joined another caller's request), size and hit_ratio, where hit_ratio
+                counts both fresh hits and 304 revalidations as served from cache
+        """
+        deduplicated = self._flights.stats()["deduplicated"]
+        with self._lock:
+            served = self.hits + self.revalidations
+            total = served + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "discarded": self.discarded,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "deduplicated": deduplicated,
+                "size": len(self._entries),
+                "hit_ratio": served / total if total else 0.0,
+            }
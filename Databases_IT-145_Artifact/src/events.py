@@ -0,0 +1,243 @@
+"""Listener for the server's live update stream (server-sent events at /events)."""
+
+import json
+import threading
+import weakref
+
+import requests
+
+
+def iter_sse(lines):
+    """
+    Parse a server-sent event stream into events.
+
+    Args:
+        lines (iterable): Decoded lines of the stream, without line terminators
+
+    Yields:
+        tuple: (event, data) for every complete event; event defaults to "message"
+    """
+    event = "message"
+    data = []
+    for line in lines:
+        if not line:
+            if data:
+                yield event, "\n".join(data)
+            event = "message"
+            data = []
+        elif line.startswith(":"):
+            continue
+        else:
+            field, _, value = line.partition(":")
+            if value.startswith(" "):
+                value = value[1:]
+            if field == "event":
+                event = value
+            elif field == "data":
+                data.append(value)
+
+
+class EventListener:
+    """
+    Background subscriber to the server's /events stream.
+
+    Attributes:
+        base_url (str): The base URL of the backend
+        url (str): The base URL the stream is currently opened on, or None between connections
+        connected (bool): Whether the stream is currently open
+        supported (bool): False once the server turned out not to have /events
+    """
+    def __init__(self, base_url, reconnect_delay=1.0, max_reconnect_delay=30.0, read_timeout=60.0,
+                 endpoints=None):
+        """
+        Initialize the listener. The stream is opened by start().
+
+        Args:
+            base_url (str): The base URL of the backend
+            reconnect_delay (float): Seconds to wait before the first reconnection attempt
+            max_reconnect_delay (float): Upper bound for the exponential reconnection backoff
+            read_timeout (float): Seconds without any data (heartbeats included) after which the
+                stream is considered dead and reopened
+            endpoints (EndpointPool): Backend workers whose primary serves the stream, or None
+                to always use base_url
+        """
+        self.base_url = base_url
+        self.url = None
+        self.endpoints = endpoints
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.read_timeout = read_timeout
+        self.connected = False
+        self.supported = True
+        self._versions = {"dog": 0, "monkey": 0}
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        # Set to cut a reconnection backoff short, on stop or a change of primary
+        self._wake = threading.Event()
+        self._thread = None
+        self._response = None
+        self._switching = False
+        if endpoints is not None:
+            endpoints.watch_primary(self._on_primary_change)
+
+    def start(self):
+        """Start the background thread if it is not running yet."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="rescue-events", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Close the stream and stop the background thread."""
+        self._stopped.set()
+        self._wake.set()
+        self._interrupt()
+
+    def _on_primary_change(self, url):
+        """Reopen the stream on the new primary, skipping the reconnection backoff."""
+        if self.url == url:
+            return
+        self._switching = True
+        self._wake.set()
+        self._interrupt()
+
+    def _interrupt(self):
+        """
+        End a blocking read of the stream from another thread.
+
+        Closing the response would wait for the reading thread to release it, so the socket is
+        shut down instead (urllib3 2.3+). With an older urllib3 the stream ends at the next
+        event or heartbeat, where the listener checks whether it was asked to stop or switch.
+        """
+        response = self._response
+        shutdown = getattr(response.raw, "shutdown", None) if response is not None else None
+        if shutdown is not None:
+            shutdown()
+
+    def subscribe(self, callback):
+        """
+        Register a function called as callback(event, payload) for every event.
+
+        event is "connected" after the stream is (re)opened and "change" for an add or a
+        reservation, whose payload holds type, animalType, names and watermark. Callbacks run on
+        the listener thread. Bound methods are held weakly.
+
+        Args:
+            callback (callable): The function to call
+        """
+        ref = weakref.WeakMethod(callback) if hasattr(callback, "__self__") else (lambda: callback)
+        with self._lock:
+            self._subscribers.append(ref)
+
+    def version(self, animal_type):
+        """
+        Return a counter that increases with every change event affecting the animal type.
+
+        It also increases on every (re)connection, since changes made while the stream was
+        down were missed. Readers compare it with the value seen when they last rendered.
+
+        Args:
+            animal_type (str): Type of animal ('dog' or 'monkey')
+
+        Returns:
+            int: The current counter value
+        """
+        return self._versions[animal_type]
+
+    def _dispatch(self, event, payload):
+        """Call every live subscriber, dropping those whose owner has been garbage collected."""
+        with self._lock:
+            refs = list(self._subscribers)
+        dead = []
+        for ref in refs:
+            callback = ref()
+            if callback is None:
+                dead.append(ref)
+                continue
+            try:
+                callback(event, payload)
+            except Exception:
+                # A failing subscriber must not end the stream for everyone else
+                pass
+        if dead:
+            with self._lock:
+                self._subscribers = [ref for ref in self._subscribers if ref not in dead]
+
+    def _run(self):
+        """Keep the stream open, reconnecting with exponential backoff until stopped."""
+        delay = self.reconnect_delay
+        session = requests.Session()
+        while not self._stopped.is_set():
+            self._switching = False
+            self._wake.clear()
+            self.url = self.endpoints.primary_url() if self.endpoints is not None else self.base_url
+            try:
+                with session.get(f"{self.url}/events", stream=True,
+                                 timeout=(3.05, self.read_timeout)) as response:
+                    if response.status_code == 404:
+                        self.supported = False
+                        break
+                    response.raise_for_status()
+                    self._response = response
+                    # chunk_size=None hands over each chunk as it arrives; a fixed size would
+                    # hold small events back until enough bytes had accumulated
+                    lines = response.iter_lines(chunk_size=None, decode_unicode=True)
+                    for event, data in iter_sse(lines):
+                        if event == "hello":
+                            self.connected = True
+                            delay = self.reconnect_delay
+                            self._bump_versions(None)
+                            self._dispatch("connected", json.loads(data))
+                        elif event == "change":
+                            self._on_change(json.loads(data))
+                        if self._switching or self._stopped.is_set():
+                            break
+            except (requests.exceptions.RequestException, ValueError):
+                pass
+            finally:
+                self._response = None
+                self.connected = False
+                self.url = None
+            if not self._switching:
+                self._wake.wait(delay)
+                if self._stopped.is_set():
+                    break
+            # A new primary is tried at once; the same worker again after a growing backoff
+            delay = self.reconnect_delay if self._switching else min(delay * 2, self.max_reconnect_delay)
+        session.close()
+
+    def _on_change(self, payload):
+        """Count a change event and pass it to the subscribers."""
+        self._bump_versions(payload.get("animalType"))
+        self._dispatch("change", payload)
+
+    def _bump_versions(self, animal_type):
+        """Advance the version of one animal type, or of every type if it is not known."""
+        for key in ([animal_type] if animal_type in self._versions else self._versions):
+            self._versions[key] += 1
+
+
+_listeners = {}
+_listeners_lock = threading.Lock()
+
+
+def get_event_listener(base_url, endpoints=None):
+    """
+    Return the process-wide listener for a backend, creating it on first use.
+
+    Args:
+        base_url (str): The base URL of the backend (the first worker's, with several)
+        endpoints (EndpointPool): Backend workers, when there are several
+
+    Returns:
+        EventListener: The shared listener (call start() to open the stream)
+    """
+    with _listeners_lock:
+        listener = _listeners.get(base_url)
+        if listener is None:
+            listener = EventListener(base_url, endpoints=endpoints)
+            _listeners[base_url] = listener
+        return listener
@@ -0,0 +1,79 @@
+"""Incremental decoding of large JSON array responses."""
+
+import codecs
+import json
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+def _skip(buffer, pos, chars):
+    """Return the position of the first character at or after pos that is not in chars."""
+    while pos < len(buffer) and buffer[pos] in chars:
+        pos += 1
+    return pos
+
+
+def iter_json_array(chunks, encoding="utf-8"):
+    """
+    Yield the elements of a top-level JSON array from an iterable of byte chunks.
+
+    Args:
+        chunks (Iterable[bytes]): The response body, e.g. response.iter_content(65536)
+        encoding (str): Character encoding of the body
+
+    Yields:
+        The decoded array elements, in order
+
+    Raises:
+        ValueError: If the body is not a well-formed JSON array
+    """
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    exhausted = False
+    started = False
+
+    def fill():
+        nonlocal buffer, pos, exhausted
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            buffer = buffer[pos:] + text_decoder.decode(b"", final=True)
+        else:
+            buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+
+    while True:
+        pos = _skip(buffer, pos, _WHITESPACE if not started else _WHITESPACE + ",")
+        if pos >= len(buffer):
+            if exhausted:
+                raise ValueError("Unexpected end of JSON array")
+            fill()
+            continue
+
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("Response body is not a JSON array")
+            started = True
+            pos += 1
+            continue
+
+        if buffer[pos] == "]":
+            return
+
+        try:
+            value, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if exhausted:
+                raise ValueError("Malformed element in JSON array") from None
+            fill()
+            continue
+        # A value that ends exactly at the end of the buffer may be truncated (e.g. a number
+        # split across chunks), so only accept it once the following character has arrived
+        if end >= len(buffer) and not exhausted:
+            fill()
+            continue
+        pos = end
+        yield value
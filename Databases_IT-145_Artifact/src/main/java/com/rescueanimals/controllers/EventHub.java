@@ -0,0 +1,87 @@
+package com.rescueanimals.controllers;
+
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.CopyOnWriteArrayList;
+import java.util.concurrent.Executors;
+import java.util.concurrent.ScheduledExecutorService;
+import java.util.concurrent.TimeUnit;
+
+import com.google.gson.Gson;
+import com.rescueanimals.models.ChangeTracker;
+
+import io.javalin.http.sse.SseClient;
+
+/**
+ * Broadcasts roster changes to connected clients over server-sent events.
+ * Frontends subscribe to GET /events and learn about adds and reservations made by any
+ * operator as they happen, instead of re-fetching the roster on a timer to notice them.
+ * A heartbeat is sent periodically so clients (and proxies) can tell an idle stream from a
+ * dead one.
+ */
+public class EventHub {
+    private static final long HEARTBEAT_SECONDS = 15;
+    private final List<SseClient> clients = new CopyOnWriteArrayList<>();
+    private final Gson gson = new Gson();
+    private final ScheduledExecutorService heartbeat = Executors.newSingleThreadScheduledExecutor(runnable -> {
+        Thread thread = new Thread(runnable, "sse-heartbeat");
+        thread.setDaemon(true);
+        return thread;
+    });
+
+    /**
+     * Creates the hub and starts the heartbeat.
+     */
+    public EventHub() {
+        heartbeat.scheduleAtFixedRate(() -> send("heartbeat", "{}"), HEARTBEAT_SECONDS, HEARTBEAT_SECONDS, TimeUnit.SECONDS);
+    }
+
+    /**
+     * Registers a newly connected event stream client.
+     *
+     * The client is dropped again when its connection closes.
+     * @param client The SSE client from Javalin
+     */
+    public void register(SseClient client) {
+        clients.add(client);
+        client.onClose(() -> clients.remove(client));
+        client.sendEvent("hello", gson.toJson(Map.of("watermark", ChangeTracker.watermark(), "epoch", ChangeTracker.getEpoch())));
+    }
+
+    /**
+     * Broadcasts a change to every connected client.
+     *
+     * Does nothing when no animal was affected, so failed writes cause no traffic.
+     * @param type "add" or "reserve"
+     * @param animalType "dog" or "monkey", or null if several types may be affected
+     * @param names Names of the affected animals
+     */
+    public void publish(String type, String animalType, List<String> names) {
+        if (names.isEmpty()) {
+            return;
+        }
+        Map<String, Object> event = new LinkedHashMap<>();
+        event.put("type", type);
+        event.put("animalType", animalType);
+        event.put("names", names);
+        event.put("watermark", ChangeTracker.watermark());
+        event.put("epoch", ChangeTracker.getEpoch());
+        send("change", gson.toJson(event));
+    }
+
+    /**
+     * Sends one event to every client, dropping clients whose connection has failed.
+     * @param event Event name
+     * @param data JSON payload
+     */
+    private void send(String event, String data) {
+        for (SseClient client : clients) {
+            try {
+                client.sendEvent(event, data);
+            } catch (Exception e) {
+                clients.remove(client);
+            }
+        }
+    }
+}
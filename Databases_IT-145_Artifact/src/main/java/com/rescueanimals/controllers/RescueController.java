@@ -1,15 +1,23 @@
 package com.rescueanimals.controllers;
 
 import java.util.ArrayList;
+import java.util.Arrays;
 import java.util.HashMap;
+import java.util.LinkedHashMap;
 import java.util.List;
 import java.util.Map;
 
 import com.google.gson.Gson;
 import com.google.gson.GsonBuilder;
+import com.rescueanimals.models.BatchResult;
+import com.rescueanimals.models.ChangeTracker;
+import com.rescueanimals.models.ChangesResponse;
 import com.rescueanimals.models.Dog;
 import com.rescueanimals.models.JPAUtil;
 import com.rescueanimals.models.Monkey;
+import com.rescueanimals.models.PageResponse;
+import com.rescueanimals.models.ReservationRequest;
+import com.rescueanimals.models.SearchCriteria;
 import com.rescueanimals.models.dao.DogDAO;
 import com.rescueanimals.models.dao.MonkeyDAO;
 
@@ -23,8 +31,17 @@ public class RescueController {
     private static final Gson gson = new GsonBuilder()
         .setPrettyPrinting()
         .create();
+    // Number of idempotency keys remembered for bulk reservations before the oldest are dropped
+    private static final int MAX_IDEMPOTENCY_KEYS = 10000;
     private final DogDAO dogDAO;
     private final MonkeyDAO monkeyDAO;
+    // Results of reservations already applied, keyed by the client's idempotency key (LRU order)
+    private final Map<String, BatchResult> completedReservations = new LinkedHashMap<>(16, 0.75f, true) {
+        @Override
+        protected boolean removeEldestEntry(Map.Entry<String, BatchResult> eldest) {
+            return size() > MAX_IDEMPOTENCY_KEYS;
+        }
+    };
 
     /**
      * Static initialization block.
@@ -39,15 +56,45 @@ public class RescueController {
     }
 
     public RescueController() {
+        this(true);
+    }
+
+    /**
+     * Creates a controller over the shared database.
+     * @param seedTestData Whether to insert the test animals; only the writing server does
+     */
+    public RescueController(boolean seedTestData) {
         this.dogDAO = new DogDAO();
         this.monkeyDAO = new MonkeyDAO();
-        initializeTestData();
+        // Continue numbering changes after the highest one already stored
+        ChangeTracker.initialize(Math.max(dogDAO.getMaxDogChangeSeq(), monkeyDAO.getMaxMonkeyChangeSeq()));
+        if (seedTestData) {
+            initializeTestData();
+        }
     }
 
     public void shutdown() {
         JPAUtil.shutdown();
     }
 
+    /**
+     * Checks whether the database answers queries.
+     * 
+     * Used by the health endpoint, so a supervisor only considers the server ready once it can
+     * actually serve data.
+     * @return true if a trivial query succeeded
+     */
+    public boolean isDatabaseAvailable() {
+        try {
+            dogDAO.getMaxDogChangeSeq();
+            return true;
+        } catch (RuntimeException e) {
+            System.err.println("Error: Health check query failed");
+            System.err.println("Details: " + e.getMessage());
+            return false;
+        }
+    }
+
     /**
      * Initializes the list of valid monkey species.
      * 
@@ -126,17 +173,37 @@ public class RescueController {
     /**
      * Saves a dog to the database.
      * @param dog Dog to save
+     * @return true if the dog was inserted, false if its name was empty or already taken
      */
-    public void saveDog(Dog dog) {
-        dogDAO.saveDog(dog);
+    public boolean saveDog(Dog dog) {
+        return dogDAO.saveDog(dog);
     }
 
     /**
      * Saves a monkey to the database.
      * @param monkey Monkey to save
+     * @return true if the monkey was inserted, false if its name was empty or already taken
+     */
+    public boolean saveMonkey(Monkey monkey) {
+        return monkeyDAO.saveMonkey(monkey);
+    }
+
+    /**
+     * Saves many dogs to the database in one transaction.
+     * @param dogs Dogs to save
+     * @return Per-record results, in input order
+     */
+    public List<BatchResult> saveDogs(List<Dog> dogs) {
+        return dogDAO.saveDogs(dogs);
+    }
+
+    /**
+     * Saves many monkeys to the database in one transaction.
+     * @param monkeys Monkeys to save
+     * @return Per-record results, in input order
      */
-    public void saveMonkey(Monkey monkey) {
-        monkeyDAO.saveMonkey(monkey);
+    public List<BatchResult> saveMonkeys(List<Monkey> monkeys) {
+        return monkeyDAO.saveMonkeys(monkeys);
     }
 
     /**
@@ -191,6 +258,9 @@ public class RescueController {
 
     /**
      * Reserves an animal for service in a given country.
+     * 
+     * The check and the update happen in one conditional statement, so an animal that is
+     * already reserved (possibly by a concurrent request) is not reserved again.
      * @param type "dog" or "monkey"
      * @param name Animal's name
      * @param country Service country
@@ -198,30 +268,181 @@ public class RescueController {
      */
     public boolean reserveAnimal(String type, String name, String country) {
         try {
-            if (type.equalsIgnoreCase("dog")) {
-                Dog dog = getDogByName(name);
-                if (dog != null) {
-                    dog.setReserved(true);
-                    dog.setInServiceCountry(country);
-                    updateDog(dog);
-                    return true;
-                }
-            } else if (type.equalsIgnoreCase("monkey")) {
-                Monkey monkey = getMonkeyByName(name);
-                if (monkey != null) {
-                    monkey.setReserved(true);
-                    monkey.setInServiceCountry(country);
-                    updateMonkey(monkey);
-                    return true;
-                }
-            }
-            return false;
+            List<BatchResult> results = reserveAnimals(List.of(new ReservationRequest(type, name, country, null)));
+            return results.get(0).success;
         } catch (Exception e) {
             System.err.println("Error reserving animal: " + e.getMessage());
             return false;
         }
     }
 
+    /**
+     * Reserves many animals, possibly of both types, for service.
+     * 
+     * Dogs and monkeys are each reserved in a single transaction. Requests carrying an idempotency
+     * key that was already processed are answered from the remembered result without touching
+     * the database, so a client can resend a request whose response was lost. The method is
+     * synchronized so that a key is never applied twice by overlapping requests; SQLite
+     * serializes the writes anyway.
+     * @param requests The reservations to apply
+     * @return One result per request, in input order
+     */
+    public synchronized List<BatchResult> reserveAnimals(List<ReservationRequest> requests) {
+        BatchResult[] results = new BatchResult[requests.size()];
+        List<ReservationRequest> dogs = new ArrayList<>();
+        List<ReservationRequest> monkeys = new ArrayList<>();
+        List<Integer> dogPositions = new ArrayList<>();
+        List<Integer> monkeyPositions = new ArrayList<>();
+
+        for (int i = 0; i < requests.size(); i++) {
+            ReservationRequest request = requests.get(i);
+            if (request == null || request.name == null || request.type == null) {
+                results[i] = BatchResult.failed(request == null ? null : request.name, "type and name are required");
+            } else if (request.idempotencyKey != null && completedReservations.containsKey(request.idempotencyKey)) {
+                results[i] = completedReservations.get(request.idempotencyKey);
+            } else if (request.type.equalsIgnoreCase("dog")) {
+                dogs.add(request);
+                dogPositions.add(i);
+            } else if (request.type.equalsIgnoreCase("monkey")) {
+                monkeys.add(request);
+                monkeyPositions.add(i);
+            } else {
+                results[i] = BatchResult.failed(request.name, "unknown animal type");
+            }
+        }
+
+        if (!dogs.isEmpty()) {
+            storeReservationResults(dogs, dogPositions, dogDAO.reserveDogs(dogs), results);
+        }
+        if (!monkeys.isEmpty()) {
+            storeReservationResults(monkeys, monkeyPositions, monkeyDAO.reserveMonkeys(monkeys), results);
+        }
+        return Arrays.asList(results);
+    }
+
+    /**
+     * Places DAO results at their original positions and remembers them by idempotency key.
+     * @param requests The requests sent to the DAO
+     * @param positions Original position of each request
+     * @param daoResults Results returned by the DAO, in request order
+     * @param results The combined results being assembled
+     */
+    private void storeReservationResults(List<ReservationRequest> requests, List<Integer> positions,
+                                         List<BatchResult> daoResults, BatchResult[] results) {
+        for (int i = 0; i < requests.size(); i++) {
+            BatchResult result = daoResults.get(i);
+            results[positions.get(i)] = result;
+            String key = requests.get(i).idempotencyKey;
+            if (key != null) {
+                completedReservations.put(key, result);
+            }
+        }
+    }
+
+    /**
+     * Gets one page of dogs, ordered by name.
+     * @param offset Number of dogs to skip
+     * @param limit Maximum number of dogs to return
+     * @return The page together with the total dog count
+     */
+    public PageResponse<Dog> getDogsPage(int offset, int limit) {
+        return new PageResponse<>(dogDAO.getDogsPage(offset, limit), dogDAO.countDogs(), offset, limit);
+    }
+
+    /**
+     * Gets one page of monkeys, ordered by name.
+     * @param offset Number of monkeys to skip
+     * @param limit Maximum number of monkeys to return
+     * @return The page together with the total monkey count
+     */
+    public PageResponse<Monkey> getMonkeysPage(int offset, int limit) {
+        return new PageResponse<>(monkeyDAO.getMonkeysPage(offset, limit), monkeyDAO.countMonkeys(), offset, limit);
+    }
+
+    /**
+     * Gets one page of available animals of a single type, ordered by name.
+     * @param type "dog" or "monkey"
+     * @param offset Number of available animals to skip
+     * @param limit Maximum number of animals to return
+     * @return The page together with the total available count, or null for an unknown type
+     */
+    public PageResponse<?> getAvailablePage(String type, int offset, int limit) {
+        if (type.equalsIgnoreCase("dog")) {
+            return new PageResponse<>(dogDAO.getAvailableDogsPage(offset, limit), dogDAO.countAvailableDogs(), offset, limit);
+        } else if (type.equalsIgnoreCase("monkey")) {
+            return new PageResponse<>(monkeyDAO.getAvailableMonkeysPage(offset, limit), monkeyDAO.countAvailableMonkeys(), offset, limit);
+        }
+        return null;
+    }
+
+    /**
+     * Gets one page of animals of a single type matching the search criteria, ordered by name.
+     * @param type "dog" or "monkey"
+     * @param criteria Filters to apply
+     * @param offset Number of matching animals to skip
+     * @param limit Maximum number of animals to return
+     * @return The page together with the total match count, or null for an unknown type
+     */
+    public PageResponse<?> search(String type, SearchCriteria criteria, int offset, int limit) {
+        if (type.equalsIgnoreCase("dog")) {
+            return new PageResponse<>(dogDAO.searchDogs(criteria, offset, limit), dogDAO.countDogs(criteria), offset, limit);
+        } else if (type.equalsIgnoreCase("monkey")) {
+            return new PageResponse<>(monkeyDAO.searchMonkeys(criteria, offset, limit), monkeyDAO.countMonkeys(criteria), offset, limit);
+        }
+        return null;
+    }
+
+    /**
+     * Gets the text fields that can be searched for an animal type.
+     * @param type "dog" or "monkey"
+     * @return The searchable field names, or null for an unknown type
+     */
+    public List<String> getSearchFields(String type) {
+        if (type.equalsIgnoreCase("dog")) {
+            return DogDAO.SEARCH_FIELDS;
+        } else if (type.equalsIgnoreCase("monkey")) {
+            return MonkeyDAO.SEARCH_FIELDS;
+        }
+        return null;
+    }
+
+    /**
+     * Gets the distinct values of each searchable text field with their animal counts.
+     * @param type "dog" or "monkey"
+     * @return Field name mapped to value counts, or null for an unknown type
+     */
+    public Map<String, Map<String, Long>> getFacets(String type) {
+        if (type.equalsIgnoreCase("dog")) {
+            return dogDAO.getDogFacets();
+        } else if (type.equalsIgnoreCase("monkey")) {
+            return monkeyDAO.getMonkeyFacets();
+        }
+        return null;
+    }
+
+    /**
+     * Gets the animals changed since a client's last sync.
+     * 
+     * A watermark that cannot be trusted (0, from another server run, from before a deletion,
+     * or ahead of this server) is answered with the whole roster and full set to true, so the
+     * client replaces its copy without a second round trip.
+     * @param epoch Epoch the client's watermark was issued in, or null
+     * @param since The client's watermark, or 0 for a full sync
+     * @return The changed (or all) animals with the new watermark
+     */
+    public ChangesResponse getChanges(String epoch, long since) {
+        long watermark = ChangeTracker.watermark();
+        boolean full = since <= 0 || !ChangeTracker.isValid(epoch, since);
+        long from = full ? 0 : since;
+        return new ChangesResponse(
+            ChangeTracker.getEpoch(),
+            watermark,
+            full,
+            dogDAO.getDogChanges(from, watermark),
+            monkeyDAO.getMonkeyChanges(from, watermark)
+        );
+    }
+
     public Map<String, List<?>> getAvailableAnimals() {
         Map<String, List<?>> result = new HashMap<>();
         List<Dog> dogs = dogDAO.getAvailableDogs();
@@ -1,14 +1,24 @@
 package com.rescueanimals.controllers;
 
+import java.lang.management.ManagementFactory;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.List;
+
 import com.google.gson.Gson;
 import com.google.gson.GsonBuilder;
 import com.google.gson.JsonSyntaxException;
+import com.rescueanimals.models.BatchResult;
 import com.rescueanimals.models.Dog;
+import com.rescueanimals.models.HealthResponse;
 import com.rescueanimals.models.Monkey;
+import com.rescueanimals.models.ReservationRequest;
+import com.rescueanimals.models.SearchCriteria;
 import com.rescueanimals.models.StatusResponse;
 
 import io.javalin.Javalin;
 import io.javalin.http.Context;
+import io.javalin.http.Handler;
 import io.javalin.plugin.json.JsonMapper;
 
 /**
@@ -18,15 +28,24 @@ import io.javalin.plugin.json.JsonMapper;
  * This design decouples the backend logic from the frontend, enabling flexible UI options.
  */
 public class RescueServer {
-    private static final RescueController controller = new RescueController();
+    // Overridable so run_both.py can start several workers on consecutive ports
+    private static final int PORT = Integer.parseInt(System.getenv().getOrDefault("RESCUE_PORT", "8647"));
+    // A read replica serves reads from the shared database and refuses writes, so change
+    // numbering, idempotency keys and live events all come from the one writing server
+    private static final boolean READ_REPLICA = "replica".equals(System.getenv().getOrDefault("RESCUE_ROLE", "primary"));
+    private static final RescueController controller = new RescueController(!READ_REPLICA);
     private static final Gson gson = new GsonBuilder().setPrettyPrinting().create();
-    private static final int PORT = 8647;
+    private static final EventHub events = new EventHub();
+    private static final int MAX_PAGE_SIZE = 500;
+    private static final int DEFAULT_SEARCH_LIMIT = 50;
+    // JVM start time, so the startup time reported includes booting Hibernate
+    private static final long STARTED_AT = ManagementFactory.getRuntimeMXBean().getStartTime();
 
     /**
      * Starts the Javalin server and sets up all API routes.
      * 
      * This method configures the JSON mapper to use Gson for serialization and deserialization,
-     * then registers all REST API endpoints for dogs, monkeys, and animal reservation. Each endpoint
+     * enables automatic ETags for conditional GET requests, then registers all REST API endpoints for dogs, monkeys, and animal reservation. Each endpoint
      * delegates business logic to the RescueController, keeping the server focused on HTTP concerns.
      * The design allows for easy extension and clear separation of concerns between API and logic.
      * @param args Command-line arguments (not used)
@@ -44,35 +63,274 @@ public class RescueServer {
                     return gson.fromJson(json, targetClass);
                 }
             });
+            // Hash GET responses into an ETag and answer matching If-None-Match requests
+            // with 304, so clients revalidating a cached list skip the download
+            config.autogenerateEtags = true;
         }).start(PORT);
 
-        // List endpoints
-        app.get("/dogs", ctx -> ctx.json(controller.getAllDogs()));
-        app.get("/monkeys", ctx -> ctx.json(controller.getAllMonkeys()));
-        app.get("/available", ctx -> ctx.json(controller.getAvailableAnimals()));
+        // Readiness probe for run_both.py and load balancers
+        app.get("/health", RescueServer::health);
+
+        // List endpoints (paginated when a limit query parameter is given)
+        app.get("/dogs", RescueServer::listDogs);
+        app.get("/monkeys", RescueServer::listMonkeys);
+        app.get("/available", RescueServer::listAvailable);
+
+        // Delta sync endpoint: only the animals changed after the client's watermark
+        app.get("/changes", RescueServer::listChanges);
+
+        // Search endpoints (filtering runs in the database; only matching rows are returned)
+        app.get("/search", RescueServer::search);
+        app.get("/facets", RescueServer::listFacets);
+
+        // Live update stream: adds and reservations are pushed to clients as they happen
+        app.sse("/events", events::register);
+
+        // Add endpoints (writer() refuses them on a read replica)
+        app.post("/dogs", writer(RescueServer::saveDog));
+        app.post("/monkeys", writer(RescueServer::saveMonkey));
+
+        // Bulk add endpoints (JSON array body, one transaction per request)
+        app.post("/dogs/batch", writer(RescueServer::saveDogs));
+        app.post("/monkeys/batch", writer(RescueServer::saveMonkeys));
+
+        // Reserve endpoints
+        app.post("/reserve/batch", writer(RescueServer::reserveAnimals));
+        app.post("/reserve/{type}/{name}", writer(RescueServer::reserveAnimal));
+
+        // On SIGTERM, stop accepting requests and release the database before the JVM exits
+        Runtime.getRuntime().addShutdownHook(new Thread(() -> {
+            app.stop();
+            controller.shutdown();
+        }));
+
+        System.out.println((READ_REPLICA ? "Read replica" : "Server") + " started on port " + PORT + " in " + (System.currentTimeMillis() - STARTED_AT) + " ms");
+    }
+
+    /**
+     * Wraps a write handler so a read replica answers 503 instead of writing.
+     * 
+     * 503 rather than 404 or 405, so clients do not conclude that the endpoint is missing.
+     * @param handler The write handler
+     * @return Handler that runs it only on the writing server
+     */
+    private static Handler writer(Handler handler) {
+        return ctx -> {
+            if (READ_REPLICA) {
+                ctx.status(503).json(new StatusResponse(false));
+                return;
+            }
+            handler.handle(ctx);
+        };
+    }
+
+    /**
+     * Handles GET requests for the server's health.
+     * 
+     * Answers 200 with status "ok" once the database is reachable and 503 otherwise, so
+     * supervisors can wait for readiness instead of sending real requests to a starting server.
+     * @param ctx Javalin HTTP context
+     */
+    private static void health(Context ctx) {
+        boolean database = controller.isDatabaseAvailable();
+        ctx.status(database ? 200 : 503).json(new HealthResponse(database, System.currentTimeMillis() - STARTED_AT));
+    }
+
+    /**
+     * Handles GET requests for dogs.
+     * 
+     * Returns the full list by default. With a limit query parameter (and optional offset),
+     * returns a single page wrapped in a PageResponse so large tables can be fetched window by window.
+     * @param ctx Javalin HTTP context
+     */
+    private static void listDogs(Context ctx) {
+        if (ctx.queryParam("limit") == null) {
+            ctx.json(controller.getAllDogs());
+            return;
+        }
+        int[] window = parseWindow(ctx);
+        if (window != null) {
+            ctx.json(controller.getDogsPage(window[0], window[1]));
+        }
+    }
+
+    /**
+     * Handles GET requests for monkeys.
+     * 
+     * Returns the full list by default, or a single PageResponse page when a limit is given.
+     * @param ctx Javalin HTTP context
+     */
+    private static void listMonkeys(Context ctx) {
+        if (ctx.queryParam("limit") == null) {
+            ctx.json(controller.getAllMonkeys());
+            return;
+        }
+        int[] window = parseWindow(ctx);
+        if (window != null) {
+            ctx.json(controller.getMonkeysPage(window[0], window[1]));
+        }
+    }
+
+    /**
+     * Handles GET requests for available animals.
+     * 
+     * Returns all available dogs and monkeys by default. Paging requires both a limit and a
+     * type query parameter ("dog" or "monkey"), since each type is paged separately.
+     * @param ctx Javalin HTTP context
+     */
+    private static void listAvailable(Context ctx) {
+        if (ctx.queryParam("limit") == null) {
+            ctx.json(controller.getAvailableAnimals());
+            return;
+        }
+        int[] window = parseWindow(ctx);
+        if (window == null) {
+            return;
+        }
+        String type = ctx.queryParam("type");
+        Object page = type == null ? null : controller.getAvailablePage(type, window[0], window[1]);
+        if (page == null) {
+            ctx.status(400).json(new StatusResponse(false));
+            return;
+        }
+        ctx.json(page);
+    }
+
+    /**
+     * Handles GET requests for the animals changed since a client's last sync.
+     * 
+     * Takes the client's watermark (since, default 0 for a full sync) and the epoch it was
+     * issued in. Responds with a ChangesResponse; malformed numbers yield a 400 status response.
+     * @param ctx Javalin HTTP context
+     */
+    private static void listChanges(Context ctx) {
+        try {
+            String since = ctx.queryParam("since");
+            ctx.json(controller.getChanges(ctx.queryParam("epoch"), since == null ? 0 : Long.parseLong(since)));
+        } catch (NumberFormatException e) {
+            ctx.status(400).json(new StatusResponse(false));
+        }
+    }
+
+    /**
+     * Handles GET requests for searching animals of one type.
+     * 
+     * Requires a type query parameter ("dog" or "monkey"). Optional filters are a name prefix
+     * (name), exact text matches on the type's searchable fields (e.g. breed, trainingStatus),
+     * reserved, and age and weight ranges (minAge, maxAge, minWeight, maxWeight). Results are
+     * paged like the list endpoints, with a default limit of DEFAULT_SEARCH_LIMIT.
+     * Responds with 400 for an unknown type or a malformed filter.
+     * @param ctx Javalin HTTP context
+     */
+    private static void search(Context ctx) {
+        String type = ctx.queryParam("type");
+        List<String> fields = type == null ? null : controller.getSearchFields(type);
+        if (fields == null) {
+            ctx.status(400).json(new StatusResponse(false));
+            return;
+        }
+        int[] window = parseWindow(ctx, DEFAULT_SEARCH_LIMIT);
+        if (window == null) {
+            return;
+        }
+        try {
+            SearchCriteria criteria = new SearchCriteria();
+            String name = ctx.queryParam("name");
+            if (name != null && !name.isEmpty()) {
+                criteria.namePrefix = name;
+            }
+            for (String field : fields) {
+                String value = ctx.queryParam(field);
+                if (value != null && !value.isEmpty()) {
+                    criteria.equalTo.put(field, value);
+                }
+            }
+            String reserved = ctx.queryParam("reserved");
+            if (reserved != null) {
+                criteria.reserved = Boolean.parseBoolean(reserved);
+            }
+            String minAge = ctx.queryParam("minAge");
+            String maxAge = ctx.queryParam("maxAge");
+            String minWeight = ctx.queryParam("minWeight");
+            String maxWeight = ctx.queryParam("maxWeight");
+            criteria.minAge = minAge == null ? null : Integer.valueOf(minAge);
+            criteria.maxAge = maxAge == null ? null : Integer.valueOf(maxAge);
+            criteria.minWeight = minWeight == null ? null : Double.valueOf(minWeight);
+            criteria.maxWeight = maxWeight == null ? null : Double.valueOf(maxWeight);
+            ctx.json(controller.search(type, criteria, window[0], window[1]));
+        } catch (NumberFormatException e) {
+            ctx.status(400).json(new StatusResponse(false));
+        }
+    }
 
-        // Add endpoints
-        app.post("/dogs", RescueServer::saveDog);
-        app.post("/monkeys", RescueServer::saveMonkey);
+    /**
+     * Handles GET requests for the search filter options of one animal type.
+     * 
+     * Responds with the distinct values of each searchable text field and their counts, or
+     * 400 for a missing or unknown type query parameter.
+     * @param ctx Javalin HTTP context
+     */
+    private static void listFacets(Context ctx) {
+        String type = ctx.queryParam("type");
+        Object facets = type == null ? null : controller.getFacets(type);
+        if (facets == null) {
+            ctx.status(400).json(new StatusResponse(false));
+            return;
+        }
+        ctx.json(facets);
+    }
 
-        // Reserve endpoint
-        app.post("/reserve/{type}/{name}", RescueServer::reserveAnimal);
+    /**
+     * Parses the offset and limit query parameters of a paginated request.
+     * 
+     * Responds with 400 and returns null if either value is malformed or out of range.
+     * The limit is capped at MAX_PAGE_SIZE to bound response size.
+     * @param ctx Javalin HTTP context
+     * @return An array of {offset, limit}, or null if the request was rejected
+     */
+    private static int[] parseWindow(Context ctx) {
+        return parseWindow(ctx, null);
+    }
 
-        System.out.println("Server started on port " + PORT);
+    /**
+     * Parses the offset and limit query parameters, using a default limit when none is given.
+     * @param ctx Javalin HTTP context
+     * @param defaultLimit Limit to use when the limit parameter is missing, or null to require it
+     * @return An array of {offset, limit}, or null if the request was rejected
+     */
+    private static int[] parseWindow(Context ctx, Integer defaultLimit) {
+        try {
+            String offsetParam = ctx.queryParam("offset");
+            String limitParam = ctx.queryParam("limit");
+            int offset = offsetParam == null ? 0 : Integer.parseInt(offsetParam);
+            int limit = limitParam == null && defaultLimit != null ? defaultLimit : Integer.parseInt(limitParam);
+            if (offset < 0 || limit <= 0) {
+                ctx.status(400).json(new StatusResponse(false));
+                return null;
+            }
+            return new int[] {offset, Math.min(limit, MAX_PAGE_SIZE)};
+        } catch (NumberFormatException e) {
+            ctx.status(400).json(new StatusResponse(false));
+            return null;
+        }
     }
 
     /**
      * Handles POST requests to add a new dog.
      * 
      * Parses the request body as a Dog object, delegates to the controller, and returns a JSON status response.
+     * Reports failure without publishing an event when the name is empty or already taken.
      * Catches JSON and null errors to provide a clear 400 error for malformed input.
      * @param ctx Javalin HTTP context
      */
     private static void saveDog(Context ctx) {
         try {
             Dog dog = gson.fromJson(ctx.body(), Dog.class);
-            controller.saveDog(dog);
-            ctx.json(new StatusResponse(true));
+            boolean saved = controller.saveDog(dog);
+            if (saved) {
+                events.publish("add", "dog", List.of(dog.getName()));
+            }
+            ctx.json(new StatusResponse(saved));
         } catch (JsonSyntaxException | NullPointerException e) {
             ctx.status(400).json(new StatusResponse(false));
         }
@@ -82,14 +340,55 @@ public class RescueServer {
      * Handles POST requests to add a new monkey.
      * 
      * Parses the request body as a Monkey object, delegates to the controller, and returns a JSON status response.
+     * Reports failure without publishing an event when the name is empty or already taken.
      * Catches JSON and null errors to provide a clear 400 error for malformed input.
      * @param ctx Javalin HTTP context
      */
     private static void saveMonkey(Context ctx) {
         try {
             Monkey monkey = gson.fromJson(ctx.body(), Monkey.class);
-            controller.saveMonkey(monkey);
-            ctx.json(new StatusResponse(true));
+            boolean saved = controller.saveMonkey(monkey);
+            if (saved) {
+                events.publish("add", "monkey", List.of(monkey.getName()));
+            }
+            ctx.json(new StatusResponse(saved));
+        } catch (JsonSyntaxException | NullPointerException e) {
+            ctx.status(400).json(new StatusResponse(false));
+        }
+    }
+
+    /**
+     * Handles POST requests to add many dogs at once.
+     * 
+     * Parses the request body as a JSON array of dogs and saves them in a single transaction.
+     * Responds with one BatchResult per record so the client can report individual failures
+     * such as duplicate names. Malformed JSON yields a 400 status response.
+     * @param ctx Javalin HTTP context
+     */
+    private static void saveDogs(Context ctx) {
+        try {
+            Dog[] dogs = gson.fromJson(ctx.body(), Dog[].class);
+            List<BatchResult> results = controller.saveDogs(Arrays.asList(dogs));
+            events.publish("add", "dog", successfulNames(results));
+            ctx.json(results);
+        } catch (JsonSyntaxException | NullPointerException e) {
+            ctx.status(400).json(new StatusResponse(false));
+        }
+    }
+
+    /**
+     * Handles POST requests to add many monkeys at once.
+     * 
+     * Parses the request body as a JSON array of monkeys and saves them in a single transaction,
+     * responding with one BatchResult per record. Malformed JSON yields a 400 status response.
+     * @param ctx Javalin HTTP context
+     */
+    private static void saveMonkeys(Context ctx) {
+        try {
+            Monkey[] monkeys = gson.fromJson(ctx.body(), Monkey[].class);
+            List<BatchResult> results = controller.saveMonkeys(Arrays.asList(monkeys));
+            events.publish("add", "monkey", successfulNames(results));
+            ctx.json(results);
         } catch (JsonSyntaxException | NullPointerException e) {
             ctx.status(400).json(new StatusResponse(false));
         }
@@ -114,9 +413,46 @@ public class RescueServer {
             }
 
             boolean success = controller.reserveAnimal(type, name, country);
+            if (success) {
+                events.publish("reserve", type.toLowerCase(), List.of(name));
+            }
             ctx.json(new StatusResponse(success));
         } catch (JsonSyntaxException | NullPointerException e) {
             ctx.status(400).json(new StatusResponse(false));
         }
     }
+
+    /**
+     * Handles POST requests to reserve many animals at once.
+     * 
+     * Parses the request body as a JSON array of ReservationRequest objects and responds with one
+     * BatchResult per request, in the same order. Each request may carry an idempotency key so a
+     * retried request is not applied twice. Malformed JSON yields a 400 status response.
+     * @param ctx Javalin HTTP context
+     */
+    private static void reserveAnimals(Context ctx) {
+        try {
+            ReservationRequest[] requests = gson.fromJson(ctx.body(), ReservationRequest[].class);
+            List<BatchResult> results = controller.reserveAnimals(Arrays.asList(requests));
+            events.publish("reserve", null, successfulNames(results));
+            ctx.json(results);
+        } catch (JsonSyntaxException | NullPointerException e) {
+            ctx.status(400).json(new StatusResponse(false));
+        }
+    }
+
+    /**
+     * Collects the names of the records a batch operation applied.
+     * @param results Per-record outcomes of the batch
+     * @return Names of the successful records, in request order
+     */
+    private static List<String> successfulNames(List<BatchResult> results) {
+        List<String> names = new ArrayList<>();
+        for (BatchResult result : results) {
+            if (result.success) {
+                names.add(result.name);
+            }
+        }
+        return names;
+    }
 } 
\ No newline at end of file
@@ -0,0 +1,32 @@
+package com.rescueanimals.models;
+
+/**
+ * Per-record outcome of a batch operation.
+ * Lets the frontend report exactly which records of a bulk request failed and why,
+ * instead of a single success flag for the whole batch.
+ */
+public class BatchResult {
+    public final String name;
+    public final boolean success;
+    public final String error;
+
+    /**
+     * Constructs a BatchResult for one record.
+     * @param name Name of the animal the record refers to
+     * @param success true if the record was applied
+     * @param error Reason for the failure, or null on success
+     */
+    public BatchResult(String name, boolean success, String error) {
+        this.name = name;
+        this.success = success;
+        this.error = error;
+    }
+
+    public static BatchResult ok(String name) {
+        return new BatchResult(name, true, null);
+    }
+
+    public static BatchResult failed(String name, String error) {
+        return new BatchResult(name, false, error);
+    }
+}
@@ -0,0 +1,80 @@
+package com.rescueanimals.models;
+
+import java.util.TreeSet;
+
+/**
+ * Allocates change sequence numbers for the changes-since endpoint.
+ * Every write stamps the rows it touches with a sequence number from this tracker, so a client
+ * that remembers the highest number it has seen (its watermark) can ask for only the rows
+ * changed after it. Numbers are handed out before the writing transaction commits, so the
+ * watermark reported to readers stops just below the oldest write still in flight; a row
+ * committed late is then picked up by the next sync instead of being skipped.
+ * The epoch identifies this server run; a watermark from another epoch is not trusted.
+ */
+public final class ChangeTracker {
+    private static final String EPOCH = Long.toString(System.currentTimeMillis(), 36);
+    private static final TreeSet<Long> inFlight = new TreeSet<>();
+    private static long lastSeq = 0;
+    private static long resyncBelow = 0;
+
+    private ChangeTracker() {
+    }
+
+    /**
+     * Raises the counter to at least the highest sequence number already stored.
+     * Called once at startup, so numbers keep increasing across server restarts.
+     * @param storedMax Highest changeSeq found in the database
+     */
+    public static synchronized void initialize(long storedMax) {
+        lastSeq = Math.max(lastSeq, storedMax);
+    }
+
+    /**
+     * Allocates the sequence number for a write that is about to start.
+     * Every call must be paired with end() once the transaction has committed or rolled back.
+     * @return The new sequence number
+     */
+    public static synchronized long begin() {
+        long seq = ++lastSeq;
+        inFlight.add(seq);
+        return seq;
+    }
+
+    /**
+     * Marks a write as finished.
+     * @param seq The number returned by begin()
+     */
+    public static synchronized void end(long seq) {
+        inFlight.remove(seq);
+    }
+
+    /**
+     * Gets the highest sequence number below which every write has finished.
+     * @return The watermark to report to readers
+     */
+    public static synchronized long watermark() {
+        return inFlight.isEmpty() ? lastSeq : inFlight.first() - 1;
+    }
+
+    /**
+     * Forces every client to resynchronize from scratch.
+     * Used after deletions, which leave no row behind to be reported as a change.
+     */
+    public static synchronized void requireResync() {
+        resyncBelow = lastSeq;
+    }
+
+    /**
+     * Checks whether a client's watermark can be used for an incremental sync.
+     * @param epoch Epoch the watermark was issued in
+     * @param since The client's watermark
+     * @return true if only the changes after the watermark need to be sent
+     */
+    public static synchronized boolean isValid(String epoch, long since) {
+        return EPOCH.equals(epoch) && since >= resyncBelow && since <= lastSeq;
+    }
+
+    public static String getEpoch() {
+        return EPOCH;
+    }
+}
@@ -0,0 +1,32 @@
+package com.rescueanimals.models;
+
+import java.util.List;
+
+/**
+ * Response of the changes-since endpoint.
+ * Carries the dogs and monkeys changed after the client's watermark together with the new
+ * watermark and epoch to send next time. A full response replaces the client's whole copy.
+ */
+public class ChangesResponse {
+    public final String epoch;
+    public final long watermark;
+    public final boolean full;
+    public final List<Dog> dogs;
+    public final List<Monkey> monkeys;
+
+    /**
+     * Constructs a ChangesResponse.
+     * @param epoch Epoch of the server run that issued the watermark
+     * @param watermark Sequence number up to which the changes are complete
+     * @param full true if the lists hold the whole roster rather than only changes
+     * @param dogs Changed (or all) dogs
+     * @param monkeys Changed (or all) monkeys
+     */
+    public ChangesResponse(String epoch, long watermark, boolean full, List<Dog> dogs, List<Monkey> monkeys) {
+        this.epoch = epoch;
+        this.watermark = watermark;
+        this.full = full;
+        this.dogs = dogs;
+        this.monkeys = monkeys;
+    }
+}
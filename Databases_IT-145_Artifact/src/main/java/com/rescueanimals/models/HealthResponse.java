@@ -0,0 +1,23 @@
+package com.rescueanimals.models;
+
+/**
+ * Response of the health endpoint.
+ * Lets a supervisor or load balancer tell a server that is ready for traffic from one that is
+ * still starting or has lost its database, without sending a real request.
+ */
+public class HealthResponse {
+    public final String status;
+    public final boolean database;
+    public final long uptimeMillis;
+
+    /**
+     * Constructs a HealthResponse.
+     * @param database true if the database answered a query
+     * @param uptimeMillis Milliseconds since the server started
+     */
+    public HealthResponse(boolean database, long uptimeMillis) {
+        this.status = database ? "ok" : "unavailable";
+        this.database = database;
+        this.uptimeMillis = uptimeMillis;
+    }
+}
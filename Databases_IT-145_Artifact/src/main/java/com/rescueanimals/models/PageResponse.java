@@ -0,0 +1,32 @@
+package com.rescueanimals.models;
+
+import java.util.List;
+
+/**
+ * Response wrapper for paginated list endpoints.
+ * Carries one page of items together with the total count so the frontend can render
+ * page controls without downloading the whole table.
+ */
+public class PageResponse<T> {
+    public final List<T> items;
+    public final long total;
+    public final int offset;
+    public final int limit;
+    public final Integer nextOffset;
+
+    /**
+     * Constructs a PageResponse for one page of results.
+     * @param items The items on this page
+     * @param total Total number of items across all pages
+     * @param offset Number of items skipped before this page
+     * @param limit Maximum number of items per page
+     */
+    public PageResponse(List<T> items, long total, int offset, int limit) {
+        this.items = items;
+        this.total = total;
+        this.offset = offset;
+        this.limit = limit;
+        // Cursor for the next page, or null when this is the last page
+        this.nextOffset = offset + items.size() < total ? offset + items.size() : null;
+    }
+}
@@ -18,6 +18,9 @@ public class RescueAnimal {
     private String trainingStatus;
     private boolean reserved;
     private String inServiceCountry;
+    // Sequence number of the last write to this animal (see ChangeTracker); null for rows
+    // written before change tracking existed
+    private Long changeSeq;
 
     public RescueAnimal() {}
 
@@ -52,4 +55,6 @@ public class RescueAnimal {
     public void setReserved(boolean reserved) { this.reserved = reserved; }
     public String getInServiceCountry() { return inServiceCountry; }
     public void setInServiceCountry(String inServiceCountry) { this.inServiceCountry = inServiceCountry; }
+    public Long getChangeSeq() { return changeSeq; }
+    public void setChangeSeq(Long changeSeq) { this.changeSeq = changeSeq; }
 } 
\ No newline at end of file
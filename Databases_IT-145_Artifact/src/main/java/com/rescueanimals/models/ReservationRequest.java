@@ -0,0 +1,34 @@
+package com.rescueanimals.models;
+
+/**
+ * One item of a bulk reservation request.
+ * Deserialized from the JSON body of POST /reserve/batch. The optional idempotency key lets a
+ * client safely resend a request whose response was lost: the server answers a repeated key
+ * with the original result instead of applying the reservation again.
+ */
+public class ReservationRequest {
+    public String type;
+    public String name;
+    public String country;
+    public String idempotencyKey;
+
+    /**
+     * Constructs an empty ReservationRequest (used by Gson).
+     */
+    public ReservationRequest() {
+    }
+
+    /**
+     * Constructs a ReservationRequest.
+     * @param type "dog" or "monkey"
+     * @param name Name of the animal to reserve
+     * @param country Service country
+     * @param idempotencyKey Client-chosen key identifying this reservation, or null
+     */
+    public ReservationRequest(String type, String name, String country, String idempotencyKey) {
+        this.type = type;
+        this.name = name;
+        this.country = country;
+        this.idempotencyKey = idempotencyKey;
+    }
+}
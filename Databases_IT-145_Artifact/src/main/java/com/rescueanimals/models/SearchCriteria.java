@@ -0,0 +1,98 @@
+package com.rescueanimals.models;
+
+import java.util.LinkedHashMap;
+import java.util.Map;
+
+import jakarta.persistence.Query;
+
+/**
+ * Filters for the search endpoint.
+ * Every filter is optional; the ones that are set are combined with AND. Text filters match
+ * case-insensitively, like the availability queries. The criteria build their own JPQL so the
+ * dog and monkey DAOs share one implementation.
+ */
+public class SearchCriteria {
+    public String namePrefix;
+    public final Map<String, String> equalTo = new LinkedHashMap<>();
+    public Boolean reserved;
+    public Integer minAge;
+    public Integer maxAge;
+    public Double minWeight;
+    public Double maxWeight;
+
+    /**
+     * Builds the WHERE clause for the criteria.
+     *
+     * Field names in equalTo are inserted into the query text, so callers must only put
+     * whitelisted entity fields there (RescueServer does).
+     * @param alias Alias of the entity in the query
+     * @return The clause including the WHERE keyword, or an empty string when nothing is filtered
+     */
+    public String whereClause(String alias) {
+        StringBuilder where = new StringBuilder();
+        if (namePrefix != null) {
+            append(where, "LOWER(" + alias + ".name) LIKE :namePrefix ESCAPE '!'");
+        }
+        for (String field : equalTo.keySet()) {
+            append(where, "LOWER(" + alias + "." + field + ") = :" + field);
+        }
+        if (reserved != null) {
+            append(where, alias + ".reserved = :reserved");
+        }
+        if (minAge != null) {
+            append(where, alias + ".age >= :minAge");
+        }
+        if (maxAge != null) {
+            append(where, alias + ".age <= :maxAge");
+        }
+        if (minWeight != null) {
+            append(where, alias + ".weight >= :minWeight");
+        }
+        if (maxWeight != null) {
+            append(where, alias + ".weight <= :maxWeight");
+        }
+        return where.toString();
+    }
+
+    /**
+     * Binds the parameters referenced by whereClause to a query.
+     * @param query Query built from whereClause
+     */
+    public void bind(Query query) {
+        if (namePrefix != null) {
+            // '!' is the LIKE escape character, so wildcards typed by the user match literally
+            String escaped = namePrefix.toLowerCase()
+                .replace("!", "!!")
+                .replace("%", "!%")
+                .replace("_", "!_");
+            query.setParameter("namePrefix", escaped + "%");
+        }
+        for (Map.Entry<String, String> filter : equalTo.entrySet()) {
+            query.setParameter(filter.getKey(), filter.getValue().toLowerCase());
+        }
+        if (reserved != null) {
+            query.setParameter("reserved", reserved);
+        }
+        if (minAge != null) {
+            query.setParameter("minAge", minAge);
+        }
+        if (maxAge != null) {
+            query.setParameter("maxAge", maxAge);
+        }
+        if (minWeight != null) {
+            query.setParameter("minWeight", minWeight);
+        }
+        if (maxWeight != null) {
+            query.setParameter("maxWeight", maxWeight);
+        }
+    }
+
+    /**
+     * Adds a condition to a WHERE clause under construction.
+     * @param where The clause built so far
+     * @param condition The condition to AND onto it
+     */
+    private static void append(StringBuilder where, String condition) {
+        where.append(where.length() == 0 ? " WHERE " : " AND ").append(condition);
+    }
+}
@@ -1,11 +1,21 @@
 package com.rescueanimals.models.dao;
 
+import java.util.ArrayList;
+import java.util.HashSet;
+import java.util.LinkedHashMap;
 import java.util.List;
+import java.util.Map;
+import java.util.Set;
 
+import com.rescueanimals.models.BatchResult;
+import com.rescueanimals.models.ChangeTracker;
 import com.rescueanimals.models.Dog;
 import com.rescueanimals.models.JPAUtil;
+import com.rescueanimals.models.ReservationRequest;
+import com.rescueanimals.models.SearchCriteria;
 
 import jakarta.persistence.EntityManager;
+import jakarta.persistence.Query;
 import jakarta.persistence.TypedQuery;
 
 /**
@@ -14,6 +24,11 @@ import jakarta.persistence.TypedQuery;
  * Uses JPA for persistence and transaction management.
  */
 public class DogDAO {
+    // Matches hibernate.jdbc.batch_size in persistence.xml
+    private static final int BATCH_FLUSH_SIZE = 50;
+    // Text fields that can be filtered on by the search endpoint
+    public static final List<String> SEARCH_FIELDS = List.of("breed", "trainingStatus", "acquisitionCountry", "inServiceCountry");
+
     /**
      * Retrieves all dogs from the database.
      * 
@@ -42,21 +57,83 @@ public class DogDAO {
      * Adds a new dog to the database.
      * 
      * @param dog The dog to add
+     * @return true if the dog was inserted, false if its name was empty or already taken
      */
-    public void saveDog(Dog dog) {
+    public boolean saveDog(Dog dog) {
         if (dog.getName() == null || dog.getName().trim().isEmpty()) {
             System.err.println("Error: Dog name cannot be null or empty. Skipping save.");
-            return;
+            return false;
         }
         try (EntityManager em = JPAUtil.getEntityManager()) {
             if (em.find(Dog.class, dog.getName()) != null) {
                 System.err.println("Error: Dog with name '" + dog.getName() + "' already exists. Skipping save.");
-                return;
+                return false;
+            }
+            long seq = ChangeTracker.begin();
+            try {
+                dog.setChangeSeq(seq);
+                em.getTransaction().begin();
+                em.persist(dog);
+                em.getTransaction().commit();
+            } finally {
+                ChangeTracker.end(seq);
+            }
+        }
+        return true;
+    }
+
+    /**
+     * Adds many dogs to the database in a single transaction.
+     * 
+     * Records with an empty name or a name that already exists (in the database or earlier in
+     * the same batch) are skipped and reported as failures; the rest are inserted together.
+     * Flushing every BATCH_FLUSH_SIZE records lets Hibernate send JDBC batches while keeping
+     * the persistence context small.
+     * 
+     * @param dogs The dogs to add
+     * @return One result per input record, in input order
+     */
+    public List<BatchResult> saveDogs(List<Dog> dogs) {
+        List<BatchResult> results = new ArrayList<>();
+        Set<String> seen = new HashSet<>();
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            long seq = ChangeTracker.begin();
+            try {
+                em.getTransaction().begin();
+                int pending = 0;
+                for (Dog dog : dogs) {
+                    String name = dog == null ? null : dog.getName();
+                    if (name == null || name.trim().isEmpty()) {
+                        results.add(BatchResult.failed(name, "name is required"));
+                    } else if (!seen.add(name) || em.find(Dog.class, name) != null) {
+                        results.add(BatchResult.failed(name, "duplicate name"));
+                    } else {
+                        dog.setChangeSeq(seq);
+                        em.persist(dog);
+                        results.add(BatchResult.ok(name));
+                        if (++pending % BATCH_FLUSH_SIZE == 0) {
+                            em.flush();
+                            em.clear();
+                        }
+                    }
+                }
+                em.getTransaction().commit();
+            } catch (Exception e) {
+                if (em.getTransaction().isActive()) {
+                    em.getTransaction().rollback();
+                }
+                System.err.println("Error: Failed to save dog batch");
+                System.err.println("Details: " + e.getMessage());
+                // Nothing from the batch was committed, so every record failed
+                results.clear();
+                for (Dog dog : dogs) {
+                    results.add(BatchResult.failed(dog == null ? null : dog.getName(), "batch failed: " + e.getMessage()));
+                }
+            } finally {
+                ChangeTracker.end(seq);
             }
-            em.getTransaction().begin();
-            em.persist(dog);
-            em.getTransaction().commit();
         }
+        return results;
     }
 
     /**
@@ -66,9 +143,15 @@ public class DogDAO {
      */
     public void updateDog(Dog dog) {
         try (EntityManager em = JPAUtil.getEntityManager()) {
-            em.getTransaction().begin();
-            em.merge(dog);
-            em.getTransaction().commit();
+            long seq = ChangeTracker.begin();
+            try {
+                dog.setChangeSeq(seq);
+                em.getTransaction().begin();
+                em.merge(dog);
+                em.getTransaction().commit();
+            } finally {
+                ChangeTracker.end(seq);
+            }
         }
     }
 
@@ -85,6 +168,10 @@ public class DogDAO {
                 em.remove(dog);
             }
             em.getTransaction().commit();
+            if (dog != null) {
+                // A deleted row cannot be reported as a change, so clients must resync
+                ChangeTracker.requireResync();
+            }
         }
     }
 
@@ -113,12 +200,14 @@ public class DogDAO {
      */
     public void updateDogStatus(String name, boolean reserved, String inServiceCountry) {
         try (EntityManager em = JPAUtil.getEntityManager()) {
+            long seq = ChangeTracker.begin();
             try {
                 em.getTransaction().begin();
                 Dog dog = em.find(Dog.class, name);
                 if (dog != null) {
                     dog.setReserved(reserved);
                     dog.setInServiceCountry(inServiceCountry);
+                    dog.setChangeSeq(seq);
                 }
                 em.getTransaction().commit();
             } catch (Exception e) {
@@ -128,8 +217,66 @@ public class DogDAO {
                 System.err.println("Error: Failed to update dog status");
                 System.err.println("Details: " + e.getMessage());
                 throw e;
+            } finally {
+                ChangeTracker.end(seq);
+            }
+        }
+    }
+
+    /**
+     * Reserves many dogs for service in a single transaction.
+     * 
+     * Each reservation is a conditional UPDATE that only matches an unreserved dog, so the
+     * check and the write happen in one statement and two concurrent requests can never both
+     * reserve the same dog. Requests for a missing or already reserved dog are reported as
+     * failures without affecting the others.
+     * 
+     * @param requests The reservations to apply
+     * @return One result per request, in input order
+     */
+    public List<BatchResult> reserveDogs(List<ReservationRequest> requests) {
+        List<BatchResult> results = new ArrayList<>();
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            long seq = ChangeTracker.begin();
+            try {
+                em.getTransaction().begin();
+                Query reserve = em.createQuery(
+                    "UPDATE Dog d SET d.reserved = true, d.inServiceCountry = :country, d.changeSeq = :seq WHERE d.name = :name AND d.reserved = false");
+                reserve.setParameter("seq", seq);
+                for (ReservationRequest request : requests) {
+                    if (request.country == null || request.country.trim().isEmpty()) {
+                        results.add(BatchResult.failed(request.name, "country is required"));
+                        continue;
+                    }
+                    int updated = reserve
+                        .setParameter("name", request.name)
+                        .setParameter("country", request.country)
+                        .executeUpdate();
+                    if (updated == 1) {
+                        results.add(BatchResult.ok(request.name));
+                    } else if (em.find(Dog.class, request.name) == null) {
+                        results.add(BatchResult.failed(request.name, "not found"));
+                    } else {
+                        results.add(BatchResult.failed(request.name, "already reserved"));
+                    }
+                }
+                em.getTransaction().commit();
+            } catch (Exception e) {
+                if (em.getTransaction().isActive()) {
+                    em.getTransaction().rollback();
+                }
+                System.err.println("Error: Failed to reserve dog batch");
+                System.err.println("Details: " + e.getMessage());
+                // Nothing from the batch was committed, so every request failed
+                results.clear();
+                for (ReservationRequest request : requests) {
+                    results.add(BatchResult.failed(request.name, "batch failed: " + e.getMessage()));
+                }
+            } finally {
+                ChangeTracker.end(seq);
             }
         }
+        return results;
     }
 
     /**
@@ -144,4 +291,158 @@ public class DogDAO {
             return query.getResultList();
         }
     }
-} 
\ No newline at end of file
+
+    /**
+     * Retrieves one page of dogs, ordered by name.
+     * 
+     * @param offset Number of dogs to skip
+     * @param limit Maximum number of dogs to return
+     * @return The requested page of dogs
+     */
+    public List<Dog> getDogsPage(int offset, int limit) {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            TypedQuery<Dog> query = em.createQuery("SELECT d FROM Dog d ORDER BY d.name", Dog.class);
+            query.setFirstResult(offset);
+            query.setMaxResults(limit);
+            return query.getResultList();
+        }
+    }
+
+    /**
+     * Counts all dogs in the database.
+     * 
+     * @return Total number of dogs
+     */
+    public long countDogs() {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            return em.createQuery("SELECT COUNT(d) FROM Dog d", Long.class).getSingleResult();
+        }
+    }
+
+    /**
+     * Retrieves one page of available (non-reserved) dogs, ordered by name.
+     * 
+     * @param offset Number of available dogs to skip
+     * @param limit Maximum number of dogs to return
+     * @return The requested page of available dogs
+     */
+    public List<Dog> getAvailableDogsPage(int offset, int limit) {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            TypedQuery<Dog> query = em.createQuery(
+                "SELECT d FROM Dog d WHERE d.reserved = false AND LOWER(d.trainingStatus) = 'in service' ORDER BY d.name", Dog.class);
+            query.setFirstResult(offset);
+            query.setMaxResults(limit);
+            return query.getResultList();
+        }
+    }
+
+    /**
+     * Counts available (non-reserved) dogs.
+     * 
+     * @return Total number of available dogs
+     */
+    public long countAvailableDogs() {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            return em.createQuery(
+                "SELECT COUNT(d) FROM Dog d WHERE d.reserved = false AND LOWER(d.trainingStatus) = 'in service'", Long.class)
+                .getSingleResult();
+        }
+    }
+
+    /**
+     * Retrieves one page of dogs matching the search criteria, ordered by name.
+     * 
+     * @param criteria Filters to apply
+     * @param offset Number of matching dogs to skip
+     * @param limit Maximum number of dogs to return
+     * @return The requested page of matching dogs
+     */
+    public List<Dog> searchDogs(SearchCriteria criteria, int offset, int limit) {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            TypedQuery<Dog> query = em.createQuery(
+                "SELECT d FROM Dog d" + criteria.whereClause("d") + " ORDER BY d.name", Dog.class);
+            criteria.bind(query);
+            query.setFirstResult(offset);
+            query.setMaxResults(limit);
+            return query.getResultList();
+        }
+    }
+
+    /**
+     * Counts dogs matching the search criteria.
+     * 
+     * @param criteria Filters to apply
+     * @return Total number of matching dogs
+     */
+    public long countDogs(SearchCriteria criteria) {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            TypedQuery<Long> query = em.createQuery(
+                "SELECT COUNT(d) FROM Dog d" + criteria.whereClause("d"), Long.class);
+            criteria.bind(query);
+            return query.getSingleResult();
+        }
+    }
+
+    /**
+     * Counts dogs per distinct value of each searchable text field.
+     * 
+     * Used to populate the filter options of the search panel without downloading the roster.
+     * 
+     * @return Field name mapped to each distinct value and its number of dogs
+     */
+    public Map<String, Map<String, Long>> getDogFacets() {
+        Map<String, Map<String, Long>> facets = new LinkedHashMap<>();
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            for (String field : SEARCH_FIELDS) {
+                Map<String, Long> counts = new LinkedHashMap<>();
+                List<Object[]> rows = em.createQuery(
+                    "SELECT d." + field + ", COUNT(d) FROM Dog d WHERE d." + field + " IS NOT NULL GROUP BY d." + field + " ORDER BY d." + field,
+                    Object[].class).getResultList();
+                for (Object[] row : rows) {
+                    counts.put((String) row[0], (Long) row[1]);
+                }
+                facets.put(field, counts);
+            }
+        }
+        return facets;
+    }
+
+    /**
+     * Retrieves the dogs changed after a watermark.
+     * 
+     * With since = 0 every dog is returned, including rows written before change tracking
+     * existed. Rows stamped after upTo belong to writes that were still in flight when the
+     * watermark was taken and are left for the next sync.
+     * 
+     * @param since The client's watermark, or 0 for a full sync
+     * @param upTo The watermark being reported to the client
+     * @return The changed dogs
+     */
+    public List<Dog> getDogChanges(long since, long upTo) {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            TypedQuery<Dog> query;
+            if (since == 0) {
+                query = em.createQuery(
+                    "SELECT d FROM Dog d WHERE d.changeSeq IS NULL OR d.changeSeq <= :upTo", Dog.class);
+            } else {
+                query = em.createQuery(
+                    "SELECT d FROM Dog d WHERE d.changeSeq > :since AND d.changeSeq <= :upTo", Dog.class);
+                query.setParameter("since", since);
+            }
+            query.setParameter("upTo", upTo);
+            return query.getResultList();
+        }
+    }
+
+    /**
+     * Gets the highest change sequence number stored for any dog.
+     * 
+     * @return The highest changeSeq, or 0 if no dog has one
+     */
+    public long getMaxDogChangeSeq() {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            Long max = em.createQuery("SELECT MAX(d.changeSeq) FROM Dog d", Long.class).getSingleResult();
+            return max == null ? 0 : max;
+        }
+    }
+}
\ No newline at end of file
@@ -1,11 +1,21 @@
 package com.rescueanimals.models.dao;
 
+import java.util.ArrayList;
+import java.util.HashSet;
+import java.util.LinkedHashMap;
 import java.util.List;
+import java.util.Map;
+import java.util.Set;
 
+import com.rescueanimals.models.BatchResult;
+import com.rescueanimals.models.ChangeTracker;
 import com.rescueanimals.models.JPAUtil;
 import com.rescueanimals.models.Monkey;
+import com.rescueanimals.models.ReservationRequest;
+import com.rescueanimals.models.SearchCriteria;
 
 import jakarta.persistence.EntityManager;
+import jakarta.persistence.Query;
 import jakarta.persistence.TypedQuery;
 
 /**
@@ -14,6 +24,11 @@ import jakarta.persistence.TypedQuery;
  * Uses JPA for persistence and transaction management.
  */
 public class MonkeyDAO {
+    // Matches hibernate.jdbc.batch_size in persistence.xml
+    private static final int BATCH_FLUSH_SIZE = 50;
+    // Text fields that can be filtered on by the search endpoint
+    public static final List<String> SEARCH_FIELDS = List.of("species", "trainingStatus", "acquisitionCountry", "inServiceCountry");
+
     /**
      * Retrieves all monkeys from the database.
      * 
@@ -42,21 +57,83 @@ public class MonkeyDAO {
      * Saves a new monkey to the database.
      * 
      * @param monkey The monkey to save
+     * @return true if the monkey was inserted, false if its name was empty or already taken
      */
-    public void saveMonkey(Monkey monkey) {
+    public boolean saveMonkey(Monkey monkey) {
         if (monkey.getName() == null || monkey.getName().trim().isEmpty()) {
             System.err.println("Error: Monkey name cannot be null or empty. Skipping save.");
-            return;
+            return false;
         }
         try (EntityManager em = JPAUtil.getEntityManager()) {
             if (em.find(Monkey.class, monkey.getName()) != null) {
                 System.err.println("Error: Monkey with name '" + monkey.getName() + "' already exists. Skipping save.");
-                return;
+                return false;
+            }
+            long seq = ChangeTracker.begin();
+            try {
+                monkey.setChangeSeq(seq);
+                em.getTransaction().begin();
+                em.persist(monkey);
+                em.getTransaction().commit();
+            } finally {
+                ChangeTracker.end(seq);
+            }
+        }
+        return true;
+    }
+
+    /**
+     * Adds many monkeys to the database in a single transaction.
+     * 
+     * Records with an empty name or a name that already exists (in the database or earlier in
+     * the same batch) are skipped and reported as failures; the rest are inserted together.
+     * Flushing every BATCH_FLUSH_SIZE records lets Hibernate send JDBC batches while keeping
+     * the persistence context small.
+     * 
+     * @param monkeys The monkeys to add
+     * @return One result per input record, in input order
+     */
+    public List<BatchResult> saveMonkeys(List<Monkey> monkeys) {
+        List<BatchResult> results = new ArrayList<>();
+        Set<String> seen = new HashSet<>();
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            long seq = ChangeTracker.begin();
+            try {
+                em.getTransaction().begin();
+                int pending = 0;
+                for (Monkey monkey : monkeys) {
+                    String name = monkey == null ? null : monkey.getName();
+                    if (name == null || name.trim().isEmpty()) {
+                        results.add(BatchResult.failed(name, "name is required"));
+                    } else if (!seen.add(name) || em.find(Monkey.class, name) != null) {
+                        results.add(BatchResult.failed(name, "duplicate name"));
+                    } else {
+                        monkey.setChangeSeq(seq);
+                        em.persist(monkey);
+                        results.add(BatchResult.ok(name));
+                        if (++pending % BATCH_FLUSH_SIZE == 0) {
+                            em.flush();
+                            em.clear();
+                        }
+                    }
+                }
+                em.getTransaction().commit();
+            } catch (Exception e) {
+                if (em.getTransaction().isActive()) {
+                    em.getTransaction().rollback();
+                }
+                System.err.println("Error: Failed to save monkey batch");
+                System.err.println("Details: " + e.getMessage());
+                // Nothing from the batch was committed, so every record failed
+                results.clear();
+                for (Monkey monkey : monkeys) {
+                    results.add(BatchResult.failed(monkey == null ? null : monkey.getName(), "batch failed: " + e.getMessage()));
+                }
+            } finally {
+                ChangeTracker.end(seq);
             }
-            em.getTransaction().begin();
-            em.persist(monkey);
-            em.getTransaction().commit();
         }
+        return results;
     }
 
     /**
@@ -66,9 +143,15 @@ public class MonkeyDAO {
      */
     public void updateMonkey(Monkey monkey) {
         try (EntityManager em = JPAUtil.getEntityManager()) {
-            em.getTransaction().begin();
-            em.merge(monkey);
-            em.getTransaction().commit();
+            long seq = ChangeTracker.begin();
+            try {
+                monkey.setChangeSeq(seq);
+                em.getTransaction().begin();
+                em.merge(monkey);
+                em.getTransaction().commit();
+            } finally {
+                ChangeTracker.end(seq);
+            }
         }
     }
 
@@ -85,6 +168,10 @@ public class MonkeyDAO {
                 em.remove(monkey);
             }
             em.getTransaction().commit();
+            if (monkey != null) {
+                // A deleted row cannot be reported as a change, so clients must resync
+                ChangeTracker.requireResync();
+            }
         }
     }
 
@@ -113,12 +200,14 @@ public class MonkeyDAO {
      */
     public void updateMonkeyStatus(String name, boolean reserved, String inServiceCountry) {
         try (EntityManager em = JPAUtil.getEntityManager()) {
+            long seq = ChangeTracker.begin();
             try {
                 em.getTransaction().begin();
                 Monkey monkey = em.find(Monkey.class, name);
                 if (monkey != null) {
                     monkey.setReserved(reserved);
                     monkey.setInServiceCountry(inServiceCountry);
+                    monkey.setChangeSeq(seq);
                 }
                 em.getTransaction().commit();
             } catch (Exception e) {
@@ -128,8 +217,66 @@ public class MonkeyDAO {
                 System.err.println("Error: Failed to update monkey status");
                 System.err.println("Details: " + e.getMessage());
                 throw e;
+            } finally {
+                ChangeTracker.end(seq);
+            }
+        }
+    }
+
+    /**
+     * Reserves many monkeys for service in a single transaction.
+     * 
+     * Each reservation is a conditional UPDATE that only matches an unreserved monkey, so the
+     * check and the write happen in one statement and two concurrent requests can never both
+     * reserve the same monkey. Requests for a missing or already reserved monkey are reported as
+     * failures without affecting the others.
+     * 
+     * @param requests The reservations to apply
+     * @return One result per request, in input order
+     */
+    public List<BatchResult> reserveMonkeys(List<ReservationRequest> requests) {
+        List<BatchResult> results = new ArrayList<>();
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            long seq = ChangeTracker.begin();
+            try {
+                em.getTransaction().begin();
+                Query reserve = em.createQuery(
+                    "UPDATE Monkey m SET m.reserved = true, m.inServiceCountry = :country, m.changeSeq = :seq WHERE m.name = :name AND m.reserved = false");
+                reserve.setParameter("seq", seq);
+                for (ReservationRequest request : requests) {
+                    if (request.country == null || request.country.trim().isEmpty()) {
+                        results.add(BatchResult.failed(request.name, "country is required"));
+                        continue;
+                    }
+                    int updated = reserve
+                        .setParameter("name", request.name)
+                        .setParameter("country", request.country)
+                        .executeUpdate();
+                    if (updated == 1) {
+                        results.add(BatchResult.ok(request.name));
+                    } else if (em.find(Monkey.class, request.name) == null) {
+                        results.add(BatchResult.failed(request.name, "not found"));
+                    } else {
+                        results.add(BatchResult.failed(request.name, "already reserved"));
+                    }
+                }
+                em.getTransaction().commit();
+            } catch (Exception e) {
+                if (em.getTransaction().isActive()) {
+                    em.getTransaction().rollback();
+                }
+                System.err.println("Error: Failed to reserve monkey batch");
+                System.err.println("Details: " + e.getMessage());
+                // Nothing from the batch was committed, so every request failed
+                results.clear();
+                for (ReservationRequest request : requests) {
+                    results.add(BatchResult.failed(request.name, "batch failed: " + e.getMessage()));
+                }
+            } finally {
+                ChangeTracker.end(seq);
             }
         }
+        return results;
     }
 
     /**
@@ -144,4 +291,158 @@ public class MonkeyDAO {
             return query.getResultList();
         }
     }
-} 
\ No newline at end of file
+
+    /**
+     * Retrieves one page of monkeys, ordered by name.
+     * 
+     * @param offset Number of monkeys to skip
+     * @param limit Maximum number of monkeys to return
+     * @return The requested page of monkeys
+     */
+    public List<Monkey> getMonkeysPage(int offset, int limit) {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            TypedQuery<Monkey> query = em.createQuery("SELECT m FROM Monkey m ORDER BY m.name", Monkey.class);
+            query.setFirstResult(offset);
+            query.setMaxResults(limit);
+            return query.getResultList();
+        }
+    }
+
+    /**
+     * Counts all monkeys in the database.
+     * 
+     * @return Total number of monkeys
+     */
+    public long countMonkeys() {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            return em.createQuery("SELECT COUNT(m) FROM Monkey m", Long.class).getSingleResult();
+        }
+    }
+
+    /**
+     * Retrieves one page of available (non-reserved) monkeys, ordered by name.
+     * 
+     * @param offset Number of available monkeys to skip
+     * @param limit Maximum number of monkeys to return
+     * @return The requested page of available monkeys
+     */
+    public List<Monkey> getAvailableMonkeysPage(int offset, int limit) {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            TypedQuery<Monkey> query = em.createQuery(
+                "SELECT m FROM Monkey m WHERE m.reserved = false AND LOWER(m.trainingStatus) = 'in service' ORDER BY m.name", Monkey.class);
+            query.setFirstResult(offset);
+            query.setMaxResults(limit);
+            return query.getResultList();
+        }
+    }
+
+    /**
+     * Counts available (non-reserved) monkeys.
+     * 
+     * @return Total number of available monkeys
+     */
+    public long countAvailableMonkeys() {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            return em.createQuery(
+                "SELECT COUNT(m) FROM Monkey m WHERE m.reserved = false AND LOWER(m.trainingStatus) = 'in service'", Long.class)
+                .getSingleResult();
+        }
+    }
+
+    /**
+     * Retrieves one page of monkeys matching the search criteria, ordered by name.
+     * 
+     * @param criteria Filters to apply
+     * @param offset Number of matching monkeys to skip
+     * @param limit Maximum number of monkeys to return
+     * @return The requested page of matching monkeys
+     */
+    public List<Monkey> searchMonkeys(SearchCriteria criteria, int offset, int limit) {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            TypedQuery<Monkey> query = em.createQuery(
+                "SELECT m FROM Monkey m" + criteria.whereClause("m") + " ORDER BY m.name", Monkey.class);
+            criteria.bind(query);
+            query.setFirstResult(offset);
+            query.setMaxResults(limit);
+            return query.getResultList();
+        }
+    }
+
+    /**
+     * Counts monkeys matching the search criteria.
+     * 
+     * @param criteria Filters to apply
+     * @return Total number of matching monkeys
+     */
+    public long countMonkeys(SearchCriteria criteria) {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            TypedQuery<Long> query = em.createQuery(
+                "SELECT COUNT(m) FROM Monkey m" + criteria.whereClause("m"), Long.class);
+            criteria.bind(query);
+            return query.getSingleResult();
+        }
+    }
+
+    /**
+     * Counts monkeys per distinct value of each searchable text field.
+     * 
+     * Used to populate the filter options of the search panel without downloading the roster.
+     * 
+     * @return Field name mapped to each distinct value and its number of monkeys
+     */
+    public Map<String, Map<String, Long>> getMonkeyFacets() {
+        Map<String, Map<String, Long>> facets = new LinkedHashMap<>();
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            for (String field : SEARCH_FIELDS) {
+                Map<String, Long> counts = new LinkedHashMap<>();
+                List<Object[]> rows = em.createQuery(
+                    "SELECT m." + field + ", COUNT(m) FROM Monkey m WHERE m." + field + " IS NOT NULL GROUP BY m." + field + " ORDER BY m." + field,
+                    Object[].class).getResultList();
+                for (Object[] row : rows) {
+                    counts.put((String) row[0], (Long) row[1]);
+                }
+                facets.put(field, counts);
+            }
+        }
+        return facets;
+    }
+
+    /**
+     * Retrieves the monkeys changed after a watermark.
+     * 
+     * With since = 0 every monkey is returned, including rows written before change tracking
+     * existed. Rows stamped after upTo belong to writes that were still in flight when the
+     * watermark was taken and are left for the next sync.
+     * 
+     * @param since The client's watermark, or 0 for a full sync
+     * @param upTo The watermark being reported to the client
+     * @return The changed monkeys
+     */
+    public List<Monkey> getMonkeyChanges(long since, long upTo) {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            TypedQuery<Monkey> query;
+            if (since == 0) {
+                query = em.createQuery(
+                    "SELECT m FROM Monkey m WHERE m.changeSeq IS NULL OR m.changeSeq <= :upTo", Monkey.class);
+            } else {
+                query = em.createQuery(
+                    "SELECT m FROM Monkey m WHERE m.changeSeq > :since AND m.changeSeq <= :upTo", Monkey.class);
+                query.setParameter("since", since);
+            }
+            query.setParameter("upTo", upTo);
+            return query.getResultList();
+        }
+    }
+
+    /**
+     * Gets the highest change sequence number stored for any monkey.
+     * 
+     * @return The highest changeSeq, or 0 if no monkey has one
+     */
+    public long getMaxMonkeyChangeSeq() {
+        try (EntityManager em = JPAUtil.getEntityManager()) {
+            Long max = em.createQuery("SELECT MAX(m.changeSeq) FROM Monkey m", Long.class).getSingleResult();
+            return max == null ? 0 : max;
+        }
+    }
+}
\ No newline at end of file
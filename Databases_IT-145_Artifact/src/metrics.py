@@ -0,0 +1,408 @@
+"""Latency and payload histograms for the frontend, exported as Prometheus text."""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds in seconds, from a fast cache-backed call to a slow full roster download
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Upper bounds in bytes, from a one-record reply to a full roster
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Upper bounds in writes, from a lone add to a full group commit batch
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+# Every metric recorded by the client: name -> (help text, buckets, or None for a counter)
+METRICS = {
+    "rescue_request_seconds": ("HTTP round trip time per endpoint, including retries", LATENCY_BUCKETS),
+    "rescue_request_errors_total": ("Requests that raised or returned a 5xx status", None),
+    "rescue_response_bytes": ("Response body size per endpoint", SIZE_BUCKETS),
+    "rescue_decode_seconds": ("Time spent decoding JSON response bodies", LATENCY_BUCKETS),
+    "rescue_build_seconds": ("Time spent constructing model objects from decoded records", LATENCY_BUCKETS),
+    "rescue_page_render_seconds": ("Time spent rendering a page of the app", LATENCY_BUCKETS),
+    "rescue_write_batch_size": ("Adds sent per group commit batch", BATCH_BUCKETS),
+}
+
+# Route templates for paths that carry parameters
+ROUTE_TEMPLATES = (("/reserve/", "/reserve/batch", "/reserve/{type}/{name}"),)
+
+
+def endpoint_label(path):
+    """
+    Return the route a request path belongs to, without its query string.
+
+    Args:
+        path (str): Request path, e.g. "/reserve/dog/Rex?x=1"
+
+    Returns:
+        str: The route, e.g. "/reserve/{type}/{name}"
+    """
+    path = path.split("?", 1)[0]
+    for prefix, exact, template in ROUTE_TEMPLATES:
+        if path.startswith(prefix) and path != exact:
+            return template
+    return path
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed bucket bounds.
+
+    Attributes:
+        buckets (tuple): Upper bounds of the buckets, ascending
+        counts (list[int]): Observations per bucket; the last slot counts values above every bound
+        count (int): Number of observations
+        sum (float): Sum of the observed values
+    """
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Add one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by linear interpolation within the bucket that contains it.
+
+        Args:
+            q (float): Quantile between 0 and 1, e.g. 0.95
+
+        Returns:
+            float: The estimate, or None without observations. Values above the last bound are
+                reported as the last bound.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+
+class _NullTimer:
+    """Context manager that does nothing; handed out while metrics are off."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """Context manager that observes the time spent in its block."""
+    __slots__ = ("metrics", "name", "labels", "started")
+
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class Metrics:
+    """
+    Thread-safe registry of the client's histograms and counters.
+
+    Attributes:
+        enabled (bool): Whether observations are recorded
+    """
+    def __init__(self, enabled=False):
+        """
+        Initialize an empty registry.
+
+        Args:
+            enabled (bool): Record observations from the start. Defaults to False
+        """
+        self.enabled = enabled
+        self._series = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._dumper = None
+
+    def enable(self):
+        """Start recording observations."""
+        self.enabled = True
+
+    def observe(self, name, value, **labels):
+        """
+        Record a value in a histogram, or add it to a counter.
+
+        Args:
+            name (str): Metric name, one of METRICS
+            value (float): Observed value (seconds, bytes, or a counter increment)
+            **labels: Label values identifying the series
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                buckets = METRICS[name][1]
+                series = Histogram(buckets) if buckets is not None else [0]
+                self._series[key] = series
+            if isinstance(series, Histogram):
+                series.observe(value)
+            else:
+                series[0] += value
+
+    def timer(self, name, **labels):
+        """
+        Return a context manager that records the time spent in its block.
+
+        Args:
+            name (str): Histogram name, one of METRICS
+            **labels: Label values identifying the series
+
+        Returns:
+            A context manager; a shared no-op one while metrics are off
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def summary(self):
+        """
+        Report count, mean and estimated p50/p95/p99 of every histogram series.
+
+        Returns:
+            dict: name -> list of dicts with labels, count, mean, p50, p95 and p99
+        """
+        report = {}
+        with self._lock:
+            for (name, labels), series in sorted(self._series.items()):
+                if not isinstance(series, Histogram):
+                    continue
+                report.setdefault(name, []).append({
+                    "labels": dict(labels),
+                    "count": series.count,
+                    "mean": series.sum / series.count,
+                    "p50": series.quantile(0.5),
+                    "p95": series.quantile(0.95),
+                    "p99": series.quantile(0.99),
+                })
+        return report
+
+    def render(self):
+        """
+        Format every series in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text
+        """
+        lines = []
+        with self._lock:
+            by_name = {}
+            for (name, labels), series in sorted(self._series.items()):
+                by_name.setdefault(name, []).append((labels, series))
+            for name, entries in by_name.items():
+                help_text, buckets = METRICS[name]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {'histogram' if buckets is not None else 'counter'}")
+                for labels, series in entries:
+                    if buckets is None:
+                        lines.append(f"{name}{_format_labels(labels)} {series[0]}")
+                        continue
+                    cumulative = 0
+                    for bound, bucket_count in zip(buckets, series.counts):
+                        cumulative += bucket_count
+                        lines.append(f"{name}_bucket{_format_labels(labels, le=repr(float(bound)))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels, le='+Inf')} {series.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {series.sum!r}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {series.count}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """
+        Write the exposition text to a file, replacing it atomically.
+
+        Args:
+            path (str): Target file, e.g. for node_exporter's textfile collector
+        """
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(temporary, path)
+
+    def dump_every(self, path, interval=15.0):
+        """
+        Rewrite the file from a background thread every interval seconds.
+
+        Calling it again while the thread runs has no effect.
+
+        Args:
+            path (str): Target file
+            interval (float): Seconds between writes
+        """
+        with self._lock:
+            if self._dumper is not None:
+                return
+
+            def run():
+                while True:
+                    time.sleep(interval)
+                    try:
+                        self.dump(path)
+                    except OSError:
+                        # A full disk or a removed directory must not end the app; retry later
+                        pass
+
+            self._dumper = threading.Thread(target=run, name="metrics-dump", daemon=True)
+            self._dumper.start()
+
+    def serve(self, port, host="127.0.0.1"):
+        """
+        Serve the exposition text at http://host:port/metrics from a background thread.
+
+        Calling it again while the server runs has no effect.
+
+        Args:
+            port (int): Port to listen on
+            host (str): Interface to bind. Defaults to localhost only
+
+        Returns:
+            ThreadingHTTPServer: The running server
+
+        Raises:
+            OSError: If the port cannot be bound
+        """
+        with self._lock:
+            if self._server is not None:
+                return self._server
+            metrics = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?", 1)[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = metrics.render().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            self._server = ThreadingHTTPServer((host, port), Handler)
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+            return self._server
+
+
+def _format_labels(labels, **extra):
+    """Format label pairs as {a="1",b="2"}, or an empty string without labels."""
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in pairs
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+class InstrumentedTransport:
+    """
+    Transport wrapper that records round trip time, response size and errors per endpoint.
+
+    It offers the same request/get/post/stats interface as PooledTransport. Streamed responses
+    are timed until their headers arrive, and their size is taken from Content-Length if sent.
+
+    Attributes:
+        transport: The wrapped PooledTransport or BalancedTransport
+        metrics (Metrics): Registry the observations go to
+    """
+    def __init__(self, transport, base_url, metrics):
+        """
+        Initialize the wrapper.
+
+        Args:
+            transport: The transport to wrap
+            base_url (str): Base URL the request paths are taken relative to
+            metrics (Metrics): Registry the observations go to
+        """
+        self.transport = transport
+        self.metrics = metrics
+        self._base = base_url
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request through the wrapped transport and record it.
+
+        Args:
+            method (str): HTTP method
+            url (str): Absolute URL of the endpoint
+            **kwargs: Extra arguments forwarded to the wrapped transport
+
+        Returns:
+            requests.Response: The server response
+        """
+        if not self.metrics.enabled:
+            return self.transport.request(method, url, **kwargs)
+        endpoint = endpoint_label(url[len(self._base):] if url.startswith(self._base) else url)
+        started = time.perf_counter()
+        try:
+            response = self.transport.request(method, url, **kwargs)
+        except Exception:
+            self.metrics.observe("rescue_request_errors_total", 1, method=method, endpoint=endpoint)
+            raise
+        self.metrics.observe("rescue_request_seconds", time.perf_counter() - started, method=method, endpoint=endpoint)
+        if response.status_code >= 500:
+            self.metrics.observe("rescue_request_errors_total", 1, method=method, endpoint=endpoint)
+        if kwargs.get("stream"):
+            size = response.headers.get("Content-Length")
+            size = int(size) if size and size.isdigit() else None
+        else:
+            size = len(response.content)
+        if size is not None:
+            self.metrics.observe("rescue_response_bytes", size, method=method, endpoint=endpoint)
+        return response
+
+    def get(self, url, **kwargs):
+        """Send a GET request and record it."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """Send a POST request and record it."""
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        """Report the wrapped transport's statistics."""
+        return self.transport.stats()
+
+
+# Process-wide registry; Streamlit keeps imported modules loaded across reruns, so it
+# accumulates for the lifetime of the app process
+metrics = Metrics(enabled=os.environ.get("RESCUE_METRICS", "") not in ("", "0"))
@@ -0,0 +1,241 @@
+"""Optimistic adds and reservations for RescueAPI: shown at once, sent in the background."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from roster import RosterSnapshot
+
+class PendingWrite:
+    """
+    A write shown in the local roster at once and sent to the server in the background.
+    
+    Attributes:
+        kind (str): "add" or "reserve"
+        animal_type (str): "dog" or "monkey"
+        name (str): Name of the animal
+        value: The added animal, or the service country of a reservation
+        status (str): "pending" until the server answers, then "confirmed" or "failed"
+        error (str): Why the write failed, or None
+    """
+    __slots__ = ("kind", "animal_type", "name", "value", "status", "error", "_settled", "_undo")
+
+    def __init__(self, kind, animal_type, name, value, error=None):
+        self.kind = kind
+        self.animal_type = animal_type
+        self.name = name
+        self.value = value
+        self.status = "pending"
+        self.error = None
+        self._settled = threading.Event()
+        # (index, animal shown, animal before) once the write has been applied to a roster index
+        self._undo = None
+        if error is not None:
+            self._settle(error)
+
+    @property
+    def done(self):
+        """Return True once the server has answered (or the write was rejected locally)."""
+        return self.status != "pending"
+
+    def wait(self, timeout=None):
+        """Block until the write is settled; return False if the timeout expired first."""
+        return self._settled.wait(timeout)
+
+    def _settle(self, error):
+        self.error = error
+        self.status = "failed" if error else "confirmed"
+        self._settled.set()
+
+    def __repr__(self):
+        return f"PendingWrite(kind={self.kind!r}, name={self.name!r}, status={self.status!r}, error={self.error!r})"
+
+
+class OptimisticWritesMixin:
+    """
+    Optimistic write methods of RescueAPI.
+    
+    Relies on the client's _models, _index, replica, stale_roster, queue_add, reserve_animal
+    and _fetch_roster_snapshot.
+    """
+    def _init_optimistic_writes(self):
+        """Set up the pending write state. Called from RescueAPI.__init__."""
+        # Optimistic writes not yet answered by the server, in submission order
+        self._optimistic = []
+        self._optimistic_lock = threading.Lock()
+        self._optimistic_version = 0
+        self._overlay = None
+        self._write_executor = None
+
+    def add_animal_optimistic(self, animal_type: str, animal) -> PendingWrite:
+        """
+        Add a dog or monkey optimistically: show it at once and send it in the background.
+        
+        The animal appears in get_page and get_roster_index results immediately. The add is
+        then queued for group commit with other adds (see queue_add); when the server answers,
+        the local change is dropped in favor of the server's data, and if the server rejected
+        the add, it is removed from the index again. A name already in the
+        roster index is rejected at once without contacting the server.
+        
+        Args:
+            animal_type (str): Type of animal ('dog' or 'monkey')
+            animal (Dog | Monkey): The animal to add
+            
+        Returns:
+            PendingWrite: Tracks the outcome; already failed if rejected locally
+        """
+        index = self._index
+        if index is not None and index.get(animal_type, animal.name) is not None:
+            return PendingWrite("add", animal_type, animal.name, animal, error="the name is already taken")
+        # A private copy with server-side types, so the caller cannot change what the roster shows
+        local = self._models[animal_type].from_dict(animal.to_dict()).as_stored()
+        return self._submit_optimistic(PendingWrite("add", animal_type, animal.name, local))
+
+    def reserve_animal_optimistic(self, animal_type: str, name: str, country: str) -> PendingWrite:
+        """
+        Reserve an animal optimistically: show the reservation at once and send it in the background.
+        
+        Works like add_animal_optimistic. An animal the roster index knows to be missing or
+        already reserved is rejected at once without contacting the server.
+        
+        Args:
+            animal_type (str): Type of animal ('dog' or 'monkey')
+            name (str): Name of the animal to reserve
+            country (str): Country where the animal will be in service
+            
+        Returns:
+            PendingWrite: Tracks the outcome; already failed if rejected locally
+        """
+        index = self._index
+        if index is not None:
+            animal = index.get(animal_type, name)
+            if animal is None or animal.reserved:
+                return PendingWrite("reserve", animal_type, name, country, error="the animal is not available")
+        return self._submit_optimistic(PendingWrite("reserve", animal_type, name, country))
+
+    def _pending_writes(self):
+        """Return the optimistic writes not answered yet, in submission order."""
+        with self._optimistic_lock:
+            return list(self._optimistic)
+
+    def _submit_optimistic(self, pending):
+        """Apply a write locally and queue it for the background worker."""
+        with self._optimistic_lock:
+            self._optimistic.append(pending)
+            self._optimistic_version += 1
+            if self._write_executor is None:
+                # One worker keeps the writes in order; a reservation also waits for the add of its animal
+                self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="optimistic-writes")
+        index = self._index
+        if index is not None:
+            self._index_optimistic(index)
+        self._write_executor.submit(self._send_optimistic, pending)
+        return pending
+
+    def _send_optimistic(self, pending):
+        """Send one optimistic write; it is settled by _settle_optimistic once the server answers."""
+        if pending.kind == "add":
+            # Adds share batch requests with other sessions' adds (see queue_add). The worker
+            # moves on at once and the add is settled when its batch returns
+            future = self.queue_add(pending.animal_type, pending.value)
+            future.add_done_callback(lambda future: self._settle_optimistic(pending, self._add_error(future)))
+            return
+        for earlier in self._pending_writes():
+            if earlier is pending:
+                break
+            if earlier.kind == "add" and (earlier.animal_type, earlier.name) == (pending.animal_type, pending.name):
+                # A reservation must not overtake the add of the same animal
+                earlier.wait()
+        try:
+            applied = self.reserve_animal(pending.animal_type, pending.name, pending.value)
+            error = None if applied else "the animal is no longer available"
+        except Exception as e:
+            error = str(e)
+        self._settle_optimistic(pending, error)
+
+    @staticmethod
+    def _add_error(future):
+        """Return why a queued add failed, or None if it was applied."""
+        try:
+            result = future.result()
+        except Exception as e:
+            return str(e)
+        if result.success:
+            return None
+        if result.error in (None, "duplicate name"):
+            return "the name is already taken"
+        return result.error
+
+    def _settle_optimistic(self, pending, error):
+        """Settle an optimistic write, undoing its local effect if it failed."""
+        with self._optimistic_lock:
+            self._optimistic.remove(pending)
+            self._optimistic_version += 1
+        if error is not None:
+            self._undo_optimistic(pending)
+        pending._settle(error)
+
+    def _undo_optimistic(self, pending):
+        """Take a refused write back out of the roster index: remove a failed add, unreserve a failed reservation."""
+        if pending._undo is None:
+            return
+        index, applied, before = pending._undo
+        for later in self._pending_writes():
+            if later._undo is not None and later._undo[2] is applied:
+                # A later write for the same animal was applied on top of this one; should it fail
+                # too, it has to go back to the state before both
+                later._undo = (later._undo[0], later._undo[1], before)
+        if index is not self._index or index.get(pending.animal_type, pending.name) is not applied:
+            # The index was rebuilt or the animal synced since, so it no longer shows this write
+            return
+        if before is None:
+            index.remove(pending.animal_type, pending.name)
+        else:
+            index.add(pending.animal_type, before)
+
+    def _optimistic_roster(self):
+        """
+        Return the local roster with the pending optimistic writes applied.
+        
+        The base is the delta sync replica, else the last snapshot or stored roster; only
+        without any of these is the roster fetched. The result is reused until the base or
+        the pending writes change.
+        """
+        if self.replica is not None and self.replica.epoch is not None:
+            base = self.replica.snapshot()
+        elif self._snapshot is not None:
+            base = self._snapshot
+        elif self.stale_roster is not None:
+            base = self.stale_roster.snapshot
+        else:
+            base = self._fetch_roster_snapshot()
+        with self._optimistic_lock:
+            version = self._optimistic_version
+            pending_writes = list(self._optimistic)
+        overlay = self._overlay
+        if overlay is not None and overlay[0] is base and overlay[1] == version:
+            return overlay[2]
+
+        animals = {"dog": list(base.dogs), "monkey": list(base.monkeys)}
+        for pending in pending_writes:
+            roster = animals[pending.animal_type]
+            position = next((i for i, animal in enumerate(roster) if animal.name == pending.name), None)
+            if pending.kind == "add":
+                if position is None:
+                    roster.append(pending.value)
+            elif position is not None and not roster[position].reserved:
+                roster[position] = roster[position].copy(reserved=True, inServiceCountry=pending.value)
+        snapshot = RosterSnapshot(animals["dog"], animals["monkey"], base.fetched_at, stale=base.stale)
+        self._overlay = (base, version, snapshot)
+        return snapshot
+
+    def _index_optimistic(self, index):
+        """Make the index show every optimistic write the server has not answered yet."""
+        for pending in self._pending_writes():
+            animal = index.get(pending.animal_type, pending.name)
+            if pending.kind == "add":
+                if animal is None:
+                    index.add(pending.animal_type, pending.value)
+                    pending._undo = (index, pending.value, None)
+            elif animal is not None and not animal.reserved:
+                index.reserve(pending.animal_type, pending.name, pending.value)
+                pending._undo = (index, index.get(pending.animal_type, pending.name), animal)
@@ -0,0 +1,78 @@
+"""Background warm-up of the caches the next page will read."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Prefetcher:
+    """
+    Small thread pool running keyed warm-up jobs, at most one per key at a time.
+
+    Attributes:
+        submitted (int): Jobs started
+        skipped (int): Submissions ignored because the same key was already pending
+        failed (int): Jobs that raised
+    """
+    def __init__(self, max_workers=2):
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers (int): Number of jobs run concurrently
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="page-warmup")
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def submit(self, key, job, *args):
+        """
+        Run job(*args) in the background unless a job with the same key is pending.
+
+        Args:
+            key (Hashable): Identifies the warm-up, e.g. ("View Animals", tables)
+            job (callable): The warm-up function
+            *args: Arguments for job
+
+        Returns:
+            bool: True if the job was queued, False if the same key was already pending
+        """
+        with self._lock:
+            if key in self._pending:
+                self.skipped += 1
+                return False
+            self._pending.add(key)
+            self.submitted += 1
+        self._executor.submit(self._run, key, job, args)
+        return True
+
+    def _run(self, key, job, args):
+        try:
+            job(*args)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def stats(self):
+        """
+        Report prefetch counters.
+
+        Returns:
+            dict: submitted, skipped, failed and pending (jobs queued or running)
+        """
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "skipped": self.skipped,
+                "failed": self.failed,
+                "pending": len(self._pending),
+            }
+
+    def shutdown(self):
+        """Stop accepting jobs and wait for the running ones."""
+        self._executor.shutdown(wait=True)
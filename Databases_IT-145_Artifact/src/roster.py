@@ -0,0 +1,548 @@
+"""Roster snapshots, pages and secondary indexes built on the client."""
+
+import itertools
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+from animals import AnimalBatch, MODELS
+
+# Source of RosterSnapshot.generation; unlike id(), a number is never reused by a later snapshot
+_snapshot_generations = itertools.count(1)
+
+
+def is_available(animal):
+    """
+    Check whether an animal can be reserved.
+
+    Mirrors the backend's getAvailableDogs/getAvailableMonkeys queries: the animal must not be
+    reserved and its training status must be "in service" (case-insensitive).
+
+    Args:
+        animal (Dog | Monkey): The animal to check
+
+    Returns:
+        bool: True if the animal is available for reservation
+    """
+    return not animal.reserved and (animal.trainingStatus or "").lower() == "in service"
+
+
+class RosterSnapshot:
+    """
+    A point-in-time copy of the full roster.
+
+    Attributes:
+        dogs (list[Dog]): All dogs in the system
+        monkeys (list[Monkey]): All monkeys in the system
+        fetched_at (float): Monotonic time at which the roster was downloaded
+        stale (bool): True if the roster was read from disk and not yet confirmed by the server
+        generation (int): Number unique to this snapshot within the process, identifying its
+            contents (see Page.version)
+    """
+    def __init__(self, dogs, monkeys, fetched_at=None, stale=False):
+        """
+        Initialize the snapshot.
+
+        Args:
+            dogs (list[Dog]): All dogs in the system
+            monkeys (list[Monkey]): All monkeys in the system
+            fetched_at (float): Monotonic download time. Defaults to now
+            stale (bool): Whether the roster comes from a stored copy. Defaults to False
+        """
+        self.dogs = dogs
+        self.monkeys = monkeys
+        self.fetched_at = time.monotonic() if fetched_at is None else fetched_at
+        self.stale = stale
+        self.generation = next(_snapshot_generations)
+        self._available_index = None
+        self._batches = {}
+
+    def age(self):
+        """Return the number of seconds since the roster was downloaded."""
+        return time.monotonic() - self.fetched_at
+
+    def is_fresh(self, max_age):
+        """
+        Check whether the snapshot is young enough to be served.
+
+        Args:
+            max_age (float): Maximum age in seconds
+
+        Returns:
+            bool: True if the snapshot is at most max_age seconds old
+        """
+        return self.age() <= max_age
+
+    def _index(self):
+        # Positions of available animals, computed once and reused by every available() call
+        if self._available_index is None:
+            self._available_index = {
+                "dogs": [i for i, dog in enumerate(self.dogs) if is_available(dog)],
+                "monkeys": [i for i, monkey in enumerate(self.monkeys) if is_available(monkey)],
+            }
+        return self._available_index
+
+    def available(self):
+        """
+        Return the available animals, in the same shape as RescueAPI.get_available_animals.
+
+        Returns:
+            dict: Dictionary containing two lists:
+                - dogs: List of available Dog objects
+                - monkeys: List of available Monkey objects
+        """
+        index = self._index()
+        return {
+            "dogs": [self.dogs[i] for i in index["dogs"]],
+            "monkeys": [self.monkeys[i] for i in index["monkeys"]],
+        }
+
+    def animals(self, animal_type):
+        """Return the list of dogs or monkeys for an animal type ("dog" or "monkey")."""
+        return self.dogs if animal_type == "dog" else self.monkeys
+
+    def batch(self, animal_type):
+        """
+        Return the roster of one animal type as a columnar batch, built once per snapshot.
+
+        Args:
+            animal_type (str): "dog" or "monkey"
+
+        Returns:
+            AnimalBatch: Every animal of that type
+        """
+        key = (animal_type, "all")
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = AnimalBatch.from_animals(animal_type, self.animals(animal_type))
+            self._batches[key] = batch
+        return batch
+
+    def available_batch(self, animal_type):
+        """
+        Return the available animals of one type as a columnar batch, built once per snapshot.
+
+        Args:
+            animal_type (str): "dog" or "monkey"
+
+        Returns:
+            AnimalBatch: The available animals of that type
+        """
+        key = (animal_type, "available")
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self.batch(animal_type).take(self._index()[f"{animal_type}s"])
+            self._batches[key] = batch
+        return batch
+
+    def page(self, animal_type, offset, limit, available=False):
+        """
+        Cut one window out of the roster, ordered by name like the server's pages.
+
+        Args:
+            animal_type (str): "dog" or "monkey"
+            offset (int): Number of animals to skip
+            limit (int): Maximum number of animals to return
+            available (bool): Only page through available animals
+
+        Returns:
+            Page: The window, with source "stale" if the snapshot is stale and "snapshot" otherwise
+        """
+        key = (animal_type, "available_by_name" if available else "by_name")
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self.available_batch(animal_type) if available else self.batch(animal_type)
+            names = batch.column("name")
+            batch = batch.take(sorted(range(len(names)), key=lambda i: names[i] or ""))
+            self._batches[key] = batch
+        total = len(batch)
+        end = min(offset + limit, total)
+        return Page(
+            animal_type,
+            batch.take(range(offset, end)),
+            total,
+            offset,
+            limit,
+            end if end < total else None,
+            source="stale" if self.stale else "snapshot",
+            version=(self.generation, available, offset, end),
+        )
+
+    def as_dict(self):
+        """
+        Return the snapshot in the shape of RescueAPI.gather_snapshot.
+
+        Returns:
+            dict: Dictionary with dogs, monkeys and available keys
+        """
+        return {"dogs": self.dogs, "monkeys": self.monkeys, "available": self.available()}
+
+
+class Page:
+    """
+    One window of a paginated list endpoint.
+
+    Attributes:
+        animal_type (str): "dog" or "monkey"
+        batch (AnimalBatch): The animals on this page, stored column-wise
+        total (int): Total number of animals across all pages
+        offset (int): Number of animals before this page
+        limit (int): Maximum page size requested
+        next_offset (int): Offset of the next page (the cursor), or None on the last page
+        source (str): "server" if the server produced the page, "index" if it was computed
+            locally from a RosterIndex, "stale" if it was cut from a roster stored on disk
+        version (tuple): Identifies the page's contents when it was cut from a RosterSnapshot
+            (equal versions mean equal rows), or None
+    """
+    def __init__(self, animal_type, batch, total, offset, limit, next_offset, source="server", version=None):
+        self.animal_type = animal_type
+        self.batch = batch
+        self.total = total
+        self.offset = offset
+        self.limit = limit
+        self.next_offset = next_offset
+        self.source = source
+        self.version = version
+
+    @classmethod
+    def from_response(cls, animal_type, data, offset, limit):
+        """
+        Build a page from a decoded PageResponse.
+
+        A server without pagination support returns the whole list (or, for /available, both
+        lists) instead; in that case the requested window is sliced out locally so callers see
+        the same result either way.
+
+        Args:
+            animal_type (str): "dog" or "monkey"
+            data (dict | list): Decoded response body
+            offset (int): Requested offset
+            limit (int): Requested page size
+
+        Returns:
+            Page: The requested window
+        """
+        if isinstance(data, dict) and "items" not in data:
+            # Unpaginated /available response: {"dogs": [...], "monkeys": [...]}
+            data = data.get(f"{animal_type}s", [])
+        if isinstance(data, list):
+            records = data[offset:offset + limit]
+            total = len(data)
+            next_offset = offset + len(records) if offset + len(records) < total else None
+        else:
+            records = data.get("items", [])
+            total = data.get("total", len(records))
+            offset = data.get("offset", offset)
+            limit = data.get("limit", limit)
+            next_offset = data.get("nextOffset")
+        return cls(animal_type, AnimalBatch.from_records(animal_type, records), total, offset, limit, next_offset)
+
+    @property
+    def has_next(self):
+        """Return True if there is a page after this one."""
+        return self.next_offset is not None
+
+    def __len__(self):
+        return len(self.batch)
+
+
+class RosterIndex:
+    """
+    In-memory secondary indexes over the roster, kept per animal type.
+    
+    Exact-match fields get a hash index mapping each value to the set of animal names that
+    have it, so an equality filter costs O(1) plus the size of its result. Age, weight and the
+    name get sorted indexes searched with bisect, so a range filter or a name prefix search
+    costs O(log n) plus the size of its result. Text values are matched case-insensitively,
+    like the backend's availability query.
+    
+    Attributes:
+        HASH_FIELDS (tuple): Fields with a hash index (breed only exists for dogs, species only for monkeys)
+        SORTED_FIELDS (tuple): Fields with a sorted index
+        fetched_at (float): Monotonic time at which the underlying roster was downloaded
+        version (int): Incremented on every change, so derived views can tell they are stale
+    """
+    HASH_FIELDS = ("breed", "species", "trainingStatus", "acquisitionCountry", "inServiceCountry", "reserved")
+    SORTED_FIELDS = ("age", "weight")
+
+    def __init__(self, dogs=(), monkeys=(), fetched_at=None):
+        """
+        Build the indexes.
+        
+        Args:
+            dogs (Iterable[Dog]): All dogs in the system
+            monkeys (Iterable[Monkey]): All monkeys in the system
+            fetched_at (float): Monotonic download time. Defaults to now
+        """
+        self.fetched_at = time.monotonic() if fetched_at is None else fetched_at
+        self.version = 0
+        self._lock = threading.RLock()
+        self._animals = {}
+        self._hash = {}
+        self._sorted = {}
+        self._by_name = {}
+        for animal_type, model in MODELS.items():
+            self._animals[animal_type] = {}
+            self._by_name[animal_type] = ([], [])
+            self._hash[animal_type] = {field: {} for field in self.HASH_FIELDS if field in model.FIELDS}
+            self._sorted[animal_type] = {field: ([], []) for field in self.SORTED_FIELDS}
+        for dog in dogs:
+            self._insert("dog", dog)
+        for monkey in monkeys:
+            self._insert("monkey", monkey)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """
+        Build an index over a roster snapshot.
+        
+        Args:
+            snapshot (RosterSnapshot): The roster to index
+        
+        Returns:
+            RosterIndex: The index, sharing the snapshot's download time
+        """
+        return cls(snapshot.dogs, snapshot.monkeys, snapshot.fetched_at)
+
+    def age(self):
+        """Return the number of seconds since the underlying roster was downloaded."""
+        return time.monotonic() - self.fetched_at
+
+    @staticmethod
+    def _key(value):
+        # Hash key for a field value: text is compared case-insensitively
+        return value.casefold() if isinstance(value, str) else value
+
+    def _insert(self, animal_type, animal):
+        name = animal.name
+        self._animals[animal_type][name] = animal
+        folded_names, names = self._by_name[animal_type]
+        position = bisect_right(folded_names, name.casefold())
+        folded_names.insert(position, name.casefold())
+        names.insert(position, name)
+        for field, index in self._hash[animal_type].items():
+            index.setdefault(self._key(getattr(animal, field)), set()).add(name)
+        for field, (values, names) in self._sorted[animal_type].items():
+            value = getattr(animal, field)
+            if value is not None:
+                position = bisect_right(values, value)
+                values.insert(position, value)
+                names.insert(position, name)
+
+    def _delete(self, animal_type, name):
+        animal = self._animals[animal_type].pop(name, None)
+        if animal is None:
+            return None
+        folded_names, names = self._by_name[animal_type]
+        folded = name.casefold()
+        position = names.index(name, bisect_left(folded_names, folded), bisect_right(folded_names, folded))
+        del folded_names[position]
+        del names[position]
+        for field, index in self._hash[animal_type].items():
+            key = self._key(getattr(animal, field))
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.discard(name)
+                if not bucket:
+                    del index[key]
+        for field, (values, names) in self._sorted[animal_type].items():
+            value = getattr(animal, field)
+            if value is not None:
+                # Several animals can share a value; find this one within the run of equal values
+                start = bisect_left(values, value)
+                position = names.index(name, start, bisect_right(values, value))
+                del values[position]
+                del names[position]
+        return animal
+
+    def add(self, animal_type, animal):
+        """
+        Add an animal to the index, replacing any animal of the same type with the same name.
+        
+        Numeric fields sent as text (e.g. by the Add form) are converted to their stored types
+        first, so the sorted age and weight indexes only ever compare numbers.
+        
+        Args:
+            animal_type (str): "dog" or "monkey"
+            animal (Dog | Monkey): The animal to add
+        """
+        animal = animal.as_stored()
+        with self._lock:
+            self._delete(animal_type, animal.name)
+            self._insert(animal_type, animal)
+            self.version += 1
+
+    def remove(self, animal_type, name):
+        """
+        Remove an animal from the index.
+        
+        Args:
+            animal_type (str): "dog" or "monkey"
+            name (str): Name of the animal
+        
+        Returns:
+            Dog | Monkey: The removed animal, or None if it was not indexed
+        """
+        with self._lock:
+            animal = self._delete(animal_type, name)
+            if animal is not None:
+                self.version += 1
+            return animal
+
+    def reserve(self, animal_type, name, country):
+        """
+        Record a successful reservation.
+        
+        Args:
+            animal_type (str): "dog" or "monkey"
+            name (str): Name of the reserved animal
+            country (str): Service country
+        
+        Returns:
+            bool: True if the animal was indexed and has been updated
+        """
+        with self._lock:
+            animal = self._animals[animal_type].get(name)
+            if animal is None:
+                return False
+            # copy() keeps this working for read-only FrozenDog/FrozenMonkey objects
+            self._delete(animal_type, name)
+            self._insert(animal_type, animal.copy(reserved=True, inServiceCountry=country))
+            self.version += 1
+            return True
+
+    def get(self, animal_type, name):
+        """
+        Look up an animal by name in O(1).
+        
+        Args:
+            animal_type (str): "dog" or "monkey"
+            name (str): Name of the animal
+        
+        Returns:
+            Dog | Monkey: The animal, or None if there is none with that name
+        """
+        return self._animals[animal_type].get(name)
+
+    def __len__(self):
+        return sum(len(animals) for animals in self._animals.values())
+
+    def _matching(self, animal_type, prefix, criteria):
+        # Names matching every criterion, starting from the most selective index
+        candidates = []
+        if prefix:
+            folded_names, names = self._by_name[animal_type]
+            folded = prefix.casefold()
+            # Every name starting with the prefix sorts between the prefix and prefix + U+10FFFF
+            start = bisect_left(folded_names, folded)
+            end = bisect_left(folded_names, folded + "\U0010ffff", start)
+            candidates.append(set(names[start:end]))
+        for field, condition in criteria.items():
+            if field in self._hash[animal_type]:
+                candidates.append(self._hash[animal_type][field].get(self._key(condition), set()))
+            elif field in self._sorted[animal_type]:
+                low, high = condition
+                values, names = self._sorted[animal_type][field]
+                start = 0 if low is None else bisect_left(values, low)
+                end = len(values) if high is None else bisect_right(values, high)
+                candidates.append(set(names[start:end]))
+            else:
+                raise ValueError(f"No index on {field!r} for {animal_type}s")
+        if not candidates:
+            return set(self._animals[animal_type])
+        candidates.sort(key=len)
+        return candidates[0].intersection(*candidates[1:])
+
+    def names(self, animal_type, prefix=None, **criteria):
+        """
+        Return the names of the animals matching every criterion, in name order.
+        
+        Args:
+            animal_type (str): "dog" or "monkey"
+            prefix (str): Only include names starting with this text (case-insensitive)
+            **criteria: Exact values for hash-indexed fields (e.g. trainingStatus="in service"),
+                or (low, high) tuples for age and weight, where either bound may be None
+        
+        Returns:
+            list[str]: Matching names, sorted
+        
+        Raises:
+            ValueError: If a criterion names a field without an index
+        """
+        with self._lock:
+            return sorted(self._matching(animal_type, prefix, criteria))
+
+    def where(self, animal_type, prefix=None, **criteria):
+        """
+        Return the animals matching every criterion, in name order.
+        
+        Args:
+            animal_type (str): "dog" or "monkey"
+            prefix (str): Only include names starting with this text (case-insensitive)
+            **criteria: As for names()
+        
+        Returns:
+            list[Dog | Monkey]: The matching animals
+        
+        Raises:
+            ValueError: If a criterion names a field without an index
+        """
+        with self._lock:
+            animals = self._animals[animal_type]
+            return [animals[name] for name in sorted(self._matching(animal_type, prefix, criteria))]
+
+    def search(self, animal_type, prefix=None, offset=0, limit=50, **criteria):
+        """
+        Return one page of the animals matching a search, in name order.
+        
+        Args:
+            animal_type (str): "dog" or "monkey"
+            prefix (str): Only include names starting with this text (case-insensitive)
+            offset (int): Number of matches to skip
+            limit (int): Maximum number of animals on the page
+            **criteria: As for names()
+        
+        Returns:
+            Page: The requested window of matches, with source "index"
+        
+        Raises:
+            ValueError: If a criterion names a field without an index
+        """
+        with self._lock:
+            names = sorted(self._matching(animal_type, prefix, criteria))
+            animals = self._animals[animal_type]
+            window = [animals[name] for name in names[offset:offset + limit]]
+        end = offset + len(window)
+        next_offset = end if end < len(names) else None
+        batch = AnimalBatch.from_animals(animal_type, window)
+        return Page(animal_type, batch, len(names), offset, limit, next_offset, source="index")
+
+    def available(self, animal_type):
+        """
+        Return the animals of one type that can be reserved, in name order.
+        
+        Args:
+            animal_type (str): "dog" or "monkey"
+        
+        Returns:
+            list[Dog | Monkey]: Unreserved animals whose training status is "in service"
+        """
+        return self.where(animal_type, reserved=False, trainingStatus="in service")
+
+    def values(self, animal_type, field):
+        """
+        Return the distinct values of a hash-indexed field with their animal counts.
+        
+        Args:
+            animal_type (str): "dog" or "monkey"
+            field (str): A field in HASH_FIELDS that exists for the animal type
+        
+        Returns:
+            dict: Each distinct value, spelled as on one of its animals, mapped to its count
+        """
+        with self._lock:
+            animals = self._animals[animal_type]
+            return {
+                getattr(animals[next(iter(names))], field): len(names)
+                for names in self._hash[animal_type][field].values()
+            }
@@ -0,0 +1,317 @@
+"""Roster snapshots, delta sync, warm start and the roster index for RescueAPI."""
+
+import logging
+import threading
+import time
+
+from cache import SingleFlight
+from metrics import metrics
+from replica import RosterReplica
+from roster import RosterIndex, RosterSnapshot
+from snapshot_store import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+
+class RosterSyncMixin:
+    """
+    Roster snapshot, delta sync and roster index methods of RescueAPI.
+    
+    Relies on the client's base_url, transport, cache, snapshot_ttl, frozen_models and _models,
+    and on _download_roster for a full download.
+    """
+    def _init_roster_sync(self, delta_sync, snapshot_path):
+        """Set up the snapshot, replica, store and index state. Called from RescueAPI.__init__."""
+        self._snapshot = None
+        self._snapshot_lock = threading.Lock()
+        # Incremented whenever the snapshot is dropped, so a download that started before a
+        # write does not put back the pre-write roster
+        self._snapshot_generation = 0
+        self._index = None
+        self.replica = RosterReplica() if delta_sync else None
+        self._sync_lock = threading.Lock()
+        # Collapses concurrent roster downloads and syncs, e.g. from several browser sessions
+        self._roster_flight = SingleFlight()
+        self.store = SnapshotStore(snapshot_path) if snapshot_path else None
+        self.stale_roster = None
+        self.reconcile_error = None
+
+    def _drop_snapshot(self):
+        """Discard the roster snapshot and any download of it already in progress."""
+        with self._snapshot_lock:
+            self._snapshot_generation += 1
+            self._snapshot = None
+
+    def fresh_snapshot(self):
+        """
+        Return the current roster snapshot if snapshot mode is on and it is still fresh.
+        
+        Returns:
+            RosterSnapshot: The fresh snapshot, or None if there is none
+        """
+        snapshot = self._snapshot
+        if self.snapshot_ttl is None or snapshot is None or not snapshot.is_fresh(self.snapshot_ttl):
+            return None
+        return snapshot
+
+    def snapshot_generation(self):
+        """
+        Return a token to pass to store_snapshot when a roster download finishes.
+        
+        The token changes whenever the snapshot is dropped, e.g. after a write, so a download
+        that was already running can tell that its roster may be out of date.
+        
+        Returns:
+            int: The current snapshot generation
+        """
+        return self._snapshot_generation
+
+    def store_snapshot(self, dogs, monkeys, generation=None):
+        """
+        Record a newly downloaded roster as the current snapshot and return it.
+        
+        Args:
+            dogs (list[Dog]): The downloaded dogs
+            monkeys (list[Monkey]): The downloaded monkeys
+            generation (int): snapshot_generation() from when the download started. If the
+                snapshot has been dropped since, the roster may predate a write and is returned
+                without being kept. Defaults to None (always keep it)
+        
+        Returns:
+            RosterSnapshot: Snapshot of the given roster
+        """
+        snapshot = RosterSnapshot(dogs, monkeys)
+        with self._snapshot_lock:
+            if generation is not None and generation != self._snapshot_generation:
+                return snapshot
+            self._snapshot = snapshot
+        self._roster_confirmed(snapshot, changed=True)
+        return snapshot
+
+    def _roster_confirmed(self, snapshot, changed, epoch=None, watermark=0):
+        """Stop serving the stored roster now that the server answered, and save a changed one."""
+        self.stale_roster = None
+        if changed and self.store is not None:
+            self.store.save_later(snapshot, epoch, watermark)
+
+    def warm_start(self, retry_delay=0.5, max_retry_delay=5.0, max_attempts=None):
+        """
+        Load the roster saved by a previous run and reconcile it with the backend in the background.
+        
+        Until the backend answers, get_page, get_roster_snapshot, get_roster_index, search and
+        get_facets serve the stored roster without contacting the server, so the first tables
+        appear without waiting for it to boot; stale_roster tells whether that is happening. A
+        background thread fetches the roster, retrying with exponential backoff, and the normal
+        reads resume as soon as it succeeds. With delta sync on, the replica is seeded from the
+        stored roster, so if the backend kept running only the changes since the save are
+        transferred. If the thread gives up, the stored roster stays in place and
+        reconcile_error holds the last error; calling warm_start again starts a new attempt.
+        
+        Args:
+            retry_delay (float): Seconds to wait before the first retry
+            max_retry_delay (float): Upper bound for the retry backoff
+            max_attempts (int): Fetches to try before giving up. Defaults to None (keep trying)
+        
+        Returns:
+            StoredRoster: The roster being served, or None if nothing was stored or the client
+                has already downloaded a roster
+        """
+        if self.stale_roster is not None and self.reconcile_error is not None:
+            stored = self.stale_roster
+        elif self.store is None or self._snapshot is not None or self.stale_roster is not None:
+            return self.stale_roster
+        else:
+            stored = self.store.load(frozen=self.frozen_models)
+            if stored is None:
+                return None
+            self.stale_roster = stored
+            if self.replica is not None and stored.epoch is not None:
+                self.replica.restore(stored.snapshot, stored.epoch, stored.watermark)
+        self.reconcile_error = None
+        threading.Thread(
+            target=self._reconcile,
+            args=(retry_delay, max_retry_delay, max_attempts),
+            name="roster-reconcile",
+            daemon=True,
+        ).start()
+        return stored
+
+    def _reconcile(self, delay, max_delay, max_attempts):
+        """Fetch the roster until the backend answers, replacing the stored copy."""
+        attempts = 0
+        while self.stale_roster is not None:
+            attempts += 1
+            try:
+                self._fetch_roster_snapshot()
+            except Exception as e:
+                # Any failure, not only a network error, must leave the thread retrying
+                logger.warning("Roster reconcile attempt %d failed: %s", attempts, e)
+                if max_attempts is not None and attempts >= max_attempts:
+                    logger.error("Giving up roster reconcile after %d attempts", attempts)
+                    self.reconcile_error = e
+                    return
+                time.sleep(delay)
+                delay = min(delay * 2, max_delay)
+
+    def get_roster_snapshot(self):
+        """
+        Return a fresh roster snapshot, downloading dogs and monkeys concurrently if needed.
+        
+        With delta sync on, the local replica is brought up to date instead (see sync_roster),
+        which transfers only the animals changed since the previous call. After warm_start, the
+        stored roster is returned until the backend has answered.
+        
+        Returns:
+            RosterSnapshot: Snapshot of the full roster
+            
+        Raises:
+            requests.exceptions.HTTPError: If a request fails
+        """
+        stale = self.stale_roster
+        if stale is not None:
+            return stale.snapshot
+        return self._fetch_roster_snapshot()
+
+    def _fetch_roster_snapshot(self):
+        """Sync or download the roster from the backend, bypassing the stored roster."""
+        if self.replica is not None:
+            snapshot = self.sync_roster()
+            if snapshot is not None:
+                return snapshot
+        return self._roster_flight.do("snapshot", self._download_roster)
+
+    def sync_roster(self):
+        """
+        Bring the local replica up to date through the /changes endpoint.
+        
+        Only animals written after the replica's watermark are transferred and decoded, and an
+        unchanged delta is revalidated with its ETag, so a steady-state sync costs one request
+        with no body. The server replaces the whole replica when the watermark cannot be used.
+        The roster index, if built, is patched with the received animals. Against a server
+        without /changes, delta sync is switched off and None is returned. Callers arriving while
+        a sync is in flight share its result instead of sending a request of their own.
+        
+        Returns:
+            RosterSnapshot: Snapshot of the synced roster, or None if delta sync is unavailable
+            
+        Raises:
+            requests.exceptions.HTTPError: If the request fails
+        """
+        return self._roster_flight.do("sync", self._sync_roster)
+
+    def _sync_roster(self):
+        """Run one /changes round trip for sync_roster."""
+        with self._sync_lock:
+            replica = self.replica
+            if replica is None:
+                return None
+            started = time.perf_counter()
+            generation = self._snapshot_generation
+            params = replica.sync_params()
+            headers = {"If-None-Match": replica.etag} if replica.etag and replica.etag_params == params else {}
+            response = self.transport.get(f"{self.base_url}/changes", params=params, headers=headers)
+            if response.status_code == 404:
+                self.replica = None
+                return None
+            if response.status_code == 304:
+                replica.record_sync(False, 0, 0, time.perf_counter() - started)
+                snapshot = replica.snapshot()
+                self._roster_confirmed(snapshot, changed=False)
+                return snapshot
+            response.raise_for_status()
+            with metrics.timer("rescue_decode_seconds", endpoint="/changes"):
+                delta = response.json()
+            with metrics.timer("rescue_build_seconds", endpoint="/changes"):
+                full, changed = replica.apply(delta, self._models)
+            replica.etag = response.headers.get("ETag")
+            replica.etag_params = params
+            replica.record_sync(full, len(changed), len(response.content), time.perf_counter() - started)
+            snapshot = replica.snapshot()
+            self._roster_confirmed(snapshot, full or bool(changed), replica.epoch, replica.watermark)
+
+            index = self._index
+            if index is not None:
+                if full:
+                    self._index = None
+                else:
+                    for animal_type, animal in changed:
+                        index.add(animal_type, animal)
+                    index.fetched_at = time.monotonic()
+
+            with self._snapshot_lock:
+                if generation == self._snapshot_generation:
+                    self._snapshot = snapshot
+            return snapshot
+
+    def sync_stats(self):
+        """
+        Report delta sync counters, including the cost of the latest sync.
+        
+        Returns:
+            dict: See RosterReplica.stats, plus deduplicated (syncs that joined one already in
+                flight), or an empty dict when delta sync is off
+        """
+        if self.replica is None:
+            return {}
+        stats = self.replica.stats()
+        stats["deduplicated"] = self._roster_flight.deduplicated
+        return stats
+
+    def get_roster_index(self, max_age=None):
+        """
+        Return secondary indexes over the roster, building them from a snapshot when needed.
+        
+        The index is kept across calls and updated in place when this client's adds and
+        reservations succeed, so it only has to be rebuilt once it is older than max_age, to pick
+        up changes made by other clients. With delta sync on, every call syncs the replica and
+        patches the index with the changes instead, and max_age is not used.
+        
+        Args:
+            max_age (float): Maximum age in seconds before the index is rebuilt. Defaults to
+                snapshot_ttl, or never when snapshot mode is off
+        
+        Returns:
+            RosterIndex: Index over every dog and monkey
+            
+        Raises:
+            requests.exceptions.HTTPError: If the roster has to be downloaded and a request fails
+        """
+        stale = self.stale_roster
+        if stale is not None:
+            # The stored roster has its own index, which is never patched or kept as self._index
+            return stale.index()
+        if self.replica is not None:
+            # Syncing patches the index with whatever changed, so it never goes stale
+            snapshot = self.sync_roster()
+            if snapshot is not None:
+                if self._index is None:
+                    self._index = RosterIndex.from_snapshot(snapshot)
+                index = self._index
+                self._index_optimistic(index)
+                return index
+        if max_age is None:
+            max_age = self.snapshot_ttl
+        index = self._index
+        if index is None or (max_age is not None and index.age() > max_age):
+            index = RosterIndex.from_snapshot(self._fetch_roster_snapshot())
+            self._index = index
+        self._index_optimistic(index)
+        return index
+
+    def _index_added(self, animal_type, animals):
+        """Add newly created animals to the roster index, if one has been built."""
+        index = self._index
+        if index is None:
+            return
+        model = self._models[animal_type]
+        for animal in animals:
+            # Index a private copy so the caller's object can be reused without changing the index
+            index.add(animal_type, model.from_dict(animal.to_dict()))
+
+    def _index_reserved(self, reservations):
+        """Apply successful (animal_type, name, country) reservations to the roster index."""
+        index = self._index
+        if index is None:
+            return
+        for animal_type, name, country in reservations:
+            index.reserve(animal_type, name, country)
@@ -0,0 +1,170 @@
+"""On-disk SQLite copy of the last good roster, served after a restart until the backend answers."""
+
+import json
+import sqlite3
+import threading
+import time
+
+from animals import AnimalBatch
+from roster import RosterIndex, RosterSnapshot
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS roster (animal_type TEXT PRIMARY KEY, columns TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+)
+
+
+class StoredRoster:
+    """
+    A roster read back from disk.
+
+    Attributes:
+        snapshot (RosterSnapshot): The roster, marked stale
+        saved_at (float): time.time() at which it was saved
+        epoch (str): Delta sync epoch it was synced to, or None
+        watermark (int): Delta sync watermark it was synced to
+    """
+    __slots__ = ("snapshot", "saved_at", "epoch", "watermark", "_index")
+
+    def __init__(self, snapshot, saved_at, epoch, watermark):
+        self.snapshot = snapshot
+        self.saved_at = saved_at
+        self.epoch = epoch
+        self.watermark = watermark
+        self._index = None
+
+    def age(self):
+        """Return the number of seconds since the roster was saved."""
+        return time.time() - self.saved_at
+
+    def index(self):
+        """Return a RosterIndex over the stored roster, built on first use."""
+        if self._index is None:
+            self._index = RosterIndex.from_snapshot(self.snapshot)
+        return self._index
+
+
+class SnapshotStore:
+    """
+    Persists roster snapshots to a SQLite file.
+
+    Attributes:
+        path (str): Location of the SQLite file
+        saves (int): Snapshots written so far
+        last_error (Exception): The error of the latest failed background save, or None
+    """
+    def __init__(self, path):
+        """
+        Initialize the store. The file is created on the first save.
+
+        Args:
+            path (str): Location of the SQLite file
+        """
+        self.path = path
+        self.saves = 0
+        self.last_error = None
+        self._pending = None
+        self._lock = threading.Lock()
+        self._writer = None
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=5.0)
+        for statement in _SCHEMA:
+            connection.execute(statement)
+        return connection
+
+    def load(self, frozen=False):
+        """
+        Read the stored roster.
+
+        Args:
+            frozen (bool): Build FrozenDog/FrozenMonkey instead of Dog/Monkey
+
+        Returns:
+            StoredRoster: The stored roster, or None if nothing (readable) has been saved yet
+        """
+        try:
+            connection = self._connect()
+        except sqlite3.Error:
+            return None
+        try:
+            rows = dict(connection.execute("SELECT animal_type, columns FROM roster"))
+            meta = dict(connection.execute("SELECT key, value FROM meta"))
+        except sqlite3.Error:
+            return None
+        finally:
+            connection.close()
+        if "dog" not in rows or "monkey" not in rows:
+            return None
+
+        try:
+            animals = {
+                animal_type: AnimalBatch(animal_type, json.loads(rows[animal_type])).to_animals(frozen=frozen)
+                for animal_type in ("dog", "monkey")
+            }
+        except (ValueError, KeyError, TypeError):
+            # Written by an incompatible version; the next save replaces it
+            return None
+        snapshot = RosterSnapshot(animals["dog"], animals["monkey"], stale=True)
+        return StoredRoster(
+            snapshot,
+            float(meta.get("saved_at", 0)),
+            meta.get("epoch"),
+            int(meta.get("watermark", 0)),
+        )
+
+    def save(self, snapshot, epoch=None, watermark=0):
+        """
+        Write a snapshot to disk now, replacing the previous one.
+
+        Args:
+            snapshot (RosterSnapshot): The roster to store
+            epoch (str): Delta sync epoch the roster is synced to, if any
+            watermark (int): Delta sync watermark the roster is synced to
+        """
+        documents = [
+            (animal_type, json.dumps(snapshot.batch(animal_type).columns, separators=(",", ":")))
+            for animal_type in ("dog", "monkey")
+        ]
+        meta = [("saved_at", repr(time.time())), ("epoch", epoch), ("watermark", str(watermark))]
+        connection = self._connect()
+        try:
+            with connection:
+                connection.executemany("INSERT OR REPLACE INTO roster VALUES (?, ?)", documents)
+                connection.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", meta)
+        finally:
+            connection.close()
+        self.saves += 1
+
+    def save_later(self, snapshot, epoch=None, watermark=0):
+        """
+        Queue a snapshot to be written by the background writer.
+
+        A snapshot still waiting when a newer one arrives is replaced without being written.
+
+        Args:
+            snapshot (RosterSnapshot): The roster to store
+            epoch (str): Delta sync epoch the roster is synced to, if any
+            watermark (int): Delta sync watermark the roster is synced to
+        """
+        with self._lock:
+            self._pending = (snapshot, epoch, watermark)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_pending, name="snapshot-store", daemon=True)
+                self._writer.start()
+
+    def _write_pending(self):
+        """Write queued snapshots until none is left, then let the thread end."""
+        while True:
+            with self._lock:
+                pending = self._pending
+                self._pending = None
+                if pending is None:
+                    self._writer = None
+                    return
+            try:
+                self.save(*pending)
+                self.last_error = None
+            except (sqlite3.Error, OSError) as e:
+                # The previous snapshot stays on disk; the next save tries again
+                self.last_error = e
@@ -0,0 +1,410 @@
+"""
+DataFrame builders and CSV/JSON import and export for the animal tables.
+
+Kept free of Streamlit imports so the builders can be benchmarked and reused outside the app.
+"""
+
+import csv
+import io
+import json
+import operator
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from animals import MODELS, AnimalBatch
+
+# (display label, model field) in display order for each animal type
+TABLE_COLUMNS = {
+    "dog": [
+        ("Name", "name"),
+        ("Gender", "gender"),
+        ("Age (years)", "age"),
+        ("Weight (lbs)", "weight"),
+        ("Breed", "breed"),
+        ("Acquisition Date", "acquisitionDate"),
+        ("Acquisition Country", "acquisitionCountry"),
+        ("Service Country", "inServiceCountry"),
+        ("Training Status", "trainingStatus"),
+        ("Reserved", "reserved"),
+    ],
+    "monkey": [
+        ("Name", "name"),
+        ("Gender", "gender"),
+        ("Age (years)", "age"),
+        ("Weight (lbs)", "weight"),
+        ("Species", "species"),
+        ("Tail Length (ft)", "tailLength"),
+        ("Height (ft)", "height"),
+        ("Body Length (ft)", "bodyLength"),
+        ("Acquisition Date", "acquisitionDate"),
+        ("Acquisition Country", "acquisitionCountry"),
+        ("Service Country", "inServiceCountry"),
+        ("Training Status", "trainingStatus"),
+        ("Reserved", "reserved"),
+    ],
+}
+
+# Field types used when parsing imported files, where every value may arrive as text
+INT_FIELDS = {"age"}
+FLOAT_FIELDS = {"weight", "tailLength", "height", "bodyLength"}
+BOOL_FIELDS = {"reserved"}
+TRUE_VALUES = {"true", "yes", "y", "1"}
+FALSE_VALUES = {"false", "no", "n", "0", ""}
+
+# Unit suffix for each numeric field, applied as display formatting
+UNITS = {
+    "age": "years",
+    "weight": "lbs",
+    "tailLength": "ft",
+    "height": "ft",
+    "bodyLength": "ft",
+}
+
+
+def build_animals_frame(animals, animal_type):
+    """
+    Build the display DataFrame for a list of dogs or monkeys.
+
+    Args:
+        animals (AnimalBatch | Sequence[RescueAnimal]): The animals to show, either as a columnar
+            batch or as model objects
+        animal_type (str): "dog" or "monkey"
+
+    Returns:
+        pandas.DataFrame: One row per animal with display column labels, numeric measurement
+            columns and Reserved mapped to Yes/No, or None for an unknown animal type
+    """
+    columns = TABLE_COLUMNS.get(animal_type)
+    if columns is None:
+        return None
+
+    if isinstance(animals, AnimalBatch):
+        batch = animals
+    else:
+        batch = AnimalBatch.from_animals(animal_type, animals)
+
+    data = {}
+    for label, field in columns:
+        values = batch.columns[field]
+        if field in UNITS:
+            data[label] = _numeric_column(values)
+        elif field == "reserved":
+            data[label] = pd.Series(np.where(np.array(values, dtype=bool), "Yes", "No"), dtype=object)
+        else:
+            # An explicit object dtype skips pandas' per-cell type inference
+            data[label] = pd.Series(values, dtype=object)
+    return pd.DataFrame(data, copy=False)
+
+
+def _numeric_column(values):
+    """
+    Convert a list of numbers to a float column in one step.
+
+    Missing values become NaN. Numbers sent as strings are parsed as well, and anything that
+    does not parse falls back to pandas' per-value coercion (unparseable cells become NaN).
+    """
+    try:
+        return pd.Series(np.array(values, dtype=float))
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+
+
+class FrameMemo:
+    """
+    Bounded, thread-safe LRU of built display DataFrames, shared across sessions.
+
+    A frame is found without looking at the rows whenever possible: by the version of the
+    roster the rows were cut from (Page.version), or by the identity of a batch the memo already
+    holds, e.g. a page served again from the response cache. Only a new batch without a version
+    is fingerprinted, and a fingerprint match is confirmed by comparing the rows, so two
+    different tables can never share a frame. Each view (e.g. "page 1 of the dog table") also
+    remembers the last frame it showed: when new data differs from it in at most max_patch_rows
+    rows, matched by name, the old frame is reordered and only those rows are rebuilt. Frames
+    are shared and must be treated as read-only.
+
+    Attributes:
+        max_entries (int): Maximum number of frames kept
+        max_patch_rows (int): Most changed rows patched into a previous frame before a full rebuild
+    """
+    def __init__(self, max_entries=64, max_patch_rows=16):
+        """
+        Initialize an empty memo.
+
+        Args:
+            max_entries (int): Maximum number of frames kept; least recently used go first
+            max_patch_rows (int): Most changed rows patched into a previous frame before a
+                full rebuild
+        """
+        self.max_entries = max_entries
+        self.max_patch_rows = max_patch_rows
+        self._frames = OrderedDict()
+        # id() of every batch held in _frames -> its key; valid because the entry keeps the batch alive
+        self._keys_by_batch = {}
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._patches = 0
+        self._builds = 0
+
+    def frame(self, batch, animal_type, view=None, version=None):
+        """
+        Return the display DataFrame for a batch, building or patching it only if needed.
+
+        Args:
+            batch (AnimalBatch): The animals to show
+            animal_type (str): "dog" or "monkey"
+            view (str): Name of the table position the frame is shown in; enables patching
+                from the frame that view showed last. Defaults to None (no patching)
+            version (Hashable): Identifies the batch's rows, e.g. Page.version; equal versions
+                must mean equal rows. Defaults to None (look the rows up by identity or content)
+
+        Returns:
+            pandas.DataFrame: See build_animals_frame, or None for an unknown animal type
+        """
+        columns = TABLE_COLUMNS.get(animal_type)
+        if columns is None:
+            return None
+        view_key = (animal_type, view) if view is not None else None
+        fields = [field for _, field in columns]
+        by_content = False
+
+        with self._lock:
+            last = self._views.get(view_key) if view_key is not None else None
+            key = self._keys_by_batch.get(id(batch))
+        if key is None:
+            if version is not None:
+                key = (animal_type, tuple(columns), "version", version)
+            else:
+                by_content = True
+                key = (animal_type, tuple(columns), len(batch),
+                       hash(tuple(tuple(batch.columns[field]) for field in fields)))
+
+        with self._lock:
+            entry = self._frames.get(key)
+        if entry is not None and by_content and entry[0] is not batch:
+            # Equal fingerprints only suggest equal rows; a collision must not serve another table
+            if any(entry[0].columns[field] != batch.columns[field] for field in fields):
+                entry = None
+                key = key + (id(batch),)
+        with self._lock:
+            if entry is not None and self._frames.get(key) is entry:
+                if entry[0] is not batch:
+                    # Hold the new batch instead, so its next lookup is by identity
+                    self._forget(entry[0], key)
+                    entry = self._frames[key] = (batch, entry[1])
+                    self._keys_by_batch[id(batch)] = key
+                self._frames.move_to_end(key)
+                self._hits += 1
+                self._remember(view_key, batch, key)
+                return entry[1]
+            previous = self._frames.get(last[1]) if last is not None else None
+
+        frame = None
+        if previous is not None:
+            frame = self._patch(previous[0], previous[1], batch, animal_type)
+        patched = frame is not None
+        if not patched:
+            frame = build_animals_frame(batch, animal_type)
+
+        with self._lock:
+            if patched:
+                self._patches += 1
+            else:
+                self._builds += 1
+            replaced = self._frames.get(key)
+            if replaced is not None:
+                self._forget(replaced[0], key)
+            self._frames[key] = (batch, frame)
+            self._frames.move_to_end(key)
+            self._keys_by_batch[id(batch)] = key
+            while len(self._frames) > self.max_entries:
+                evicted, (evicted_batch, _) = self._frames.popitem(last=False)
+                self._forget(evicted_batch, evicted)
+            self._remember(view_key, batch, key)
+        return frame
+
+    def _forget(self, batch, key):
+        """Drop the identity lookup of a batch no longer held under key; caller holds the lock."""
+        if self._keys_by_batch.get(id(batch)) == key:
+            del self._keys_by_batch[id(batch)]
+
+    def _remember(self, view_key, batch, key):
+        """Record the frame a view showed last; caller holds the lock."""
+        if view_key is None:
+            return
+        self._views[view_key] = (batch, key)
+        self._views.move_to_end(view_key)
+        while len(self._views) > self.max_entries:
+            self._views.popitem(last=False)
+
+    def _patch(self, old_batch, old_frame, batch, animal_type):
+        """
+        Derive the frame for batch from the frame of old_batch.
+
+        Rows are matched by name, so reordered rows are moved rather than rebuilt; rows that are
+        new or whose values changed are rebuilt. Returns None when more than max_patch_rows
+        rows would need rebuilding.
+        """
+        old_names = old_batch.columns["name"]
+        new_names = batch.columns["name"]
+        if old_names == new_names:
+            positions = None
+            aligned = old_batch
+            changed = set()
+        else:
+            where = {name: i for i, name in enumerate(old_names)}
+            positions = [where.get(name, -1) for name in new_names]
+            changed = {i for i, position in enumerate(positions) if position < 0}
+            if len(changed) > self.max_patch_rows:
+                return None
+            # New rows borrow row 0 (or any row) as a placeholder until they are rebuilt below
+            positions = [position if position >= 0 else 0 for position in positions]
+            if not len(old_batch) and positions:
+                return None
+            aligned = old_batch.take(positions)
+
+        labels = []
+        for label, field in TABLE_COLUMNS[animal_type]:
+            old_values = aligned.columns[field]
+            new_values = batch.columns[field]
+            if old_values != new_values:
+                labels.append(label)
+                unequal = np.fromiter(map(operator.ne, old_values, new_values), dtype=bool, count=len(new_values))
+                changed.update(np.flatnonzero(unequal).tolist())
+                if len(changed) > self.max_patch_rows:
+                    return None
+        if positions is not None and changed:
+            # Placeholder rows need every column rebuilt, not just the ones that differ
+            labels = [label for label, _ in TABLE_COLUMNS[animal_type]]
+
+        # Columns are replaced rather than written into, so the shared old frame stays intact
+        frame = old_frame.copy(deep=False) if positions is None else old_frame.take(positions).reset_index(drop=True)
+        if changed:
+            rows = sorted(changed)
+            fresh = build_animals_frame(batch.take(rows), animal_type)
+            for label in labels:
+                column = frame[label]
+                values = column.to_numpy(copy=True)
+                values[rows] = fresh[label].to_numpy()
+                # An explicit dtype keeps object columns from being re-inferred as strings
+                frame[label] = pd.Series(values, index=frame.index, dtype=column.dtype)
+        return frame
+
+    def stats(self):
+        """
+        Report memo counters.
+
+        Returns:
+            dict: hits (frames reused), patches (frames derived from a previous one), builds
+                (frames built from scratch) and size (frames held)
+        """
+        with self._lock:
+            return {"hits": self._hits, "patches": self._patches, "builds": self._builds, "size": len(self._frames)}
+
+
+def write_csv(batches, animal_type, fileobj):
+    """
+    Write a roster as CSV, one batch at a time.
+
+    The header uses the model field names, so the file can be imported back unchanged.
+
+    Args:
+        batches (Iterable[AnimalBatch]): Columnar chunks of the roster, e.g. from
+            RescueAPI.iter_animals(animal_type, batch_size=...)
+        animal_type (str): "dog" or "monkey"
+        fileobj (TextIO): Text file opened with newline=""
+
+    Returns:
+        int: Number of animals written
+    """
+    fields = MODELS[animal_type].FIELDS
+    writer = csv.writer(fileobj)
+    writer.writerow(fields)
+    written = 0
+    for batch in batches:
+        rows = zip(*(batch.columns[field] for field in fields))
+        writer.writerows(rows)
+        written += len(batch)
+    return written
+
+
+def read_records(fileobj, filename):
+    """
+    Read raw animal records from an uploaded CSV or JSON file.
+
+    Args:
+        fileobj (BinaryIO): The uploaded file
+        filename (str): Original file name; a .json extension selects JSON, anything else CSV
+
+    Returns:
+        list[dict]: One dictionary per record, keyed by field name
+
+    Raises:
+        ValueError: If a JSON file does not contain an array of objects
+    """
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        if filename.lower().endswith(".json"):
+            records = json.load(text)
+            if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+                raise ValueError("JSON import must be an array of objects")
+            return records
+        return list(csv.DictReader(text))
+    finally:
+        text.detach()
+
+
+def _parse_value(field, value):
+    """Convert one imported value to the type the backend expects."""
+    if isinstance(value, str):
+        value = value.strip()
+    if field in BOOL_FIELDS:
+        if isinstance(value, bool):
+            return value
+        lowered = str(value if value is not None else "").lower()
+        if lowered in TRUE_VALUES:
+            return True
+        if lowered in FALSE_VALUES:
+            return False
+        raise ValueError(f"{field} must be yes/no or true/false")
+    if value in ("", None):
+        return None
+    if field in INT_FIELDS:
+        number = float(value)
+        if not number.is_integer():
+            raise ValueError(f"{field} must be a whole number")
+        return int(number)
+    if field in FLOAT_FIELDS:
+        return float(value)
+    return value
+
+
+def parse_import(records, animal_type):
+    """
+    Validate imported records and build model objects from them.
+
+    Args:
+        records (list[dict]): Raw records from read_records
+        animal_type (str): "dog" or "monkey"
+
+    Returns:
+        tuple: (animals, errors) where animals is a list of Dog or Monkey objects for the valid
+            records and errors is a list of (row number, name, message) for the rest
+    """
+    model = MODELS[animal_type]
+    animals = []
+    errors = []
+    for row, record in enumerate(records, start=1):
+        name = _parse_value("name", record.get("name"))
+        try:
+            if not name:
+                raise ValueError("name is required")
+            values = {field: _parse_value(field, record.get(field)) for field in model.FIELDS}
+        except (TypeError, ValueError) as e:
+            errors.append((row, name, str(e)))
+            continue
+        animals.append(model(**values))
+    return animals, errors
@@ -0,0 +1,158 @@
+"""Pooled keep-alive HTTP transport shared by every RescueAPI client in the process."""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class PooledTransport:
+    """
+    Thread-safe, keep-alive HTTP transport backed by a bounded connection pool.
+
+    Attributes:
+        session (requests.Session): The session that owns the connection pool
+        timeout (tuple): The (connect, read) timeout in seconds applied to every request
+    """
+    def __init__(self, pool_size=10, keep_alive=True, connect_timeout=3.05, read_timeout=10.0,
+                 retries=3, backoff_factor=0.3):
+        """
+        Initialize the transport and mount the pooled adapter.
+
+        Args:
+            pool_size (int): Maximum number of connections kept per backend host
+            keep_alive (bool): Whether to keep connections open between requests
+            connect_timeout (float): Seconds to wait for a TCP connection to be established
+            read_timeout (float): Seconds to wait for the server to send a response
+            retries (int): Number of retries for connection errors and 502/503/504 responses
+            backoff_factor (float): Base delay in seconds for exponential backoff between retries
+        """
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+
+        # Read errors and 5xx responses are only retried for idempotent methods, so a retried
+        # POST can never add the same animal twice
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        # pool_block=True caps the number of sockets per host at pool_size instead of
+        # opening (and then discarding) overflow connections under load
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+            pool_block=True,
+        )
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+        self._lock = threading.Lock()
+        self._requests_sent = 0
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request through the pool, applying the default timeout.
+
+        Args:
+            method (str): HTTP method
+            url (str): Absolute URL of the endpoint
+            **kwargs: Extra arguments forwarded to requests.Session.request
+
+        Returns:
+            requests.Response: The server response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        with self._lock:
+            self._requests_sent += 1
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        """Send a GET request through the pool."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """Send a POST request through the pool."""
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        """
+        Report connection pool statistics across all backend hosts.
+
+        Returns:
+            dict: Dictionary containing:
+                - requests: Requests sent through this transport
+                - connections_created: TCP connections opened so far
+                - open_connections: Connections currently open (in use or idle)
+                - idle_connections: Open connections waiting in the pool for reuse
+                - reuse_ratio: Fraction of requests served on an already open connection
+        """
+        created = 0
+        served = 0
+        open_connections = 0
+        idle = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            created += pool.num_connections
+            served += pool.num_requests
+            queue = pool.pool
+            if queue is None:
+                continue
+            with queue.mutex:
+                slots = list(queue.queue)
+            # The queue holds None placeholders for unopened slots; anything missing
+            # from the queue is checked out by a request in flight
+            in_use = queue.maxsize - len(slots)
+            idle_here = sum(1 for conn in slots if conn is not None and conn.sock is not None)
+            idle += idle_here
+            open_connections += idle_here + in_use
+
+        with self._lock:
+            sent = self._requests_sent
+        return {
+            "requests": sent,
+            "connections_created": created,
+            "open_connections": open_connections,
+            "idle_connections": idle,
+            "reuse_ratio": (1 - created / served) if served else 0.0,
+        }
+
+    def close(self):
+        """Close every pooled connection."""
+        self.session.close()
+
+
+_transports = {}
+_transports_lock = threading.Lock()
+
+
+def get_shared_transport(**config):
+    """
+    Return the process-wide transport for the given configuration, creating it on first use.
+
+    Args:
+        **config: Keyword arguments accepted by PooledTransport
+
+    Returns:
+        PooledTransport: The shared transport instance
+    """
+    key = tuple(sorted(config.items()))
+    with _transports_lock:
+        transport = _transports.get(key)
+        if transport is None:
+            transport = PooledTransport(**config)
+            _transports[key] = transport
+        return transport
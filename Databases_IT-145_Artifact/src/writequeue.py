@@ -0,0 +1,153 @@
+"""Group commit: single writes arriving within a short linger time are sent as one batch request."""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class _Batch:
+    """Writes collected for one key, and when they must be sent."""
+    __slots__ = ("deadline", "entries")
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.entries = []
+
+
+class WriteQueue:
+    """
+    Coalesces writes submitted within a short window into batch requests.
+
+    Attributes:
+        max_batch_size (int): Most writes sent in one batch
+        max_linger (float): Most seconds a write waits for others to join its batch
+        writes (int): Writes sent so far
+        batches (int): Batch requests sent so far
+    """
+    def __init__(self, send_batch, max_batch_size=50, max_linger=0.01, max_in_flight=2):
+        """
+        Initialize the queue and start its collector thread.
+
+        Args:
+            send_batch (callable): Called as send_batch(key, items) from a sender thread; must
+                return one result per item, in the same order
+            max_batch_size (int): Most writes sent in one batch
+            max_linger (float): Most seconds a write waits for others to join its batch
+            max_in_flight (int): Number of batches sent concurrently
+        """
+        self._send_batch = send_batch
+        self.max_batch_size = max_batch_size
+        self.max_linger = max_linger
+        self._batches = {}
+        self._ready = threading.Condition()
+        self._closed = False
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="write-batch")
+        self._stats_lock = threading.Lock()
+        self.writes = 0
+        self.batches = 0
+        self._collector = threading.Thread(target=self._collect, name="write-queue", daemon=True)
+        self._collector.start()
+
+    def submit(self, key, item):
+        """
+        Queue one write.
+
+        Args:
+            key (Hashable): Batches are formed per key, e.g. the animal type
+            item: The write, passed on to send_batch
+
+        Returns:
+            Future: Resolves to send_batch's result for this item, or raises what send_batch raised
+
+        Raises:
+            RuntimeError: If the queue has been closed
+        """
+        future = Future()
+        with self._ready:
+            if self._closed:
+                raise RuntimeError("write queue is closed")
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = _Batch(time.monotonic() + self.max_linger)
+            batch.entries.append((item, future))
+            if len(batch.entries) == 1 or len(batch.entries) == self.max_batch_size:
+                # A new deadline or a full batch: the collector's wait may need to end sooner
+                self._ready.notify()
+        return future
+
+    def _collect(self):
+        """Hand every batch whose deadline has passed, or which is full, to a sender thread."""
+        while True:
+            with self._ready:
+                while True:
+                    now = time.monotonic()
+                    due = [
+                        key for key, batch in self._batches.items()
+                        if self._closed or batch.deadline <= now or len(batch.entries) >= self.max_batch_size
+                    ]
+                    if due or (self._closed and not self._batches):
+                        break
+                    timeout = min(batch.deadline for batch in self._batches.values()) - now if self._batches else None
+                    self._ready.wait(timeout)
+                if not due:
+                    return
+                ready = []
+                for key in due:
+                    batch = self._batches[key]
+                    ready.append((key, batch.entries[:self.max_batch_size]))
+                    del batch.entries[:self.max_batch_size]
+                    if not batch.entries:
+                        del self._batches[key]
+            for key, entries in ready:
+                self._in_flight.acquire()
+                self._executor.submit(self._send, key, entries)
+
+    def _send(self, key, entries):
+        """Send one batch and resolve the futures of its writes."""
+        try:
+            entries = [(item, future) for item, future in entries if future.set_running_or_notify_cancel()]
+            if not entries:
+                return
+            try:
+                results = self._send_batch(key, [item for item, _ in entries])
+            except Exception as e:
+                for _, future in entries:
+                    future.set_exception(e)
+            else:
+                results = list(results)
+                for index, (_, future) in enumerate(entries):
+                    if index < len(results):
+                        future.set_result(results[index])
+                    else:
+                        future.set_exception(RuntimeError("the batch returned no result for this write"))
+            with self._stats_lock:
+                self.writes += len(entries)
+                self.batches += 1
+        finally:
+            self._in_flight.release()
+
+    def stats(self):
+        """
+        Report group commit counters.
+
+        Returns:
+            dict: writes and batches sent, mean writes per batch, and writes still queued
+        """
+        with self._ready:
+            queued = sum(len(batch.entries) for batch in self._batches.values())
+        with self._stats_lock:
+            return {
+                "writes": self.writes,
+                "batches": self.batches,
+                "mean_batch_size": self.writes / self.batches if self.batches else 0.0,
+                "queued": queued,
+            }
+
+    def close(self):
+        """Stop accepting writes, send the ones already queued and wait for them."""
+        with self._ready:
+            self._closed = True
+            self._ready.notify()
+        self._collector.join()
+        self._executor.shutdown(wait=True)
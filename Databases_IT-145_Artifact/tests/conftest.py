@@ -0,0 +1,38 @@
+"""Shared fixtures: a StubRescueServer (see benchmarks/stub_server.py) and clients talking to it."""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from api import RescueAPI  # noqa: E402
+from stub_server import StubRescueServer, make_dogs, make_monkeys  # noqa: E402
+from transport import PooledTransport  # noqa: E402
+
+
+@pytest.fixture
+def make_server():
+    """Return a function that starts a stub server with 20 dogs and 10 monkeys; stopped after the test."""
+    servers = []
+
+    def start(**options):
+        server = StubRescueServer(make_dogs(20), make_monkeys(10), **options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def make_client():
+    """Return a function that builds a RescueAPI for a stub server, without retries."""
+    def build(server, **options):
+        return RescueAPI(server.url, transport=PooledTransport(retries=0), **options)
+
+    return build
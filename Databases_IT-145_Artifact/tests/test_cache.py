@@ -0,0 +1,33 @@
+"""Generation checks that keep downloads predating a write out of the caches."""
+
+from cache import ResponseCache
+
+
+def test_store_after_invalidate_is_discarded():
+    cache = ResponseCache()
+    generation = cache.generation
+
+    cache.invalidate()
+    cache.store("/dogs", ["stale"], generation=generation)
+
+    assert cache.lookup("/dogs") is None
+    assert cache.stats()["discarded"] == 1
+
+    cache.store("/dogs", ["fresh"], generation=cache.generation)
+    assert cache.lookup("/dogs").value == ["fresh"]
+
+
+def test_snapshot_downloaded_before_a_write_is_not_kept(make_server, make_client):
+    api = make_client(make_server(), snapshot_ttl=60)
+    generation = api.snapshot_generation()
+    dogs = api.get_dogs()
+
+    # A write lands while the download is in flight
+    api._drop_snapshot()
+    snapshot = api.store_snapshot(dogs, [], generation=generation)
+
+    assert len(snapshot.dogs) == 20
+    assert api.fresh_snapshot() is None
+
+    api.store_snapshot(dogs, [], generation=api.snapshot_generation())
+    assert api.fresh_snapshot() is not None
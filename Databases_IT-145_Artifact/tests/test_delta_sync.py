@@ -0,0 +1,45 @@
+"""Delta sync through /changes."""
+
+
+def test_incremental_sync_transfers_only_changes(make_server, make_client):
+    server = make_server(delta_sync=True)
+    api = make_client(server, delta_sync=True)
+
+    snapshot = api.sync_roster()
+    assert len(snapshot.dogs) == 20
+    assert api.sync_stats()["last"]["full"]
+
+    assert server.reserve("dog", "Dog0000001", "Canada")
+    snapshot = api.sync_roster()
+    last = api.sync_stats()["last"]
+    assert not last["full"]
+    assert last["records"] == 1
+    assert len(snapshot.dogs) == 20
+    dog = next(dog for dog in snapshot.dogs if dog.name == "Dog0000001")
+    assert dog.reserved and dog.inServiceCountry == "Canada"
+
+
+def test_epoch_reset_forces_full_resync(make_server, make_client):
+    server = make_server(delta_sync=True)
+    api = make_client(server, delta_sync=True)
+    api.sync_roster()
+    assert server.add("dog", {**server.records["dog"][0], "name": "Rex"})
+    api.sync_roster()
+    watermark = api.replica.watermark
+    old_epoch = api.replica.epoch
+
+    server.restart()
+    snapshot = api.sync_roster()
+
+    assert api.replica.epoch != old_epoch
+    assert api.replica.watermark == watermark
+    assert api.sync_stats()["last"]["full"]
+    assert api.sync_stats()["full_syncs"] == 2
+    assert len(snapshot.dogs) == 21
+
+
+def test_server_without_changes_switches_delta_sync_off(make_server, make_client):
+    api = make_client(make_server(), delta_sync=True)
+
+    assert api.sync_roster() is None
+    assert api.replica is None
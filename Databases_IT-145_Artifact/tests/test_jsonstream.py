@@ -0,0 +1,46 @@
+"""Incremental decoding of JSON arrays split across arbitrary chunk boundaries."""
+
+import json
+
+import pytest
+
+from jsonstream import iter_json_array
+
+RECORDS = [
+    {"name": 'Quote "Q" Dog', "breed": "back\\slash", "note": "line\nbreak, [not] {json}"},
+    {"name": "Renée", "breed": "éè", "country": "México"},
+    {"name": "Emoji \U0001f436", "nested": {"list": [1, 2.5, None, True], "empty": []}},
+    [],
+    "plain string with \\\" escaped quote",
+    42,
+]
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_every_split_point(ensure_ascii):
+    # ensure_ascii=True sends \uXXXX escapes and surrogate pairs, False sends multi-byte UTF-8
+    body = json.dumps(RECORDS, ensure_ascii=ensure_ascii).encode("utf-8")
+    for split in range(1, len(body)):
+        assert list(iter_json_array([body[:split], body[split:]])) == RECORDS, split
+
+
+def test_one_byte_chunks():
+    body = b' [ ' + json.dumps(RECORDS, ensure_ascii=False).encode("utf-8")[1:-1] + b' ] '
+    assert list(iter_json_array(body[i:i + 1] for i in range(len(body)))) == RECORDS
+
+
+@pytest.mark.parametrize("body", [b"", b"[1, 2", b'{"dogs": []}', b'["unterminated'])
+def test_malformed_bodies_raise(body):
+    with pytest.raises(ValueError):
+        list(iter_json_array([body]))
+
+
+def test_iter_animals_with_tiny_chunks(make_server, make_client):
+    server = make_server()
+    server.add("dog", {**server.records["dog"][0], "name": 'Señor "Ruff" \\ Dog'})
+    api = make_client(server)
+
+    names = [dog.name for dog in api.iter_animals("dog", chunk_size=7)]
+
+    assert names == [record["name"] for record in server.records["dog"]]
+    assert names[-1] == 'Señor "Ruff" \\ Dog'
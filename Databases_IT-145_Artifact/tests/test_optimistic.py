@@ -0,0 +1,55 @@
+"""Rolling back optimistic writes the server refuses."""
+
+from animals import Dog
+
+
+def test_failed_optimistic_add_is_removed_from_the_index(make_server, make_client):
+    server = make_server()
+    api = make_client(server)
+    index = api.get_roster_index()
+    record = server.records["dog"][0]
+    # Another client takes the name after this one built its index
+    assert server.add("dog", {**record, "name": "Taken"})
+
+    pending = api.add_animal_optimistic("dog", Dog.from_dict({**record, "name": "Taken", "age": "2"}))
+    ok = api.add_animal_optimistic("dog", Dog.from_dict({**record, "name": "Fresh"}))
+    assert index.get("dog", "Taken") is not None
+
+    assert pending.wait(5) and ok.wait(5)
+    assert pending.status == "failed"
+    assert pending.error == "the name is already taken"
+    assert ok.status == "confirmed"
+    assert api.get_roster_index() is index
+    assert index.get("dog", "Taken") is None
+    assert index.get("dog", "Fresh") is not None
+    assert len(index) == 31
+
+
+def test_failed_optimistic_reservation_is_undone(make_server, make_client):
+    server = make_server()
+    api = make_client(server)
+    index = api.get_roster_index()
+    name = next(record["name"] for record in server.records["dog"] if not record["reserved"])
+    # Another client reserves the animal after this one built its index
+    assert server.reserve("dog", name, "Mexico")
+
+    pending = api.reserve_animal_optimistic("dog", name, "Canada")
+    assert index.get("dog", name).inServiceCountry == "Canada"
+
+    assert pending.wait(5)
+    assert pending.status == "failed"
+    dog = index.get("dog", name)
+    assert not dog.reserved and dog.inServiceCountry is None
+
+
+def test_locally_rejected_add_never_reaches_the_server(make_server, make_client):
+    server = make_server()
+    api = make_client(server)
+    api.get_roster_index()
+    name = server.records["dog"][0]["name"]
+
+    pending = api.add_animal_optimistic("dog", Dog.from_dict(server.records["dog"][0]))
+
+    assert pending.done and pending.error == "the name is already taken"
+    assert len(server.records["dog"]) == 20
+    assert server.by_name["dog"][name] is server.records["dog"][0]
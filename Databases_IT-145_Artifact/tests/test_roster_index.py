@@ -0,0 +1,44 @@
+"""RosterIndex updates with numeric fields sent as text, as the Add form does."""
+
+from animals import Dog, Monkey
+from roster import RosterIndex
+
+
+def form_dog(name, age, weight):
+    # The Add form sends every field as entered, so age and weight arrive as strings
+    return Dog(name, "Beagle", age, "female", weight, "2024-01-01", "USA", "intake", False, None)
+
+
+def test_add_with_string_numerics_keeps_ranges_searchable():
+    index = RosterIndex([form_dog("Existing", 5, 30.0)], [])
+
+    index.add("dog", form_dog("Biscuit", "3", "20.5"))
+
+    assert index.get("dog", "Biscuit").age == 3
+    assert index.names("dog", age=(2, 4)) == ["Biscuit"]
+    assert index.names("dog", weight=(20, 21)) == ["Biscuit"]
+    assert index.names("dog", weight=(None, 40)) == ["Biscuit", "Existing"]
+
+
+def test_reserve_after_string_add():
+    index = RosterIndex()
+    index.add("dog", form_dog("Biscuit", "3", "20.5"))
+
+    assert index.reserve("dog", "Biscuit", "Canada")
+    assert not index.reserve("dog", "Nobody", "Canada")
+
+    dog = index.get("dog", "Biscuit")
+    assert dog.reserved and dog.inServiceCountry == "Canada"
+    assert index.names("dog", reserved=True, age=(3, 3)) == ["Biscuit"]
+    assert index.names("dog", reserved=False) == []
+    assert index.names("dog", inServiceCountry="canada") == ["Biscuit"]
+
+
+def test_replacing_an_animal_leaves_no_stale_entries():
+    index = RosterIndex([], [Monkey("Kiki", "tamarin", 4, "male", 1.0, "2024-01-01", "Peru", "intake", False, None, 1.0, 1.0, 1.0)])
+
+    index.add("monkey", Monkey("Kiki", "tamarin", "9", "male", "2.5", "2024-01-01", "Peru", "intake", False, None, "1", "1", "1"))
+
+    assert index.names("monkey", age=(0, 5)) == []
+    assert index.names("monkey", age=(9, 9), weight=(2.5, 2.5)) == ["Kiki"]
+    assert len(index) == 1
@@ -0,0 +1,67 @@
+"""Group commit through WriteQueue and RescueAPI.queue_add."""
+
+import pytest
+
+from animals import Dog
+from writequeue import WriteQueue
+
+
+def make_dog(record, name):
+    return Dog.from_dict({**record, "name": name})
+
+
+def test_each_write_gets_its_own_result():
+    batches = []
+
+    def send_batch(key, items):
+        batches.append((key, list(items)))
+        return [f"{key}:{item}" for item in items]
+
+    queue = WriteQueue(send_batch, max_batch_size=3, max_linger=0.05)
+    futures = [queue.submit("dog", i) for i in range(5)] + [queue.submit("monkey", "m")]
+    results = [future.result(timeout=5) for future in futures]
+    queue.close()
+
+    assert results == ["dog:0", "dog:1", "dog:2", "dog:3", "dog:4", "monkey:m"]
+    assert sorted(len(items) for key, items in batches if key == "dog") == [2, 3]
+    assert queue.stats()["writes"] == 6
+
+
+def test_failed_batch_fails_only_its_writes():
+    def send_batch(key, items):
+        if key == "bad":
+            raise RuntimeError("server down")
+        return items[:-1]
+
+    queue = WriteQueue(send_batch, max_linger=0.01)
+    bad = queue.submit("bad", 1)
+    short = [queue.submit("good", i) for i in range(2)]
+
+    with pytest.raises(RuntimeError, match="server down"):
+        bad.result(timeout=5)
+    assert short[0].result(timeout=5) == 0
+    with pytest.raises(RuntimeError, match="no result"):
+        short[1].result(timeout=5)
+    queue.close()
+    with pytest.raises(RuntimeError):
+        queue.submit("good", 3)
+
+
+@pytest.mark.parametrize("batch_writes", [True, False])
+def test_queue_add_reports_duplicates_per_write(make_server, make_client, batch_writes):
+    server = make_server(batch_writes=batch_writes)
+    api = make_client(server, write_linger=0.05)
+    record = server.records["dog"][0]
+    dogs = [make_dog(record, "Fresh1"), make_dog(record, record["name"]), make_dog(record, "Fresh2")]
+
+    futures = [api.queue_add("dog", dog) for dog in dogs]
+    results = {result.name: result for result in (future.result(timeout=5) for future in futures)}
+
+    assert results["Fresh1"].success and results["Fresh2"].success
+    duplicate = results[record["name"]]
+    assert not duplicate.success
+    if batch_writes:
+        assert duplicate.error == "duplicate name"
+        assert api.write_queue_stats()["batches"] == 1
+    assert {"Fresh1", "Fresh2"} <= set(server.by_name["dog"])
+
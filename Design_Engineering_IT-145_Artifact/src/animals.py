@@ -1,8 +1,9 @@
 # Data models to match Java classes
+# slots=True (Python 3.10+) drops the per-instance __dict__, which keeps large rosters compact and fast to build
 from dataclasses import dataclass
 from typing import Optional
 
-@dataclass
+@dataclass(slots=True)
 class Animal:
     """
     Base data model for all animals.
@@ -19,7 +20,7 @@ class Animal:
     reserved: bool
     inServiceCountry: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Dog(Animal):
     """
     Data model for dogs, extends Animal.
@@ -27,7 +28,7 @@ class Dog(Animal):
     """
     breed: str = None
 
-@dataclass
+@dataclass(slots=True)
 class Monkey(Animal):
     """
     Data model for monkeys, extends Animal.
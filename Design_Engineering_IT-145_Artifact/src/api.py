@@ -1,5 +1,6 @@
 import requests
 import json
+from dataclasses import asdict
 from typing import List, Dict
 from animals import Dog, Monkey
 
@@ -62,7 +63,7 @@ class RescueAPI:
         Adds a new dog to the backend.
         Returns True if successful, False otherwise.
         """
-        response = requests.post(f"{self.base_url}/dogs", json=dog.__dict__)
+        response = requests.post(f"{self.base_url}/dogs", json=asdict(dog))
         response.raise_for_status()
         return response.json()["success"]
 
@@ -71,7 +72,7 @@ class RescueAPI:
         Adds a new monkey to the backend.
         Returns True if successful, False otherwise.
         """
-        response = requests.post(f"{self.base_url}/monkeys", json=monkey.__dict__)
+        response = requests.post(f"{self.base_url}/monkeys", json=asdict(monkey))
         response.raise_for_status()
         return response.json()["success"]
 
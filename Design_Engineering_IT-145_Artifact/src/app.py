@@ -13,6 +13,7 @@ Design rationale:
 
 import streamlit as st
 import pandas as pd
+from dataclasses import asdict
 from api import RescueAPI
 from animals import Dog, Monkey
 
@@ -285,7 +286,7 @@ def show_animals_table(animals, animal_type):
         return
     
     # Convert to DataFrame for display
-    df = pd.DataFrame([vars(animal) for animal in animals])
+    df = pd.DataFrame([asdict(animal) for animal in animals])
     
     # Add units to measurements
     if 'age' in df.columns: